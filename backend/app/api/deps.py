@@ -1,9 +1,12 @@
 from collections.abc import AsyncGenerator
+from functools import lru_cache
 
 from fastapi import Header
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
-from app.database import get_db_session
+from app.database import AsyncSessionLocal, get_db_session
+from app.services.job_queue import CampaignSendQueue
+from app.services.webhook_batcher import WebhookBatcher
 
 
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
@@ -11,5 +14,21 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
         yield session
 
 
+def get_session_factory() -> async_sessionmaker[AsyncSession]:
+    """Session factory for responses that outlive the request-scoped session, e.g. streams."""
+    return AsyncSessionLocal
+
+
 async def get_user_id(x_user_id: str | None = Header(default=None)) -> str:
     return x_user_id or "anonymous"
+
+
+@lru_cache
+def get_webhook_batcher() -> WebhookBatcher:
+    return WebhookBatcher()
+
+
+@lru_cache
+def get_campaign_queue() -> CampaignSendQueue:
+    """This process's campaign lease holder; sends started here renew leases under its worker id."""
+    return CampaignSendQueue()
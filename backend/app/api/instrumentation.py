@@ -0,0 +1,88 @@
+import time
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.db_profiler import SQLProfiler
+from app.metrics import registry
+
+QUERY_COUNT_HEADER = "X-DB-Query-Count"
+QUERY_TIME_HEADER = "X-DB-Time-Ms"
+N_PLUS_ONE_HEADER = "X-DB-N-Plus-One"
+PROFILE_HEADERS = [QUERY_COUNT_HEADER, QUERY_TIME_HEADER, N_PLUS_ONE_HEADER]
+
+http_requests = registry.counter(
+    "http_requests_total", "HTTP requests by route template and status.", ("method", "route", "status")
+)
+http_request_duration = registry.histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency, until the last body chunk is sent.",
+    ("method", "route"),
+)
+
+
+class MetricsMiddleware:
+    """Pure ASGI middleware recording request counts and latency per route.
+
+    Routes are labelled by their path template (``/campaigns/{campaign_id}``)
+    so series stay bounded; requests that match no route share
+    ``unmatched``. Streaming responses are timed until their final chunk.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            route = scope.get("route")
+            template = getattr(route, "path", None) or "unmatched"
+            method = scope["method"]
+            http_requests.inc(method=method, route=template, status=status)
+            http_request_duration.observe(time.perf_counter() - started, method=method, route=template)
+
+
+class SQLProfilerMiddleware:
+    """Profile the SQL each request runs and summarize it in response headers.
+
+    Headers cover the statements executed before the response starts; the
+    full per-request summary (slowest statements, N+1 suspects) including
+    any queries run while streaming the body is kept in ``profiler.recent``.
+    """
+
+    def __init__(self, app: ASGIApp, profiler: SQLProfiler) -> None:
+        self.app = app
+        self.profiler = profiler
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        with self.profiler.profile(f"{scope['method']} {scope['path']}") as profile:
+
+            async def send_with_profile(message: Message) -> None:
+                if message["type"] == "http.response.start":
+                    headers = list(message.get("headers", []))
+                    headers += [
+                        (QUERY_COUNT_HEADER.lower().encode(), str(profile.query_count).encode()),
+                        (QUERY_TIME_HEADER.lower().encode(), f"{profile.total_seconds * 1000:.3f}".encode()),
+                        (N_PLUS_ONE_HEADER.lower().encode(), str(len(profile.n_plus_one())).encode()),
+                    ]
+                    message = {**message, "headers": headers}
+                await send(message)
+
+            await self.app(scope, receive, send_with_profile)
@@ -0,0 +1,50 @@
+import base64
+import json
+import uuid
+from datetime import datetime
+
+from fastapi import HTTPException, Response
+from sqlalchemy import ColumnElement, tuple_
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(sort_value: datetime | int | list | None, row_id: uuid.UUID) -> str:
+    """Encode a keyset position (sort key, id) as an opaque URL-safe token."""
+    value = sort_value.isoformat() if isinstance(sort_value, datetime) else sort_value
+    raw = json.dumps([value, str(row_id)], separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[str | int | list | None, uuid.UUID]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        value, row_id = json.loads(raw)
+        return value, uuid.UUID(row_id)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="invalid cursor") from None
+
+
+def decode_datetime_cursor(cursor: str) -> tuple[datetime, uuid.UUID]:
+    value, row_id = decode_cursor(cursor)
+    try:
+        return datetime.fromisoformat(value), row_id
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="invalid cursor") from None
+
+
+def set_next_cursor(response: Response, cursor: str | None) -> None:
+    """Expose the next page position without changing the list-shaped body."""
+    if cursor is not None:
+        response.headers[NEXT_CURSOR_HEADER] = cursor
+
+
+def newest_first_after(sort_column, id_column, cursor: str) -> ColumnElement[bool]:
+    """Keyset predicate for ``ORDER BY sort_column DESC, id_column DESC``.
+
+    A row comparison rather than an OR of column tests, so Postgres can use
+    it as a range bound on the ``(owner, sort_column DESC, id DESC)``
+    composite indexes and start the page with an index seek.
+    """
+    sort_value, row_id = decode_datetime_cursor(cursor)
+    return tuple_(sort_column, id_column) < tuple_(sort_value, row_id)
@@ -0,0 +1,46 @@
+import json
+from collections.abc import AsyncIterator, Callable
+from typing import Any
+
+from fastapi.responses import StreamingResponse
+from sqlalchemy import Row, Select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+SSE_MEDIA_TYPE = "text/event-stream"
+# Keep proxies (nginx) from buffering event streams.
+SSE_HEADERS = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+
+
+def ndjson_response(
+    session_factory: async_sessionmaker[AsyncSession],
+    stmt: Select,
+    to_item: Callable[[Row], dict[str, Any]],
+    batch_size: int,
+) -> StreamingResponse:
+    """Stream ``stmt`` as NDJSON, one object per row.
+
+    The query runs in its own session (the request-scoped one is closed
+    before the body is sent) through a server-side cursor, and each
+    ``batch_size`` partition is written as one chunk, so memory stays flat
+    however many rows match.
+    """
+    return StreamingResponse(_ndjson_lines(session_factory, stmt, to_item, batch_size), media_type=NDJSON_MEDIA_TYPE)
+
+
+async def _ndjson_lines(
+    session_factory: async_sessionmaker[AsyncSession],
+    stmt: Select,
+    to_item: Callable[[Row], dict[str, Any]],
+    batch_size: int,
+) -> AsyncIterator[bytes]:
+    async with session_factory() as session:
+        result = await session.stream(stmt.execution_options(yield_per=batch_size))
+        async for partition in result.partitions():
+            lines = [json.dumps(to_item(row), separators=(",", ":"), default=str) for row in partition]
+            yield ("\n".join(lines) + "\n").encode("utf-8")
+
+
+def sse_event(event: str, data: Any) -> bytes:
+    """Encode one server-sent event with a JSON ``data`` payload."""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False, default=str)}\n\n".encode("utf-8")
@@ -1,19 +1,33 @@
 import json
 import uuid
+from datetime import datetime, timezone
 
-from fastapi import APIRouter, Depends, Header, HTTPException, Request
-from sqlalchemy import select
-from sqlalchemy.ext.asyncio import AsyncSession
+from fastapi import APIRouter, BackgroundTasks, Depends, Header, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy import Row, Select, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
-from app.api.deps import get_db, get_user_id
+from app.api.deps import get_campaign_queue, get_db, get_session_factory, get_user_id, get_webhook_batcher
+from app.api.pagination import decode_datetime_cursor, encode_cursor, set_next_cursor
+from app.api.streaming import ndjson_response
 from app.config import get_settings
 from app.models.email_campaign import EmailCampaign
 from app.models.email_draft import EmailDraft
 from app.models.email_event import EmailEvent
 from app.models.email_message import EmailMessage
 from app.models.influencer import Influencer
-from app.schemas.campaign import CampaignEventResponse, SendCampaignRequest, SendCampaignResponse
-from app.services.email_service import EmailService
+from app.schemas.campaign import (
+    CampaignEventResponse,
+    CampaignProgressResponse,
+    CampaignStatsResponse,
+    EmailEventType,
+    SendCampaignRequest,
+    SendCampaignResponse,
+)
+from app.services.campaign_stats_service import get_campaign_stats
+from app.services.job_queue import CampaignSendQueue
+from app.services.webhook_batcher import WebhookBatcher
+from app.workers.tasks import run_campaign_send
 
 router = APIRouter()
 settings = get_settings()
@@ -22,8 +36,10 @@ settings = get_settings()
 @router.post("/campaigns/send", response_model=SendCampaignResponse)
 async def send_campaign(
     body: SendCampaignRequest,
+    background_tasks: BackgroundTasks,
     db: AsyncSession = Depends(get_db),
     user_id: str = Depends(get_user_id),
+    queue: CampaignSendQueue = Depends(get_campaign_queue),
 ) -> SendCampaignResponse:
     draft = (await db.execute(select(EmailDraft).where(EmailDraft.id == body.draft_id))).scalar_one_or_none()
     if draft is None:
@@ -41,33 +57,107 @@ async def send_campaign(
         draft_id=draft.id,
         status="sending",
         send_rate_limit=body.send_rate_limit or settings.default_send_rate_limit,
+        queued_count=sum(1 for influencer in influencers if influencer.email),
+        accepted_count=0,
+        sent_count=0,
+        failed_count=0,
+        recipient_ids=[str(influencer.id) for influencer in influencers],
+        created_by=user_id,
+        locked_by=queue.worker_id,
+        lease_expires_at=queue.lease_expiry(),
     )
     db.add(campaign)
-    await db.flush()
-
-    service = EmailService()
-    accepted = await service.send_campaign_messages(
-        db=db,
-        campaign=campaign,
-        influencers=influencers,
-        subject=draft.subject,
-        body=draft.body,
-        user_id=user_id,
-    )
     await db.commit()
-    return SendCampaignResponse(campaign_id=campaign.id, accepted_count=accepted)
 
+    # Runs in this process under its lease; if the process dies, another one resumes it.
+    background_tasks.add_task(run_campaign_send, campaign.id, queue)
+    return SendCampaignResponse(
+        campaign_id=campaign.id,
+        status=campaign.status,
+        queued_count=campaign.queued_count,
+        accepted_count=campaign.accepted_count,
+    )
 
-@router.get("/campaigns/{campaign_id}/events", response_model=list[CampaignEventResponse])
-async def get_campaign_events(campaign_id: uuid.UUID, db: AsyncSession = Depends(get_db)) -> list[CampaignEventResponse]:
-    rows = (
-        await db.execute(
-            select(EmailEvent)
-            .join(EmailMessage, EmailMessage.id == EmailEvent.message_id)
-            .where(EmailMessage.campaign_id == campaign_id)
-            .order_by(EmailEvent.occurred_at.asc())
+
+@router.get("/campaigns/{campaign_id}", response_model=CampaignProgressResponse)
+async def get_campaign_progress(campaign_id: uuid.UUID, db: AsyncSession = Depends(get_db)) -> CampaignProgressResponse:
+    campaign = (await db.execute(select(EmailCampaign).where(EmailCampaign.id == campaign_id))).scalar_one_or_none()
+    if campaign is None:
+        raise HTTPException(status_code=404, detail="campaign not found")
+
+    completed = campaign.sent_count + campaign.failed_count
+    rate_per_minute = 0.0
+    if campaign.started_at is not None:
+        finished_at = _as_utc(campaign.finished_at) if campaign.finished_at else datetime.now(timezone.utc)
+        elapsed = (finished_at - _as_utc(campaign.started_at)).total_seconds()
+        rate_per_minute = completed * 60 / elapsed if elapsed > 0 else 0.0
+
+    eta_seconds: float | None = None
+    if campaign.status == "sending":
+        remaining = max(0, campaign.queued_count - completed)
+        eta_seconds = remaining * 60 / (rate_per_minute or campaign.send_rate_limit)
+    elif campaign.status == "done":
+        eta_seconds = 0.0
+
+    return CampaignProgressResponse(
+        campaign_id=campaign.id,
+        status=campaign.status,
+        queued_count=campaign.queued_count,
+        sent_count=campaign.sent_count,
+        failed_count=campaign.failed_count,
+        rate_per_minute=round(rate_per_minute, 2),
+        eta_seconds=round(eta_seconds, 1) if eta_seconds is not None else None,
+        started_at=campaign.started_at,
+        finished_at=campaign.finished_at,
+    )
+
+
+@router.get("/campaigns/{campaign_id}/stats", response_model=CampaignStatsResponse)
+async def get_campaign_stats_rollup(campaign_id: uuid.UUID, db: AsyncSession = Depends(get_db)) -> CampaignStatsResponse:
+    """Counters from the ``campaign_stats`` rollup: one primary-key read whatever the campaign size."""
+    stats = await get_campaign_stats(db, campaign_id)
+    if stats is not None:
+        return CampaignStatsResponse(
+            campaign_id=campaign_id,
+            sent_count=stats.sent_count,
+            failed_count=stats.failed_count,
+            delivered_count=stats.delivered_count,
+            opened_count=stats.opened_count,
+            bounced_count=stats.bounced_count,
+            replied_count=stats.replied_count,
+            unsubscribed_count=stats.unsubscribed_count,
+            updated_at=stats.updated_at,
         )
-    ).scalars().all()
+    campaign_exists = (await db.execute(select(EmailCampaign.id).where(EmailCampaign.id == campaign_id))).scalar_one_or_none()
+    if campaign_exists is None:
+        raise HTTPException(status_code=404, detail="campaign not found")
+    return CampaignStatsResponse(campaign_id=campaign_id)
+
+
+def _as_utc(value: datetime) -> datetime:
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+
+@router.get("/campaigns/{campaign_id}/events", response_model=list[CampaignEventResponse])
+async def get_campaign_events(
+    campaign_id: uuid.UUID,
+    response: Response,
+    after: str | None = Query(default=None),
+    limit: int | None = Query(default=None, ge=1, le=1000),
+    event_type: list[EmailEventType] | None = Query(default=None),
+    db: AsyncSession = Depends(get_db),
+) -> list[CampaignEventResponse]:
+    """Events for a campaign, oldest first; unpaged unless ``limit`` or ``after`` is given."""
+    stmt = _campaign_events_query(campaign_id, after, event_type)
+    if after is not None and limit is None:
+        limit = 200
+    if limit is not None:
+        stmt = stmt.limit(limit + 1)
+    rows = (await db.execute(stmt)).all()
+
+    if limit is not None and len(rows) > limit:
+        rows = rows[:limit]
+        set_next_cursor(response, encode_cursor(rows[-1].occurred_at, rows[-1].id))
 
     return [
         CampaignEventResponse(
@@ -81,19 +171,67 @@ async def get_campaign_events(campaign_id: uuid.UUID, db: AsyncSession = Depends
     ]
 
 
+@router.get("/campaigns/{campaign_id}/events/stream")
+async def stream_campaign_events(
+    campaign_id: uuid.UUID,
+    after: str | None = Query(default=None),
+    event_type: list[EmailEventType] | None = Query(default=None),
+    include_payload: bool = Query(default=True),
+    session_factory: async_sessionmaker[AsyncSession] = Depends(get_session_factory),
+) -> StreamingResponse:
+    """Stream every matching event as NDJSON, one object per line.
+
+    ``include_payload=false`` drops ``raw_payload``, which dominates row size.
+    """
+    stmt = _campaign_events_query(campaign_id, after, event_type, include_payload=include_payload)
+    return ndjson_response(session_factory, stmt, _event_item, settings.ndjson_stream_batch_size)
+
+
+def _campaign_events_query(
+    campaign_id: uuid.UUID,
+    after: str | None,
+    event_types: list[str] | None,
+    include_payload: bool = True,
+) -> Select:
+    columns = [EmailEvent.id, EmailEvent.message_id, EmailEvent.event_type, EmailEvent.occurred_at]
+    if include_payload:
+        columns.append(EmailEvent.raw_payload)
+    stmt = (
+        select(*columns)
+        .join(EmailMessage, EmailMessage.id == EmailEvent.message_id)
+        .where(EmailMessage.campaign_id == campaign_id)
+        .order_by(EmailEvent.occurred_at.asc(), EmailEvent.id.asc())
+    )
+    if event_types:
+        stmt = stmt.where(EmailEvent.event_type.in_(event_types))
+    if after is not None:
+        stmt = stmt.where(tuple_(EmailEvent.occurred_at, EmailEvent.id) > tuple_(*decode_datetime_cursor(after)))
+    return stmt
+
+
+def _event_item(row: Row) -> dict:
+    item = {
+        "event_id": str(row.id),
+        "message_id": str(row.message_id),
+        "event_type": row.event_type,
+        "occurred_at": row.occurred_at.isoformat(),
+    }
+    if "raw_payload" in row._fields:
+        item["raw_payload"] = row.raw_payload
+    return item
+
+
 @router.post("/webhooks/resend")
 async def resend_webhook(
     request: Request,
     x_resend_signature: str | None = Header(default=None),
-    db: AsyncSession = Depends(get_db),
+    batcher: WebhookBatcher = Depends(get_webhook_batcher),
 ):
     payload_bytes = await request.body()
-    service = EmailService()
 
-    if not service.verify_webhook_signature(payload_bytes, x_resend_signature, settings.resend_webhook_secret or None):
+    if not batcher.service.verify_webhook_signature(payload_bytes, x_resend_signature, settings.resend_webhook_secret or None):
         raise HTTPException(status_code=401, detail="invalid signature")
 
     payload = json.loads(payload_bytes.decode("utf-8"))
-    saved = await service.process_webhook_event(db, payload)
-    await db.commit()
+    saved = await batcher.submit(payload)
     return {"ok": True, "saved": saved}
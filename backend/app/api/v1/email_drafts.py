@@ -1,38 +1,42 @@
+import asyncio
+import uuid
+from collections.abc import AsyncIterator
+
 from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import StreamingResponse
 from sqlalchemy import select
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
-from app.api.deps import get_db
+from app.api.deps import get_db, get_session_factory
+from app.api.streaming import NDJSON_MEDIA_TYPE, SSE_HEADERS, SSE_MEDIA_TYPE, sse_event
 from app.models.email_draft import EmailDraft
 from app.models.influencer import Influencer
-from app.schemas.email_draft import EmailDraftResponse, GenerateEmailDraftRequest
-from app.services.ai_service import AIService
+from app.schemas.email_draft import (
+    DraftCacheStatsResponse,
+    EmailDraftBatchItem,
+    EmailDraftResponse,
+    GenerateEmailDraftBatchRequest,
+    GenerateEmailDraftRequest,
+)
+from app.services.ai_service import AIService, get_ai_service
+from app.services.ingest_service import bulk_insert
 
 router = APIRouter()
 
 
 @router.post("/email-drafts/generate", response_model=EmailDraftResponse)
-async def generate_email_draft(body: GenerateEmailDraftRequest, db: AsyncSession = Depends(get_db)) -> EmailDraftResponse:
+async def generate_email_draft(
+    body: GenerateEmailDraftRequest,
+    db: AsyncSession = Depends(get_db),
+    ai: AIService = Depends(get_ai_service),
+) -> EmailDraftResponse:
     influencers = (
         await db.execute(select(Influencer).where(Influencer.id.in_(body.influencer_ids)))
     ).scalars().all()
     if not influencers:
         raise HTTPException(status_code=400, detail="no influencers found")
 
-    context = {
-        "influencers": [
-            {
-                "id": str(i.id),
-                "name": i.display_name,
-                "platform": i.platform,
-                "followers": i.follower_count,
-            }
-            for i in influencers
-        ]
-    }
-
-    ai = AIService()
-    generated = await ai.generate_email_draft(body.goal, body.tone, body.language, context=context)
+    generated = await ai.generate_email_draft(body.goal, body.tone, body.language, context=_draft_context(influencers))
 
     draft = EmailDraft(
         goal=body.goal,
@@ -54,3 +58,185 @@ async def generate_email_draft(body: GenerateEmailDraftRequest, db: AsyncSession
         variables=draft.variables,
         created_at=draft.created_at,
     )
+
+
+@router.post("/email-drafts/generate/stream")
+async def stream_email_draft(
+    body: GenerateEmailDraftRequest,
+    db: AsyncSession = Depends(get_db),
+    ai: AIService = Depends(get_ai_service),
+    session_factory: async_sessionmaker[AsyncSession] = Depends(get_session_factory),
+) -> StreamingResponse:
+    """Server-sent-events variant of ``/email-drafts/generate``.
+
+    Emits ``delta`` events (``{"field": "subject"|"body", "text": ...}``) as
+    tokens arrive, then a ``done`` event with the stored draft once it has
+    been persisted, or an ``error`` event if generation fails.
+    """
+    influencers = (
+        await db.execute(select(Influencer).where(Influencer.id.in_(body.influencer_ids)))
+    ).scalars().all()
+    if not influencers:
+        raise HTTPException(status_code=400, detail="no influencers found")
+
+    return StreamingResponse(
+        _stream_and_store_draft(ai, session_factory, body, _draft_context(influencers)),
+        media_type=SSE_MEDIA_TYPE,
+        headers=SSE_HEADERS,
+    )
+
+
+@router.post("/email-drafts/generate-batch")
+async def generate_email_drafts_batch(
+    body: GenerateEmailDraftBatchRequest,
+    db: AsyncSession = Depends(get_db),
+    ai: AIService = Depends(get_ai_service),
+    session_factory: async_sessionmaker[AsyncSession] = Depends(get_session_factory),
+) -> StreamingResponse:
+    """Generate one personalized draft per influencer, streamed as NDJSON in completion order.
+
+    Each line is an ``EmailDraftBatchItem``. Finished drafts are stored with
+    bulk inserts of up to ``ai_draft_insert_batch_size`` rows, committed as
+    soon as no further draft is ready, and sent once committed, so every
+    streamed ``draft_id`` is already readable. Errors are sent immediately.
+    """
+    influencers = (
+        await db.execute(select(Influencer).where(Influencer.id.in_(body.influencer_ids)))
+    ).scalars().all()
+    if not influencers:
+        raise HTTPException(status_code=400, detail="no influencers found")
+
+    return StreamingResponse(
+        _generate_and_store_drafts(ai, session_factory, body, list(influencers)), media_type=NDJSON_MEDIA_TYPE
+    )
+
+
+@router.get("/email-drafts/cache-stats", response_model=DraftCacheStatsResponse)
+async def get_draft_cache_stats(ai: AIService = Depends(get_ai_service)) -> DraftCacheStatsResponse:
+    return DraftCacheStatsResponse(**ai.cache.stats())
+
+
+def _draft_context(influencers: list[Influencer]) -> dict:
+    return {
+        "influencers": [
+            {
+                "id": str(i.id),
+                "name": i.display_name,
+                "platform": i.platform,
+                "followers": i.follower_count,
+            }
+            # Sorted so the same selection always yields the same prompt (and draft cache key).
+            for i in sorted(influencers, key=lambda influencer: str(influencer.id))
+        ]
+    }
+
+
+async def _stream_and_store_draft(
+    ai: AIService,
+    session_factory: async_sessionmaker[AsyncSession],
+    body: GenerateEmailDraftRequest,
+    context: dict,
+) -> AsyncIterator[bytes]:
+    try:
+        async for delta in ai.stream_email_draft(body.goal, body.tone, body.language, context):
+            if delta.draft is None:
+                yield sse_event("delta", {"field": delta.field, "text": delta.text})
+                continue
+            async with session_factory() as session:
+                draft = EmailDraft(
+                    goal=body.goal,
+                    tone=body.tone,
+                    language=body.language,
+                    subject=delta.draft["subject"],
+                    body=delta.draft["body"],
+                    variables=delta.draft.get("variables", {}),
+                    influencer_ids=body.influencer_ids,
+                )
+                session.add(draft)
+                await session.commit()
+                await session.refresh(draft)
+            response = EmailDraftResponse(
+                id=draft.id,
+                subject=draft.subject,
+                body=draft.body,
+                variables=draft.variables,
+                created_at=draft.created_at,
+            )
+            yield sse_event("done", response.model_dump(mode="json"))
+    except Exception as exc:
+        # Headers are already sent, so failures are reported in-band.
+        yield sse_event("error", {"detail": str(exc) or type(exc).__name__})
+
+
+async def _generate_and_store_drafts(
+    ai: AIService,
+    session_factory: async_sessionmaker[AsyncSession],
+    body: GenerateEmailDraftBatchRequest,
+    influencers: list[Influencer],
+) -> AsyncIterator[bytes]:
+    batch_size = ai.settings.ai_draft_insert_batch_size
+    contexts = [_draft_context([influencer]) for influencer in influencers]
+    results: asyncio.Queue = asyncio.Queue()
+
+    async def produce() -> None:
+        try:
+            async for result in ai.generate_email_drafts(body.goal, body.tone, body.language, contexts):
+                results.put_nowait(result)
+        finally:
+            results.put_nowait(None)
+
+    producer = asyncio.create_task(produce())
+    rows: list[dict] = []
+    # Draft lines are held back until their rows are committed, so a client that
+    # disconnects mid-stream never holds a draft_id that was not stored.
+    lines: list[bytes] = []
+    try:
+        async with session_factory() as session:
+
+            async def flush() -> list[bytes]:
+                nonlocal rows, lines
+                await bulk_insert(session, EmailDraft.__table__, rows, batch_size)
+                await session.commit()
+                flushed, rows, lines = lines, [], []
+                return flushed
+
+            while True:
+                if rows and (results.empty() or len(rows) >= batch_size):
+                    # Nothing else is ready (or the batch is full): store what is buffered and send it.
+                    for line in await flush():
+                        yield line
+                result = await results.get()
+                if result is None:
+                    break
+                influencer = influencers[result.index]
+                if result.draft is None:
+                    # Nothing to store, so the error goes out right away.
+                    item = EmailDraftBatchItem(influencer_id=influencer.id, error=result.error)
+                    yield (item.model_dump_json(exclude_none=True) + "\n").encode("utf-8")
+                    continue
+                row = {
+                    "id": uuid.uuid4(),
+                    "goal": body.goal,
+                    "tone": body.tone,
+                    "language": body.language,
+                    "subject": result.draft["subject"],
+                    "body": result.draft["body"],
+                    "variables": result.draft.get("variables", {}),
+                    "influencer_ids": [influencer.id],
+                }
+                rows.append(row)
+                item = EmailDraftBatchItem(
+                    influencer_id=influencer.id,
+                    draft_id=row["id"],
+                    subject=row["subject"],
+                    body=row["body"],
+                    variables=row["variables"],
+                )
+                lines.append((item.model_dump_json(exclude_none=True) + "\n").encode("utf-8"))
+            if rows:
+                for line in await flush():
+                    yield line
+            # Surfaces a failure of the draft generator itself.
+            await producer
+    finally:
+        producer.cancel()
@@ -1,32 +1,47 @@
-from fastapi import APIRouter, Depends, Query
-from sqlalchemy import select
+import uuid
+
+from fastapi import APIRouter, Depends, Query, Response
+from sqlalchemy import insert, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.deps import get_db, get_user_id
+from app.api.pagination import encode_cursor, newest_first_after, set_next_cursor
+from app.config import get_settings
+from app.database import dialect_insert
 from app.models.audit_log import AuditLog
 from app.models.influencer import Influencer
 from app.models.search_result import SearchResultRaw
 from app.schemas.influencer import InfluencerListItem, SaveInfluencersRequest, SaveInfluencersResponse
+from app.services.ingest_service import max_rows_per_statement
+from app.urls import normalize_profile_url
 
 router = APIRouter()
 
 
 @router.get("/influencers", response_model=list[InfluencerListItem])
 async def list_influencers(
+    response: Response,
     limit: int = Query(default=50, ge=1, le=200),
+    cursor: str | None = Query(default=None),
     offset: int = Query(default=0, ge=0),
     db: AsyncSession = Depends(get_db),
     user_id: str = Depends(get_user_id),
 ) -> list[InfluencerListItem]:
-    influencers = (
-        await db.execute(
-            select(Influencer)
-            .where(Influencer.saved_by == user_id)
-            .order_by(Influencer.saved_at.desc())
-            .offset(offset)
-            .limit(limit)
-        )
-    ).scalars().all()
+    stmt = (
+        select(Influencer)
+        .where(Influencer.saved_by == user_id)
+        .order_by(Influencer.saved_at.desc(), Influencer.id.desc())
+        .limit(limit + 1)
+    )
+    if cursor is not None:
+        stmt = stmt.where(newest_first_after(Influencer.saved_at, Influencer.id, cursor))
+    elif offset:
+        stmt = stmt.offset(offset)
+    influencers = (await db.execute(stmt)).scalars().all()
+
+    if len(influencers) > limit:
+        influencers = influencers[:limit]
+        set_next_cursor(response, encode_cursor(influencers[-1].saved_at, influencers[-1].id))
 
     return [
         InfluencerListItem(
@@ -55,44 +70,54 @@ async def save_influencers(
         )
     ).scalars().all()
 
-    saved_count = 0
-    skipped_count = 0
-
+    # One row per (platform, platform_user_id); repeats within the selection count as skipped.
+    new_rows: dict[tuple[str, str], dict] = {}
     for raw in raw_rows:
-        exists = (
-            await db.execute(
-                select(Influencer).where(
-                    Influencer.platform == raw.platform,
-                    Influencer.platform_user_id == raw.platform_user_id,
-                )
-            )
-        ).scalar_one_or_none()
-        if exists:
-            skipped_count += 1
-            continue
+        new_rows.setdefault(
+            (raw.platform, raw.platform_user_id),
+            {
+                "id": uuid.uuid4(),
+                "platform": raw.platform,
+                "platform_user_id": raw.platform_user_id,
+                "display_name": raw.display_name,
+                "profile_url": raw.profile_url,
+                "profile_url_normalized": normalize_profile_url(raw.profile_url),
+                "follower_count": raw.follower_count,
+                "email": raw.email,
+                "saved_by": user_id,
+            },
+        )
 
-        influencer = Influencer(
-            platform=raw.platform,
-            platform_user_id=raw.platform_user_id,
-            display_name=raw.display_name,
-            profile_url=raw.profile_url,
-            follower_count=raw.follower_count,
-            email=raw.email,
-            saved_by=user_id,
+    saved_ids: list[uuid.UUID] = []
+    rows = list(new_rows.values())
+    chunk_size = max_rows_per_statement(len(rows[0]) if rows else 1, get_settings().raw_insert_batch_size)
+    for start in range(0, len(rows), chunk_size):
+        stmt = (
+            dialect_insert(db)(Influencer)
+            .values(rows[start : start + chunk_size])
+            .on_conflict_do_nothing(index_elements=[Influencer.platform, Influencer.platform_user_id])
+            .returning(Influencer.id)
         )
-        db.add(influencer)
-        await db.flush()
+        saved_ids.extend((await db.execute(stmt)).scalars().all())
 
-        db.add(
-            AuditLog(
-                user_id=user_id,
-                action="influencer_saved",
-                entity_type="influencer",
-                entity_id=influencer.id,
-                detail={"task_id": str(body.task_id)},
-            )
+    if saved_ids:
+        await db.execute(
+            insert(AuditLog),
+            [
+                {
+                    "id": uuid.uuid4(),
+                    "user_id": user_id,
+                    "action": "influencer_saved",
+                    "entity_type": "influencer",
+                    "entity_id": influencer_id,
+                    "detail": {"task_id": str(body.task_id)},
+                }
+                for influencer_id in saved_ids
+            ],
         )
-        saved_count += 1
+
+    saved_count = len(saved_ids)
+    skipped_count = len(raw_rows) - saved_count
 
     await db.commit()
     return SaveInfluencersResponse(saved_count=saved_count, skipped_count=skipped_count)
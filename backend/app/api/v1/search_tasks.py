@@ -1,14 +1,22 @@
 import uuid
+from datetime import datetime
 
-from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query
-from sqlalchemy import select
-from sqlalchemy.ext.asyncio import AsyncSession
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy import ColumnElement, Row, Select, func, or_, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
-from app.api.deps import get_db, get_user_id
+from app.api.deps import get_db, get_session_factory, get_user_id
+from app.api.pagination import decode_cursor, encode_cursor, newest_first_after, set_next_cursor
+from app.api.streaming import ndjson_response
+from app.config import get_settings
 from app.models.search_result import SearchResultDeduped, SearchResultRaw
 from app.models.search_task import SearchTask
 from app.schemas.search_task import (
+    DedupStatus,
+    SearchResultFilters,
     SearchResultResponse,
+    SearchResultSort,
     SearchTaskCreate,
     SearchTaskCreateResponse,
     SearchTaskListItem,
@@ -18,6 +26,7 @@ from app.services.search_service import SearchService
 from app.workers.tasks import run_search_task
 
 router = APIRouter()
+settings = get_settings()
 
 
 @router.post("/search-tasks", response_model=SearchTaskCreateResponse)
@@ -35,7 +44,9 @@ async def create_search_task(
     await db.commit()
     await db.refresh(task)
 
-    background_tasks.add_task(run_search_task, task.id)
+    # In queue mode the pending row is the job; app.workers.search_worker picks it up.
+    if settings.search_task_executor == "background":
+        background_tasks.add_task(run_search_task, task.id)
     return SearchTaskCreateResponse(task_id=task.id, status=task.status)
 
 
@@ -56,20 +67,28 @@ async def get_search_task(task_id: uuid.UUID, db: AsyncSession = Depends(get_db)
 
 @router.get("/search-tasks", response_model=list[SearchTaskListItem])
 async def list_search_tasks(
+    response: Response,
     limit: int = Query(default=20, ge=1, le=100),
+    cursor: str | None = Query(default=None),
     offset: int = Query(default=0, ge=0),
     db: AsyncSession = Depends(get_db),
     user_id: str = Depends(get_user_id),
 ) -> list[SearchTaskListItem]:
-    tasks = (
-        await db.execute(
-            select(SearchTask)
-            .where(SearchTask.user_id == user_id)
-            .order_by(SearchTask.created_at.desc())
-            .offset(offset)
-            .limit(limit)
-        )
-    ).scalars().all()
+    stmt = (
+        select(SearchTask)
+        .where(SearchTask.user_id == user_id)
+        .order_by(SearchTask.created_at.desc(), SearchTask.id.desc())
+        .limit(limit + 1)
+    )
+    if cursor is not None:
+        stmt = stmt.where(newest_first_after(SearchTask.created_at, SearchTask.id, cursor))
+    elif offset:
+        stmt = stmt.offset(offset)
+    tasks = (await db.execute(stmt)).scalars().all()
+
+    if len(tasks) > limit:
+        tasks = tasks[:limit]
+        set_next_cursor(response, encode_cursor(tasks[-1].created_at, tasks[-1].id))
 
     return [
         SearchTaskListItem(
@@ -84,31 +103,134 @@ async def list_search_tasks(
     ]
 
 
+def _search_result_filters(
+    dedup_status: list[DedupStatus] | None = Query(default=None),
+    follower_min: int | None = Query(default=None, ge=0),
+    follower_max: int | None = Query(default=None, ge=0),
+    has_email: bool | None = Query(default=None),
+    sort: SearchResultSort = Query(default="created_at"),
+) -> SearchResultFilters:
+    return SearchResultFilters(
+        dedup_status=dedup_status or [],
+        follower_min=follower_min,
+        follower_max=follower_max,
+        has_email=has_email,
+        sort=sort,
+    )
+
+
 @router.get("/search-tasks/{task_id}/results", response_model=list[SearchResultResponse])
-async def get_search_task_results(task_id: uuid.UUID, db: AsyncSession = Depends(get_db)) -> list[SearchResultResponse]:
-    rows = (
-        await db.execute(
-            select(SearchResultDeduped, SearchResultRaw)
-            .join(SearchResultRaw, SearchResultRaw.id == SearchResultDeduped.raw_result_id)
-            .where(SearchResultDeduped.task_id == task_id)
-            .order_by(SearchResultDeduped.created_at.asc())
+async def get_search_task_results(
+    task_id: uuid.UUID,
+    response: Response,
+    filters: SearchResultFilters = Depends(_search_result_filters),
+    cursor: str | None = Query(default=None),
+    limit: int | None = Query(default=None, ge=1, le=1000),
+    db: AsyncSession = Depends(get_db),
+) -> list[SearchResultResponse]:
+    """Deduped results for a task; unpaged unless ``limit`` or ``cursor`` is given."""
+    stmt = _search_results_query(task_id, filters, cursor)
+    if cursor is not None and limit is None:
+        limit = 200
+    if limit is not None:
+        stmt = stmt.limit(limit + 1)
+    rows = (await db.execute(stmt)).all()
+
+    if limit is not None and len(rows) > limit:
+        rows = rows[:limit]
+        set_next_cursor(response, _results_cursor(rows[-1], filters.sort))
+    return [SearchResultResponse(**row._mapping) for row in rows]
+
+
+@router.get("/search-tasks/{task_id}/results/stream")
+async def stream_search_task_results(
+    task_id: uuid.UUID,
+    filters: SearchResultFilters = Depends(_search_result_filters),
+    cursor: str | None = Query(default=None),
+    session_factory: async_sessionmaker[AsyncSession] = Depends(get_session_factory),
+) -> StreamingResponse:
+    """Stream every matching result as NDJSON, one object per line."""
+    stmt = _search_results_query(task_id, filters, cursor)
+    return ndjson_response(
+        session_factory,
+        stmt,
+        lambda row: SearchResultResponse(**row._mapping).model_dump(mode="json"),
+        settings.ndjson_stream_batch_size,
+    )
+
+
+def _search_results_query(task_id: uuid.UUID, filters: SearchResultFilters, cursor: str | None) -> Select:
+    followers = _follower_sort_key()
+    stmt = (
+        select(
+            SearchResultDeduped.id.label("deduped_id"),
+            SearchResultRaw.id.label("raw_result_id"),
+            SearchResultDeduped.dedup_status,
+            SearchResultDeduped.matched_influencer_id,
+            SearchResultDeduped.match_score,
+            SearchResultRaw.platform,
+            SearchResultRaw.platform_user_id,
+            SearchResultRaw.display_name,
+            SearchResultRaw.profile_url,
+            SearchResultRaw.follower_count,
+            SearchResultRaw.email,
+            SearchResultDeduped.created_at,
+            SearchResultDeduped.ordinal,
         )
-    ).all()
-
-    results: list[SearchResultResponse] = []
-    for deduped, raw in rows:
-        results.append(
-            SearchResultResponse(
-                deduped_id=deduped.id,
-                raw_result_id=raw.id,
-                dedup_status=deduped.dedup_status,
-                matched_influencer_id=deduped.matched_influencer_id,
-                platform=raw.platform,
-                platform_user_id=raw.platform_user_id,
-                display_name=raw.display_name,
-                profile_url=raw.profile_url,
-                follower_count=raw.follower_count,
-                email=raw.email,
-            )
+        .join(SearchResultRaw, SearchResultRaw.id == SearchResultDeduped.raw_result_id)
+        # Filter both sides on the task so either side's (task_id, ...) index is usable.
+        .where(SearchResultDeduped.task_id == task_id, SearchResultRaw.task_id == task_id)
+    )
+    if filters.dedup_status:
+        stmt = stmt.where(SearchResultDeduped.dedup_status.in_(filters.dedup_status))
+    if filters.follower_min is not None:
+        stmt = stmt.where(SearchResultRaw.follower_count >= filters.follower_min)
+    if filters.follower_max is not None:
+        stmt = stmt.where(SearchResultRaw.follower_count <= filters.follower_max)
+    if filters.has_email is True:
+        stmt = stmt.where(SearchResultRaw.email.is_not(None), SearchResultRaw.email != "")
+    elif filters.has_email is False:
+        stmt = stmt.where(or_(SearchResultRaw.email.is_(None), SearchResultRaw.email == ""))
+
+    # Follower sorts key on the raw row so they walk ix_search_results_raw_task_followers;
+    # the default order walks ix_search_results_deduped_task_created_at_id.
+    if filters.sort == "created_at":
+        key = tuple_(SearchResultDeduped.created_at, SearchResultDeduped.ordinal, SearchResultDeduped.id)
+        if cursor is not None:
+            stmt = stmt.where(key > tuple_(*_decode_created_at_cursor(cursor)))
+        return stmt.order_by(
+            SearchResultDeduped.created_at.asc(), SearchResultDeduped.ordinal.asc(), SearchResultDeduped.id.asc()
         )
-    return results
+
+    key = tuple_(followers, SearchResultRaw.id)
+    if cursor is not None:
+        follower_count, raw_id = decode_cursor(cursor)
+        if not isinstance(follower_count, int):
+            raise HTTPException(status_code=400, detail="invalid cursor")
+        position = tuple_(follower_count, raw_id)
+        stmt = stmt.where(key < position if filters.sort == "followers_desc" else key > position)
+    if filters.sort == "followers_desc":
+        return stmt.order_by(followers.desc(), SearchResultRaw.id.desc())
+    return stmt.order_by(followers.asc(), SearchResultRaw.id.asc())
+
+
+def _follower_sort_key() -> ColumnElement[int]:
+    # Unknown follower counts sort below zero; matches the expression index.
+    return func.coalesce(SearchResultRaw.follower_count, -1)
+
+
+def _results_cursor(row: Row, sort: str) -> str:
+    if sort == "created_at":
+        return encode_cursor([row.created_at.isoformat(), row.ordinal], row.deduped_id)
+    return encode_cursor(-1 if row.follower_count is None else row.follower_count, row.raw_result_id)
+
+
+def _decode_created_at_cursor(cursor: str) -> tuple[datetime, int, uuid.UUID]:
+    position, deduped_id = decode_cursor(cursor)
+    try:
+        created_at, ordinal = position
+        if not isinstance(ordinal, int):
+            raise TypeError
+        return datetime.fromisoformat(created_at), ordinal, deduped_id
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="invalid cursor") from None
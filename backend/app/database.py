@@ -1,10 +1,14 @@
 from collections.abc import AsyncGenerator
 from urllib.parse import parse_qsl, urlencode, urlparse, urlunparse
 
+from sqlalchemy import ColumnElement, Text, any_, bindparam
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import DeclarativeBase
 
 from app.config import get_settings
+from app.db_metrics import InstrumentedQueuePool, instrument_engine
+from app.db_profiler import SQLProfiler
 
 settings = get_settings()
 
@@ -30,11 +34,48 @@ def _normalize_database_url(url: str) -> str:
     return urlunparse(parsed._replace(query=normalized_query))
 
 
+def dialect_insert(session: AsyncSession):
+    """Return the dialect-specific insert() so ON CONFLICT clauses are available."""
+    if session.get_bind().dialect.name == "sqlite":
+        return sqlite.insert
+    return postgresql.insert
+
+
+def match_any(session: AsyncSession, column, values: list[str]) -> ColumnElement[bool]:
+    """``column = ANY(:values)`` on Postgres (one array parameter), ``IN`` elsewhere."""
+    if session.get_bind().dialect.name == "postgresql":
+        return column == any_(bindparam(None, list(values), type_=postgresql.ARRAY(Text)))
+    return column.in_(values)
+
+
 class Base(DeclarativeBase):
     pass
 
 
-engine = create_async_engine(_normalize_database_url(settings.database_url), echo=settings.debug, future=True)
+def _engine_options(url: str) -> dict:
+    options: dict = {"echo": settings.debug, "future": True, "pool_pre_ping": settings.db_pool_pre_ping}
+    if url.startswith("postgresql+asyncpg://"):
+        options.update(
+            poolclass=InstrumentedQueuePool,
+            pool_size=settings.db_pool_size,
+            max_overflow=settings.db_max_overflow,
+            pool_timeout=settings.db_pool_timeout_seconds,
+            pool_recycle=settings.db_pool_recycle_seconds,
+            connect_args={"prepared_statement_cache_size": settings.db_statement_cache_size},
+        )
+    return options
+
+
+_database_url = _normalize_database_url(settings.database_url)
+engine = create_async_engine(_database_url, **_engine_options(_database_url))
+instrument_engine(engine.sync_engine)
+sql_profiler = SQLProfiler(
+    n_plus_one_threshold=settings.sql_profiler_n_plus_one_threshold,
+    slowest=settings.sql_profiler_slowest,
+    history=settings.sql_profiler_history,
+)
+if settings.sql_profiler_enabled:
+    sql_profiler.install(engine.sync_engine)
 AsyncSessionLocal = async_sessionmaker(engine, expire_on_commit=False, class_=AsyncSession)
 
 
@@ -0,0 +1,113 @@
+import time
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool
+
+from app.metrics import Counter, Gauge, Histogram, registry
+
+
+class PoolMetrics:
+    """Connection-pool and prepared-statement-cache counters for one engine."""
+
+    def __init__(self) -> None:
+        self.checkout_wait = Histogram("db_pool_checkout_wait_seconds", "Time spent waiting for a pooled connection.")
+        self.checkouts = 0
+        self.connects = 0
+        self.invalidations = 0
+        self.statement_cache_hits = 0
+        self.statement_cache_misses = 0
+        self.pool: Pool | None = None
+
+    def snapshot(self) -> dict:
+        pool = self.pool
+        stats: dict = {
+            "checkouts": self.checkouts,
+            "connects": self.connects,
+            "invalidations": self.invalidations,
+            "checkout_wait_seconds": self.checkout_wait.snapshot(),
+            "statement_cache": {"hits": self.statement_cache_hits, "misses": self.statement_cache_misses},
+        }
+        if isinstance(pool, AsyncAdaptedQueuePool):
+            stats.update(
+                pool_size=pool.size(),
+                checked_out=pool.checkedout(),
+                checked_in=pool.checkedin(),
+                overflow=pool.overflow(),
+            )
+        return stats
+
+    def collect(self) -> list:
+        """Export the snapshot as metric families for the Prometheus registry."""
+        families: list = [self.checkout_wait]
+        for name, documentation, value in (
+            ("db_pool_checkouts_total", "Connections handed out by the pool.", self.checkouts),
+            ("db_pool_connects_total", "New DBAPI connections opened.", self.connects),
+            ("db_pool_invalidations_total", "Pooled connections invalidated.", self.invalidations),
+        ):
+            counter = Counter(name, documentation)
+            counter.inc(value)
+            families.append(counter)
+        cache = Counter("db_statement_cache_lookups_total", "Prepared-statement cache lookups.", ("result",))
+        cache.inc(self.statement_cache_hits, result="hit")
+        cache.inc(self.statement_cache_misses, result="miss")
+        families.append(cache)
+
+        if isinstance(self.pool, AsyncAdaptedQueuePool):
+            occupancy = Gauge("db_pool_connections", "Pool connections by state.", ("state",))
+            occupancy.set(self.pool.checkedout(), state="checked_out")
+            occupancy.set(self.pool.checkedin(), state="checked_in")
+            occupancy.set(self.pool.overflow(), state="overflow")
+            families.append(occupancy)
+        return families
+
+
+pool_metrics = PoolMetrics()
+registry.register_collector(pool_metrics.collect)
+
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """Queue pool that records how long each checkout waited for a connection."""
+
+    metrics = pool_metrics
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            self.metrics.checkout_wait.observe(time.perf_counter() - started)
+
+
+def instrument_engine(engine: Engine, metrics: PoolMetrics = pool_metrics) -> None:
+    """Attach pool and statement-cache listeners to a (sync) engine."""
+    metrics.pool = engine.pool
+    if isinstance(engine.pool, InstrumentedQueuePool):
+        engine.pool.metrics = metrics
+
+    @event.listens_for(engine.pool, "connect")
+    def _on_connect(_dbapi_connection, _record) -> None:
+        metrics.connects += 1
+
+    @event.listens_for(engine.pool, "checkout")
+    def _on_checkout(_dbapi_connection, _record, _proxy) -> None:
+        metrics.checkouts += 1
+
+    @event.listens_for(engine.pool, "invalidate")
+    def _on_invalidate(_dbapi_connection, _record, _exception) -> None:
+        metrics.invalidations += 1
+
+    if engine.dialect.driver != "asyncpg":
+        return
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _on_execute(connection, _cursor, statement, _parameters, _context, executemany) -> None:
+        # The asyncpg adapter keys its per-connection prepared statement LRU by SQL text.
+        # executemany goes straight to asyncpg's own executemany and never consults it.
+        cache = getattr(connection.connection.dbapi_connection, "_prepared_statement_cache", None)
+        if cache is None or executemany:
+            return
+        if statement in cache:
+            metrics.statement_cache_hits += 1
+        else:
+            metrics.statement_cache_misses += 1
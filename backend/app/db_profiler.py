@@ -0,0 +1,102 @@
+import time
+from collections import deque
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+_current_profile: ContextVar["QueryProfile | None"] = ContextVar("sql_query_profile", default=None)
+
+
+class QueryProfile:
+    """Statements executed while profiling one unit of work (usually a request).
+
+    Statements are grouped by their SQL text, so a query issued in a loop
+    with different parameters counts as one statement executed many times;
+    any statement repeated at least ``n_plus_one_threshold`` times is
+    flagged as a likely N+1.
+    """
+
+    def __init__(self, label: str, n_plus_one_threshold: int, slowest: int) -> None:
+        self.label = label
+        self.n_plus_one_threshold = n_plus_one_threshold
+        self.slowest_limit = slowest
+        self.query_count = 0
+        self.total_seconds = 0.0
+        self.statements: dict[str, list] = {}  # sql -> [count, total_seconds]
+        self.slowest: list[tuple[float, str]] = []
+
+    def record(self, statement: str, seconds: float) -> None:
+        self.query_count += 1
+        self.total_seconds += seconds
+        entry = self.statements.get(statement)
+        if entry is None:
+            self.statements[statement] = [1, seconds]
+        else:
+            entry[0] += 1
+            entry[1] += seconds
+        if len(self.slowest) < self.slowest_limit or seconds > self.slowest[-1][0]:
+            self.slowest.append((seconds, statement))
+            self.slowest.sort(key=lambda item: item[0], reverse=True)
+            del self.slowest[self.slowest_limit :]
+
+    def n_plus_one(self) -> list[dict]:
+        suspects = [
+            {"statement": statement, "count": count, "total_ms": round(seconds * 1000, 3)}
+            for statement, (count, seconds) in self.statements.items()
+            if count >= self.n_plus_one_threshold
+        ]
+        return sorted(suspects, key=lambda item: item["count"], reverse=True)
+
+    def summary(self) -> dict:
+        return {
+            "label": self.label,
+            "query_count": self.query_count,
+            "total_ms": round(self.total_seconds * 1000, 3),
+            "slowest": [{"statement": statement, "ms": round(seconds * 1000, 3)} for seconds, statement in self.slowest],
+            "n_plus_one": self.n_plus_one(),
+        }
+
+
+class SQLProfiler:
+    """Collects ``QueryProfile``s for engines it has been installed on.
+
+    Nothing is hooked into SQLAlchemy until ``install`` is called, so an
+    application that never enables the profiler pays nothing; once
+    installed, statements outside a ``profile()`` block cost one context
+    variable lookup.
+    """
+
+    def __init__(self, n_plus_one_threshold: int = 5, slowest: int = 5, history: int = 100) -> None:
+        self.n_plus_one_threshold = n_plus_one_threshold
+        self.slowest = slowest
+        self.recent: deque[dict] = deque(maxlen=history)
+
+    def install(self, engine: Engine) -> None:
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+    @contextmanager
+    def profile(self, label: str) -> Iterator[QueryProfile]:
+        profile = QueryProfile(label, self.n_plus_one_threshold, self.slowest)
+        token = _current_profile.set(profile)
+        try:
+            yield profile
+        finally:
+            _current_profile.reset(token)
+            self.recent.append(profile.summary())
+
+
+def _before_cursor_execute(conn, _cursor, _statement, _parameters, _context, _executemany) -> None:
+    if _current_profile.get() is not None:
+        conn.info.setdefault("profiler_started", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, _cursor, statement, _parameters, _context, _executemany) -> None:
+    profile = _current_profile.get()
+    started = conn.info.get("profiler_started")
+    if profile is None or not started:
+        return
+    profile.record(statement, time.perf_counter() - started.pop())
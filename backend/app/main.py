@@ -1,12 +1,34 @@
-from fastapi import FastAPI
+import asyncio
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
 
+from app.api.instrumentation import PROFILE_HEADERS, MetricsMiddleware, SQLProfilerMiddleware
+from app.api.deps import get_campaign_queue
+from app.api.pagination import NEXT_CURSOR_HEADER
 from app.api.v1.router import api_router
 from app.config import get_settings
+from app.database import sql_profiler
+from app.db_metrics import pool_metrics
+from app.metrics import PROMETHEUS_CONTENT_TYPE, registry
+from app.workers.tasks import recover_campaigns_forever
 
 settings = get_settings()
 
-app = FastAPI(title=settings.app_name, debug=settings.debug)
+
+@asynccontextmanager
+async def lifespan(_app: FastAPI) -> AsyncIterator[None]:
+    # Resume campaigns whose sending process died (their lease expired).
+    recovery = asyncio.create_task(recover_campaigns_forever(get_campaign_queue()))
+    try:
+        yield
+    finally:
+        recovery.cancel()
+
+
+app = FastAPI(title=settings.app_name, debug=settings.debug, lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -14,7 +36,11 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER, *PROFILE_HEADERS],
 )
+app.add_middleware(MetricsMiddleware)
+if settings.sql_profiler_enabled:
+    app.add_middleware(SQLProfilerMiddleware, profiler=sql_profiler)
 
 
 @app.get("/health")
@@ -22,4 +48,24 @@ async def healthcheck() -> dict[str, str]:
     return {"status": "ok"}
 
 
+@app.get("/health/db")
+async def database_pool_stats() -> dict:
+    """Pool occupancy, checkout wait histogram and prepared-statement cache hit counts."""
+    return pool_metrics.snapshot()
+
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics() -> Response:
+    """Prometheus text exposition of the process metrics registry."""
+    return Response(registry.render(), media_type=PROMETHEUS_CONTENT_TYPE)
+
+
+if settings.sql_profiler_enabled:
+
+    @app.get("/debug/sql-profiles", include_in_schema=False)
+    async def sql_profiles() -> list[dict]:
+        """Most recent request profiles, newest first, with slowest statements and N+1 suspects."""
+        return list(reversed(sql_profiler.recent))
+
+
 app.include_router(api_router, prefix=settings.api_v1_prefix)
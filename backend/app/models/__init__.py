@@ -1,4 +1,5 @@
 from app.models.audit_log import AuditLog
+from app.models.campaign_stats import CampaignStats
 from app.models.email_campaign import EmailCampaign
 from app.models.email_draft import EmailDraft
 from app.models.email_event import EmailEvent
@@ -6,9 +7,12 @@ from app.models.email_message import EmailMessage
 from app.models.influencer import Influencer
 from app.models.search_result import SearchResultDeduped, SearchResultRaw
 from app.models.search_task import SearchTask
+from app.models.send_quota import SendQuotaLedger
+from app.models.youtube_cache import YouTubeCacheEntry
 
 __all__ = [
     "AuditLog",
+    "CampaignStats",
     "EmailCampaign",
     "EmailDraft",
     "EmailEvent",
@@ -17,4 +21,6 @@ __all__ = [
     "SearchResultDeduped",
     "SearchResultRaw",
     "SearchTask",
+    "SendQuotaLedger",
+    "YouTubeCacheEntry",
 ]
@@ -0,0 +1,24 @@
+import uuid
+from datetime import datetime
+
+from sqlalchemy import DateTime, ForeignKey, Integer, func
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.database import Base
+
+
+class CampaignStats(Base):
+    __tablename__ = "campaign_stats"
+
+    campaign_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("email_campaigns.id", ondelete="CASCADE"), primary_key=True
+    )
+    sent_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    failed_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    delivered_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    opened_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    bounced_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    replied_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    unsubscribed_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, server_default=func.now())
@@ -26,7 +26,7 @@ class EmailMessage(Base):
         nullable=False,
         default="pending",
     )
-    provider_message_id: Mapped[str | None] = mapped_column(Text)
+    provider_message_id: Mapped[str | None] = mapped_column(Text, index=True)
     sent_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
 
     campaign = relationship("EmailCampaign", back_populates="messages")
@@ -1,11 +1,16 @@
 import uuid
 from datetime import datetime
 
-from sqlalchemy import BigInteger, DateTime, String, Text, UniqueConstraint, func
+from sqlalchemy import BigInteger, DateTime, Index, String, Text, UniqueConstraint, func, literal_column
 from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.orm import Mapped, mapped_column, validates
 
 from app.database import Base
+from app.urls import normalize_profile_url
+
+
+def _normalized_profile_url(context) -> str:
+    return normalize_profile_url(context.get_current_parameters()["profile_url"])
 
 
 class Influencer(Base):
@@ -16,9 +21,42 @@ class Influencer(Base):
     platform: Mapped[str] = mapped_column(String(20), nullable=False)
     platform_user_id: Mapped[str] = mapped_column(Text, nullable=False)
     display_name: Mapped[str] = mapped_column(Text, nullable=False)
-    profile_url: Mapped[str] = mapped_column(Text, nullable=False)
+    profile_url: Mapped[str] = mapped_column(Text, nullable=False, index=True)
+    # normalize_profile_url(profile_url), so the dedup prefetch can match URLs with an indexed IN.
+    profile_url_normalized: Mapped[str | None] = mapped_column(Text, index=True, default=_normalized_profile_url)
     follower_count: Mapped[int | None] = mapped_column(BigInteger)
     email: Mapped[str | None] = mapped_column(Text, index=True)
     saved_by: Mapped[str] = mapped_column(Text, nullable=False)
     saved_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, server_default=func.now())
     unsubscribed_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+
+    @validates("profile_url")
+    def _sync_profile_url_normalized(self, _key: str, profile_url: str) -> str:
+        # ORM assignments keep the normalized URL in step here; Core inserts get it from
+        # the column default, and a Core UPDATE of profile_url must set it alongside.
+        self.profile_url_normalized = normalize_profile_url(profile_url)
+        return profile_url
+
+
+# Expression indexes backing the dedup candidate prefetch in SearchService.
+Index("ix_influencers_email_lower", func.lower(func.trim(Influencer.email)))
+Index("ix_influencers_platform_display_name_lower", Influencer.platform, func.lower(func.trim(Influencer.display_name)))
+
+# Keyset pagination for GET /influencers (newest first within an owner).
+Index("ix_influencers_saved_by_saved_at_id", Influencer.saved_by, Influencer.saved_at.desc(), Influencer.id.desc())
+
+# SQL form of dedup_service.compact_name(): lower-cased letters and digits only. The
+# arguments are inlined literals so queries match the index expression below.
+compact_display_name = func.lower(
+    func.regexp_replace(
+        Influencer.display_name, literal_column("'[^[:alnum:]]+'"), literal_column("''"), literal_column("'g'")
+    )
+)
+
+# pg_trgm index for the fuzzy weak-match candidate prefetch (`%` similarity operator).
+Index(
+    "ix_influencers_display_name_compact_trgm",
+    compact_display_name.label("compact_name"),
+    postgresql_using="gin",
+    postgresql_ops={"compact_name": "gin_trgm_ops"},
+).ddl_if(dialect="postgresql")
@@ -1,7 +1,7 @@
 import uuid
 from datetime import datetime
 
-from sqlalchemy import BigInteger, DateTime, Enum, ForeignKey, String, Text, UniqueConstraint, func
+from sqlalchemy import REAL, BigInteger, DateTime, Enum, ForeignKey, Index, Integer, String, Text, UniqueConstraint, func
 from sqlalchemy.dialects.postgresql import JSONB, UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -50,8 +50,28 @@ class SearchResultDeduped(Base):
     matched_influencer_id: Mapped[uuid.UUID | None] = mapped_column(
         UUID(as_uuid=True), ForeignKey("influencers.id", ondelete="SET NULL"), nullable=True, index=True
     )
+    # 1.0 for exact duplicate rules, display-name similarity for weak matches, NULL when unique.
+    match_score: Mapped[float | None] = mapped_column(REAL, nullable=True)
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    # Position within the insert batch; breaks created_at ties in insertion order.
+    ordinal: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
 
     task = relationship("SearchTask", back_populates="deduped_results")
     raw_result = relationship("SearchResultRaw", back_populates="deduped_entries")
     matched_influencer = relationship("Influencer")
+
+
+# Page/sort paths of GET /search-tasks/{task_id}/results.
+Index(
+    "ix_search_results_deduped_task_created_at_ordinal_id",
+    SearchResultDeduped.task_id,
+    SearchResultDeduped.created_at,
+    SearchResultDeduped.ordinal,
+    SearchResultDeduped.id,
+)
+Index(
+    "ix_search_results_raw_task_followers",
+    SearchResultRaw.task_id,
+    func.coalesce(SearchResultRaw.follower_count, -1),
+    SearchResultRaw.id,
+)
@@ -1,7 +1,7 @@
 import uuid
 from datetime import datetime
 
-from sqlalchemy import DateTime, Enum, Integer, Text, func
+from sqlalchemy import DateTime, Enum, Index, Integer, Text, func
 from sqlalchemy.dialects.postgresql import JSONB, UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -10,6 +10,7 @@ from app.database import Base
 
 class SearchTask(Base):
     __tablename__ = "search_tasks"
+    __table_args__ = (Index("ix_search_tasks_status_next_run_at", "status", "next_run_at"),)
 
     id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     user_id: Mapped[str] = mapped_column(Text, nullable=False)
@@ -21,6 +22,11 @@ class SearchTask(Base):
         default="pending",
     )
     result_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    attempts: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    next_run_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    lease_expires_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    locked_by: Mapped[str | None] = mapped_column(Text, nullable=True)
+    last_error: Mapped[str | None] = mapped_column(Text, nullable=True)
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, server_default=func.now())
     updated_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), nullable=False, server_default=func.now(), onupdate=func.now()
@@ -28,3 +34,7 @@ class SearchTask(Base):
 
     raw_results = relationship("SearchResultRaw", back_populates="task", cascade="all, delete-orphan")
     deduped_results = relationship("SearchResultDeduped", back_populates="task", cascade="all, delete-orphan")
+
+
+# Keyset pagination for GET /search-tasks (newest first within a user).
+Index("ix_search_tasks_user_id_created_at_id", SearchTask.user_id, SearchTask.created_at.desc(), SearchTask.id.desc())
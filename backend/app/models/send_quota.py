@@ -0,0 +1,17 @@
+from datetime import date, datetime
+
+from sqlalchemy import Date, DateTime, Integer, Text, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.database import Base
+
+
+class SendQuotaLedger(Base):
+    __tablename__ = "send_quota_ledger"
+
+    day: Mapped[date] = mapped_column(Date, primary_key=True)
+    sender: Mapped[str] = mapped_column(Text, primary_key=True)
+    used: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, server_default=func.now(), onupdate=func.now()
+    )
@@ -1,8 +1,11 @@
 import uuid
 from datetime import datetime
+from typing import Literal
 
 from pydantic import BaseModel, Field
 
+EmailEventType = Literal["delivered", "bounced", "opened", "replied", "unsubscribed", "unknown"]
+
 
 class SendCampaignRequest(BaseModel):
     draft_id: uuid.UUID
@@ -12,12 +15,38 @@ class SendCampaignRequest(BaseModel):
 
 class SendCampaignResponse(BaseModel):
     campaign_id: uuid.UUID
+    status: str
+    queued_count: int
     accepted_count: int
 
 
+class CampaignProgressResponse(BaseModel):
+    campaign_id: uuid.UUID
+    status: str
+    queued_count: int
+    sent_count: int
+    failed_count: int
+    rate_per_minute: float
+    eta_seconds: float | None
+    started_at: datetime | None
+    finished_at: datetime | None
+
+
+class CampaignStatsResponse(BaseModel):
+    campaign_id: uuid.UUID
+    sent_count: int = 0
+    failed_count: int = 0
+    delivered_count: int = 0
+    opened_count: int = 0
+    bounced_count: int = 0
+    replied_count: int = 0
+    unsubscribed_count: int = 0
+    updated_at: datetime | None = None
+
+
 class CampaignEventResponse(BaseModel):
     event_id: uuid.UUID
     message_id: uuid.UUID
-    event_type: str
+    event_type: EmailEventType
     occurred_at: datetime
     raw_payload: dict
@@ -11,9 +11,30 @@ class GenerateEmailDraftRequest(BaseModel):
     influencer_ids: list[uuid.UUID] = Field(default_factory=list)
 
 
+class GenerateEmailDraftBatchRequest(GenerateEmailDraftRequest):
+    influencer_ids: list[uuid.UUID] = Field(min_length=1, max_length=1000)
+
+
+class EmailDraftBatchItem(BaseModel):
+    influencer_id: uuid.UUID
+    draft_id: uuid.UUID | None = None
+    subject: str | None = None
+    body: str | None = None
+    variables: dict | None = None
+    error: str | None = None
+
+
 class EmailDraftResponse(BaseModel):
     id: uuid.UUID
     subject: str
     body: str
     variables: dict
     created_at: datetime
+
+
+class DraftCacheStatsResponse(BaseModel):
+    hits: int
+    misses: int
+    coalesced: int
+    hit_ratio: float
+    size: int
@@ -1,8 +1,12 @@
 import uuid
 from datetime import datetime
+from typing import Literal
 
 from pydantic import BaseModel, Field
 
+DedupStatus = Literal["unique", "duplicate_platform", "duplicate_url", "duplicate_email", "weak_match"]
+SearchResultSort = Literal["created_at", "followers_desc", "followers_asc"]
+
 
 class SearchTaskCreate(BaseModel):
     query: str = Field(min_length=1)
@@ -39,9 +43,18 @@ class SearchResultResponse(BaseModel):
     raw_result_id: uuid.UUID
     dedup_status: str
     matched_influencer_id: uuid.UUID | None
+    match_score: float | None = None
     platform: str
     platform_user_id: str
     display_name: str
     profile_url: str
     follower_count: int | None
     email: str | None
+
+
+class SearchResultFilters(BaseModel):
+    dedup_status: list[DedupStatus] = Field(default_factory=list)
+    follower_min: int | None = Field(default=None, ge=0)
+    follower_max: int | None = Field(default=None, ge=0)
+    has_email: bool | None = None
+    sort: SearchResultSort = "created_at"
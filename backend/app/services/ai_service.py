@@ -1,50 +1,232 @@
+import asyncio
+import contextlib
 import json
+import re
+import time
+from collections.abc import AsyncIterator
+from functools import lru_cache
+from typing import NamedTuple
 
 from openai import AsyncOpenAI
 
 from app.config import get_settings
+from app.metrics import registry
+from app.services.draft_cache import DraftCache, prompt_cache_key
+from app.services.json_field_stream import JsonFieldStream
+from app.services.rate_limiter import TokenBucket
+
+openai_requests = registry.counter(
+    "openai_requests_total", "OpenAI chat completions by mode and outcome.", ("mode", "outcome")
+)
+openai_request_duration = registry.histogram(
+    "openai_request_duration_seconds",
+    "OpenAI chat completion latency (streams are timed to their last chunk).",
+    ("mode",),
+    buckets=(0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 30.0, 60.0),
+)
+
+
+class BatchDraft(NamedTuple):
+    index: int
+    draft: dict | None
+    error: str | None = None
+
+
+class DraftDelta(NamedTuple):
+    field: str
+    text: str
+    draft: dict | None = None
 
 
 class AIService:
-    def __init__(self) -> None:
+    """Draft generation over one shared ``AsyncOpenAI`` client; use ``get_ai_service()``.
+
+    Completions are memoized in a content-addressed ``DraftCache`` keyed by
+    the model and the canonical prompt, so repeated goal/tone/language/context
+    combinations cost one upstream call.
+    """
+
+    def __init__(self, cache: DraftCache | None = None) -> None:
         self.settings = get_settings()
+        self.cache = cache or DraftCache(
+            self.settings.ai_draft_cache_max_entries, self.settings.ai_draft_cache_ttl_seconds
+        )
         self.client = None
         if self.settings.openai_api_key:
             try:
-                self.client = AsyncOpenAI(api_key=self.settings.openai_api_key)
+                self.client = AsyncOpenAI(
+                    api_key=self.settings.openai_api_key, base_url=self.settings.openai_base_url or None
+                )
             except Exception:
                 # Degrade gracefully in local/dev env with incompatible dependency combos.
                 self.client = None
 
-    async def generate_email_draft(self, goal: str, tone: str, language: str, context: dict) -> dict:
+    async def generate_email_draft(
+        self,
+        goal: str,
+        tone: str,
+        language: str,
+        context: dict,
+        semaphore: asyncio.Semaphore | None = None,
+        budget: TokenBucket | None = None,
+    ) -> dict:
         if self.client is None:
-            return {
-                "subject": f"{goal[:60]} - Collaboration Opportunity",
-                "body": "Hello {{name}},\n\nWe admire your content and want to explore collaboration.\n\nBest regards,\nTeam",
-                "variables": {"name": "influencer_name", "brand": "brand_name"},
-            }
-
-        prompt = {
-            "goal": goal,
-            "tone": tone,
-            "language": language,
-            "context": context,
-            "output_format": {"subject": "string", "body": "string", "variables": "object"},
-        }
-        completion = await self.client.chat.completions.create(
-            model=self.settings.openai_model,
-            response_format={"type": "json_object"},
-            messages=[
-                {"role": "system", "content": "你是一个 B2B outreach 邮件专家。"},
-                {"role": "user", "content": json.dumps(prompt, ensure_ascii=False)},
-            ],
-            temperature=0.7,
+            return _mock_draft(goal)
+
+        prompt = _draft_prompt(goal, tone, language, context)
+        return await self.cache.get_or_create(
+            prompt_cache_key(self.settings.openai_model, prompt), lambda: self._complete(prompt, semaphore, budget)
         )
 
+    async def stream_email_draft(self, goal: str, tone: str, language: str, context: dict) -> AsyncIterator[DraftDelta]:
+        """Stream a draft as it is generated.
+
+        Yields ``DraftDelta`` pieces of the subject and body as they arrive
+        from a streamed chat completion, then one final delta with
+        ``field="done"`` carrying the parsed draft. Cached drafts and the
+        offline mock are replayed in small chunks through the same protocol.
+        """
+        if self.client is None:
+            async for delta in _replay(_mock_draft(goal)):
+                yield delta
+            return
+
+        prompt = _draft_prompt(goal, tone, language, context)
+        key = prompt_cache_key(self.settings.openai_model, prompt)
+        cached = self.cache.get(key)
+        if cached is not None:
+            async for delta in _replay(cached):
+                yield delta
+            return
+
+        fields = JsonFieldStream(("subject", "body"))
+        content: list[str] = []
+        started = time.perf_counter()
+        outcome = "error"
+        try:
+            stream = await self.client.chat.completions.create(
+                model=self.settings.openai_model,
+                response_format={"type": "json_object"},
+                messages=_draft_messages(prompt),
+                temperature=0.7,
+                stream=True,
+            )
+            async for chunk in stream:
+                text = chunk.choices[0].delta.content if chunk.choices else None
+                if not text:
+                    continue
+                content.append(text)
+                for field, piece in fields.feed(text):
+                    yield DraftDelta(field, piece)
+            outcome = "ok"
+        finally:
+            openai_requests.inc(mode="stream", outcome=outcome)
+            openai_request_duration.observe(time.perf_counter() - started, mode="stream")
+
+        draft = _draft_from_json(json.loads("".join(content) or "{}"))
+        self.cache.put(key, draft)
+        yield DraftDelta("done", "", draft)
+
+    async def generate_email_drafts(
+        self, goal: str, tone: str, language: str, contexts: list[dict]
+    ) -> AsyncIterator[BatchDraft]:
+        """Generate one draft per context, yielding each as soon as it completes.
+
+        At most ``ai_batch_concurrency`` completions are in flight and their
+        estimated prompt + output tokens are metered against
+        ``ai_tokens_per_minute``. Cache hits skip both. A failed completion
+        is yielded with its error instead of aborting the batch; pending
+        completions are cancelled if the consumer stops early.
+        """
+        semaphore = asyncio.Semaphore(self.settings.ai_batch_concurrency)
+        budget = TokenBucket(self.settings.ai_tokens_per_minute, capacity=self.settings.ai_tokens_per_minute)
+
+        async def run(index: int, context: dict) -> BatchDraft:
+            try:
+                draft = await self.generate_email_draft(goal, tone, language, context, semaphore=semaphore, budget=budget)
+            except Exception as exc:
+                return BatchDraft(index, None, str(exc) or type(exc).__name__)
+            return BatchDraft(index, draft)
+
+        tasks = [asyncio.create_task(run(index, context)) for index, context in enumerate(contexts)]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def _complete(
+        self, prompt: dict, semaphore: asyncio.Semaphore | None = None, budget: TokenBucket | None = None
+    ) -> dict:
+        messages = _draft_messages(prompt)
+        async with semaphore or contextlib.nullcontext():
+            if budget is not None:
+                await budget.acquire(estimate_tokens(messages) + self.settings.ai_draft_output_tokens)
+            started = time.perf_counter()
+            outcome = "error"
+            try:
+                completion = await self.client.chat.completions.create(
+                    model=self.settings.openai_model,
+                    response_format={"type": "json_object"},
+                    messages=messages,
+                    temperature=0.7,
+                )
+                outcome = "ok"
+            finally:
+                openai_requests.inc(mode="complete", outcome=outcome)
+                openai_request_duration.observe(time.perf_counter() - started, mode="complete")
+
         content = completion.choices[0].message.content or "{}"
-        data = json.loads(content)
-        return {
-            "subject": data.get("subject", "Collaboration Opportunity"),
-            "body": data.get("body", ""),
-            "variables": data.get("variables", {}),
-        }
+        return _draft_from_json(json.loads(content))
+
+
+def _draft_prompt(goal: str, tone: str, language: str, context: dict) -> dict:
+    return {
+        "goal": goal,
+        "tone": tone,
+        "language": language,
+        "context": context,
+        "output_format": {"subject": "string", "body": "string", "variables": "object"},
+    }
+
+
+def _draft_messages(prompt: dict) -> list[dict]:
+    return [
+        {"role": "system", "content": "你是一个 B2B outreach 邮件专家。"},
+        {"role": "user", "content": json.dumps(prompt, ensure_ascii=False)},
+    ]
+
+
+def _draft_from_json(data: dict) -> dict:
+    return {
+        "subject": data.get("subject", "Collaboration Opportunity"),
+        "body": data.get("body", ""),
+        "variables": data.get("variables", {}),
+    }
+
+
+def _mock_draft(goal: str) -> dict:
+    return {
+        "subject": f"{goal[:60]} - Collaboration Opportunity",
+        "body": "Hello {{name}},\n\nWe admire your content and want to explore collaboration.\n\nBest regards,\nTeam",
+        "variables": {"name": "influencer_name", "brand": "brand_name"},
+    }
+
+
+async def _replay(draft: dict) -> AsyncIterator[DraftDelta]:
+    for field in ("subject", "body"):
+        for piece in re.findall(r"\S+\s*|\s+", draft[field]):
+            yield DraftDelta(field, piece)
+            await asyncio.sleep(0)
+    yield DraftDelta("done", "", draft)
+
+
+def estimate_tokens(messages: list[dict]) -> int:
+    """Rough prompt size for budgeting: ~4 characters per token plus per-message overhead."""
+    return sum(len(message["content"]) // 4 + 4 for message in messages)
+
+
+@lru_cache
+def get_ai_service() -> AIService:
+    return AIService()
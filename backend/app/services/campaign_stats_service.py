@@ -0,0 +1,46 @@
+import uuid
+from collections import Counter
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import dialect_insert
+from app.models.campaign_stats import CampaignStats
+
+# Webhook event types that have a counter; "unknown" events are stored but not rolled up.
+EVENT_COUNTERS = {
+    "delivered": "delivered_count",
+    "opened": "opened_count",
+    "bounced": "bounced_count",
+    "replied": "replied_count",
+    "unsubscribed": "unsubscribed_count",
+}
+
+
+async def increment_campaign_stats(db: AsyncSession, deltas: dict[uuid.UUID, Counter]) -> None:
+    """Add per-campaign counter deltas to ``campaign_stats`` in the caller's transaction.
+
+    One upsert per call: missing rows are created and existing counters are
+    incremented in SQL, so concurrent writers (sender and webhook batches)
+    never overwrite each other's counts.
+    """
+    columns = sorted({column for counter in deltas.values() for column, delta in counter.items() if delta})
+    if not columns:
+        return
+    values = [
+        {"campaign_id": campaign_id, **{column: counter.get(column, 0) for column in columns}}
+        for campaign_id, counter in sorted(deltas.items(), key=lambda item: str(item[0]))
+    ]
+    stmt = dialect_insert(db)(CampaignStats).values(values)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[CampaignStats.campaign_id],
+        set_={
+            **{column: getattr(CampaignStats, column) + getattr(stmt.excluded, column) for column in columns},
+            "updated_at": func.now(),
+        },
+    )
+    await db.execute(stmt)
+
+
+async def get_campaign_stats(db: AsyncSession, campaign_id: uuid.UUID) -> CampaignStats | None:
+    return (await db.execute(select(CampaignStats).where(CampaignStats.campaign_id == campaign_id))).scalar_one_or_none()
@@ -1,12 +1,8 @@
-from urllib.parse import urlparse
+import math
+from collections.abc import Iterable
+from typing import NamedTuple
 
-
-def normalize_profile_url(url: str) -> str:
-    parsed = urlparse(url.strip())
-    path = parsed.path.rstrip("/")
-    netloc = parsed.netloc.lower()
-    scheme = parsed.scheme.lower() or "https"
-    return f"{scheme}://{netloc}{path}"
+from app.urls import normalize_profile_url
 
 
 def follower_bucket(follower_count: int | None) -> str:
@@ -21,33 +17,206 @@ def follower_bucket(follower_count: int | None) -> str:
     return "1m+"
 
 
-def compute_dedup_status(raw: dict, existing: list[dict]) -> tuple[str, str | None]:
-    platform_user_id = raw.get("platform_user_id")
-    platform = raw.get("platform")
-    normalized_url = normalize_profile_url(raw.get("profile_url", ""))
-    email = (raw.get("email") or "").strip().lower()
+def normalize_email(email: str | None) -> str:
+    return (email or "").strip().lower()
+
+
+def normalize_display_name(display_name: str | None) -> str:
+    return (display_name or "").strip().lower()
+
+
+def compact_name(display_name: str | None) -> str:
+    """Lower-cased display name with everything but letters and digits removed."""
+    return "".join(char for char in (display_name or "").lower() if char.isalnum())
+
+
+def name_trigrams(display_name: str | None) -> frozenset[str]:
+    """Trigrams of the compact name, padded the way pg_trgm pads a word.
+
+    pg_trgm prefixes each word with two blanks and suffixes one, so using the
+    same padding makes ``trigram_similarity`` equal Postgres ``similarity()``
+    on ``compact_display_name`` and the ``%`` prefetch can use the same threshold.
+    """
+    name = compact_name(display_name)
+    if not name:
+        return frozenset()
+    padded = f"  {name} "
+    return frozenset(padded[i : i + 3] for i in range(len(padded) - 2))
+
+
+def trigram_similarity(a: str | None, b: str | None) -> float:
+    """Jaccard similarity of the two names' character trigram sets (pg_trgm ``similarity``)."""
+    left, right = name_trigrams(a), name_trigrams(b)
+    if not left or not right:
+        return 0.0
+    shared = len(left & right)
+    return shared / (len(left) + len(right) - shared)
+
+
+class TrigramIndex:
+    """Inverted trigram index over display names for thresholded fuzzy lookup.
+
+    Postings are kept per trigram-set size. Two names with ``|q|`` and
+    ``|x|`` trigrams and Jaccard similarity >= t share at least
+    ``ceil(t * (|q| + |x|) / (1 + t))`` trigrams, so for each size ``|x|``
+    the length filter allows, probing the query's ``|q| - shared + 1``
+    rarest trigrams is guaranteed to hit every match. Candidates are then
+    scored exactly, so results are the same as a full scan without
+    touching entries that share only common trigrams.
+    """
+
+    def __init__(self) -> None:
+        self._entries: list[tuple[frozenset[str], dict]] = []
+        self._postings: dict[int, dict[str, list[int]]] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def add(self, display_name: str | None, item: dict) -> None:
+        grams = name_trigrams(display_name)
+        if not grams:
+            return
+        position = len(self._entries)
+        self._entries.append((grams, item))
+        postings = self._postings.setdefault(len(grams), {})
+        for gram in grams:
+            postings.setdefault(gram, []).append(position)
+
+    def search(self, display_name: str | None, threshold: float, limit: int | None = None) -> list[tuple[float, dict]]:
+        """Entries with similarity >= ``threshold``, best first (ties keep insertion order)."""
+        grams = name_trigrams(display_name)
+        if not grams:
+            return []
+        query_size = len(grams)
+        ranked = []
+        # The epsilon keeps float error from moving a bound past a real match
+        # (e.g. 33 / 0.55 evaluates just under 60).
+        smallest = math.ceil(threshold * query_size - 1e-9)
+        largest = math.floor(query_size / threshold + 1e-9)
+        for size in range(smallest, largest + 1):
+            postings = self._postings.get(size)
+            if postings is None:
+                continue
+            shared_needed = math.ceil(threshold * (query_size + size) / (1 + threshold) - 1e-9)
+            probes = sorted(grams, key=lambda gram: len(postings.get(gram, ())))[: query_size - shared_needed + 1]
+            candidates: set[int] = set()
+            for gram in probes:
+                candidates.update(postings.get(gram, ()))
+            for position in candidates:
+                other, item = self._entries[position]
+                shared = len(grams & other)
+                score = shared / (query_size + size - shared)
+                if score >= threshold:
+                    ranked.append((score, position, item))
+        ranked.sort(key=lambda entry: (-entry[0], entry[1]))
+        return [(score, item) for score, _, item in ranked[:limit]]
 
-    for item in existing:
-        if item.get("platform") == platform and item.get("platform_user_id") == platform_user_id:
-            return "duplicate_platform", item.get("id")
 
-    for item in existing:
-        if normalize_profile_url(item.get("profile_url", "")) == normalized_url and normalized_url:
-            return "duplicate_url", item.get("id")
+class DedupMatch(NamedTuple):
+    status: str
+    influencer_id: str | None
+    score: float | None
 
-    if email:
+
+class DedupIndex:
+    """Hash index over existing influencers, built once per pipeline run.
+
+    Lookups follow the same priority as the original linear scans
+    (platform id, normalized URL, email, then weak match) and return the
+    first matching row in insertion order for each rule. With
+    ``fuzzy_threshold`` set, a weak match also accepts the most similar
+    display name (trigram Jaccard >= threshold) in the same platform and
+    follower bucket, not just an exact one.
+    """
+
+    def __init__(self, existing: Iterable[dict] = (), fuzzy_threshold: float | None = None) -> None:
+        self._by_platform_id: dict[tuple[str | None, str | None], dict] = {}
+        self._by_url: dict[str, dict] = {}
+        self._by_email: dict[str, dict] = {}
+        self._by_weak_key: dict[tuple[str | None, str, str], dict] = {}
+        self.fuzzy_threshold = fuzzy_threshold
+        self._names: dict[tuple[str | None, str], TrigramIndex] = {}
+        self._size = 0
         for item in existing:
-            if ((item.get("email") or "").strip().lower()) == email:
-                return "duplicate_email", item.get("id")
-
-    weak = [
-        item
-        for item in existing
-        if item.get("platform") == platform
-        and item.get("display_name", "").strip().lower() == (raw.get("display_name", "").strip().lower())
-        and follower_bucket(item.get("follower_count")) == follower_bucket(raw.get("follower_count"))
-    ]
-    if weak:
-        return "weak_match", weak[0].get("id")
-
-    return "unique", None
+            self.add(item)
+
+    def __len__(self) -> int:
+        return self._size
+
+    def add(self, item: dict) -> None:
+        self._size += 1
+        self._by_platform_id.setdefault((item.get("platform"), item.get("platform_user_id")), item)
+        self._by_url.setdefault(normalize_profile_url(item.get("profile_url") or ""), item)
+        email = normalize_email(item.get("email"))
+        if email:
+            self._by_email.setdefault(email, item)
+        weak_key = (
+            item.get("platform"),
+            normalize_display_name(item.get("display_name")),
+            follower_bucket(item.get("follower_count")),
+        )
+        self._by_weak_key.setdefault(weak_key, item)
+        if self.fuzzy_threshold is not None:
+            names = self._names.setdefault((weak_key[0], weak_key[2]), TrigramIndex())
+            names.add(item.get("display_name"), item)
+
+    def lookup(self, raw: dict) -> tuple[str, str | None]:
+        status, influencer_id, _ = self.match(raw)
+        return status, influencer_id
+
+    def match(self, raw: dict) -> DedupMatch:
+        """Like ``lookup``, plus a score: 1.0 for exact rules, name similarity for weak matches."""
+        platform = raw.get("platform")
+        match = self._by_platform_id.get((platform, raw.get("platform_user_id")))
+        if match is not None:
+            return DedupMatch("duplicate_platform", match.get("id"), 1.0)
+
+        normalized_url = normalize_profile_url(raw.get("profile_url") or "")
+        match = self._by_url.get(normalized_url) if normalized_url else None
+        if match is not None:
+            return DedupMatch("duplicate_url", match.get("id"), 1.0)
+
+        email = normalize_email(raw.get("email"))
+        match = self._by_email.get(email) if email else None
+        if match is not None:
+            return DedupMatch("duplicate_email", match.get("id"), 1.0)
+
+        bucket = follower_bucket(raw.get("follower_count"))
+        match = self._by_weak_key.get((platform, normalize_display_name(raw.get("display_name")), bucket))
+        if match is not None:
+            return DedupMatch("weak_match", match.get("id"), 1.0)
+
+        names = self._names.get((platform, bucket))
+        if names is not None:
+            for score, item in names.search(raw.get("display_name"), self.fuzzy_threshold, limit=1):
+                return DedupMatch("weak_match", item.get("id"), round(score, 4))
+
+        return DedupMatch("unique", None, None)
+
+
+def collect_candidate_keys(raws: Iterable[dict]) -> dict[str, set]:
+    """Collect the lookup keys a batch of raw results can match on.
+
+    ``profile_urls`` holds normalized URLs, to be matched against the stored
+    ``influencers.profile_url_normalized``; the exact comparison is still
+    done by :class:`DedupIndex` on the returned candidates.
+    """
+    keys: dict[str, set] = {"platform_ids": set(), "profile_urls": set(), "emails": set(), "display_names": set()}
+    for raw in raws:
+        if raw.get("platform_user_id"):
+            keys["platform_ids"].add((raw.get("platform"), raw.get("platform_user_id")))
+        profile_url = (raw.get("profile_url") or "").strip()
+        if profile_url:
+            keys["profile_urls"].add(normalize_profile_url(profile_url))
+        email = normalize_email(raw.get("email"))
+        if email:
+            keys["emails"].add(email)
+        display_name = normalize_display_name(raw.get("display_name"))
+        if display_name:
+            keys["display_names"].add((raw.get("platform"), display_name))
+    return keys
+
+
+def compute_dedup_status(raw: dict, existing: "list[dict] | DedupIndex") -> tuple[str, str | None]:
+    index = existing if isinstance(existing, DedupIndex) else DedupIndex(existing)
+    return index.lookup(raw)
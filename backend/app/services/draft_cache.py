@@ -0,0 +1,112 @@
+import asyncio
+import copy
+import hashlib
+import json
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from app.services.ttl_cache import TTLCache
+
+
+def prompt_cache_key(model: str, prompt: dict) -> str:
+    """Content address of a prompt: sha256 over its canonical JSON form.
+
+    Keys are sorted and whitespace is fixed so dicts that differ only in
+    insertion order map to the same entry.
+    """
+    canonical = json.dumps({"model": model, "prompt": prompt}, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class DraftCache:
+    """TTL/LRU memo for generated drafts with single-flight loading.
+
+    Concurrent misses for the same key share one in-flight upstream call;
+    failures are propagated to every waiter and never cached. The call is
+    only cancelled once every waiter has been cancelled. Callers get their
+    own copy of the cached dict.
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: float) -> None:
+        self.entries = TTLCache(max_entries)
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self._in_flight: dict[str, _Flight] = {}
+
+    @property
+    def hit_ratio(self) -> float:
+        lookups = self.hits + self.coalesced + self.misses
+        return (self.hits + self.coalesced) / lookups if lookups else 0.0
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "hit_ratio": round(self.hit_ratio, 4),
+            "size": len(self.entries),
+        }
+
+    def get(self, key: str) -> dict | None:
+        """Plain lookup for callers that produce the value themselves (e.g. streamed completions)."""
+        cached = self.entries.get(key)
+        if cached is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return copy.deepcopy(cached)
+
+    def put(self, key: str, value: dict) -> None:
+        self.entries.set(key, copy.deepcopy(value), self.ttl_seconds)
+
+    async def get_or_create(self, key: str, factory: Callable[[], Awaitable[dict]]) -> dict:
+        cached = self.entries.get(key)
+        if cached is not None:
+            self.hits += 1
+            return copy.deepcopy(cached)
+
+        flight = self._in_flight.get(key)
+        if flight is None:
+            self.misses += 1
+            # The upstream call runs in a task the cache owns, so cancelling the
+            # caller that started it does not cancel it for everyone else.
+            flight = _Flight(asyncio.get_running_loop().create_task(self._load(key, factory)))
+            self._in_flight[key] = flight
+        else:
+            self.coalesced += 1
+
+        flight.waiters += 1
+        try:
+            value = await asyncio.shield(flight.task)
+        except asyncio.CancelledError:
+            flight.waiters -= 1
+            if flight.waiters == 0 and not flight.task.done():
+                # Last interested caller left: drop the upstream call.
+                flight.task.cancel()
+                if self._in_flight.get(key) is flight:
+                    del self._in_flight[key]
+            raise
+        flight.waiters -= 1
+        return copy.deepcopy(value)
+
+    async def _load(self, key: str, factory: Callable[[], Awaitable[dict]]) -> dict:
+        try:
+            value = await factory()
+            self.entries.set(key, value, self.ttl_seconds)
+            return value
+        finally:
+            flight = self._in_flight.get(key)
+            if flight is not None and flight.task is asyncio.current_task():
+                del self._in_flight[key]
+
+
+class _Flight:
+    """One in-flight upstream call and how many callers are awaiting it."""
+
+    __slots__ = ("task", "waiters")
+
+    def __init__(self, task: asyncio.Task) -> None:
+        self.task = task
+        self.waiters = 0
@@ -2,17 +2,39 @@ import asyncio
 import hashlib
 import hmac
 import json
+import time
+import uuid
+from collections import Counter, defaultdict
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
 from datetime import datetime, timezone
 
-from sqlalchemy import Select, func, select
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.config import get_settings
+from app.database import dialect_insert, match_any
+from app.metrics import registry
 from app.models.audit_log import AuditLog
 from app.models.email_campaign import EmailCampaign
 from app.models.email_event import EmailEvent
 from app.models.email_message import EmailMessage
 from app.models.influencer import Influencer
+from app.services.campaign_stats_service import EVENT_COUNTERS, increment_campaign_stats
+from app.services.rate_limiter import TokenBucket
+from app.services.send_quota import QuotaReservation, SendQuota
+from app.services.template_service import get_render_plan
+
+resend_sends = registry.counter("resend_sends_total", "Emails handed to Resend by final outcome.", ("outcome",))
+resend_retries = registry.counter("resend_retries_total", "Resend send attempts that were retries.")
+resend_attempt_duration = registry.histogram(
+    "resend_send_attempt_duration_seconds", "Latency of individual Resend send attempts.", ("outcome",)
+)
+campaign_messages = registry.counter(
+    "campaign_messages_total", "Campaign messages finished by the sender, by outcome.", ("outcome",)
+)
+# Values the email_event_type enum accepts; anything else is stored as "unknown".
+WEBHOOK_EVENT_TYPES = frozenset(EmailEvent.__table__.c.event_type.type.enums)
 
 try:
     import resend
@@ -20,11 +42,28 @@ except ImportError:  # pragma: no cover - exercised in local envs without resend
     resend = None
 
 
+@dataclass
+class CampaignSendReport:
+    accepted: int = 0
+    failed: int = 0
+    skipped: int = 0
+    elapsed_seconds: float = 0.0
+
+    @property
+    def throughput_per_minute(self) -> float:
+        """Achieved send attempts per minute over the whole run."""
+        if self.elapsed_seconds <= 0:
+            return 0.0
+        return (self.accepted + self.failed) * 60 / self.elapsed_seconds
+
+
 class EmailService:
-    def __init__(self) -> None:
+    def __init__(self, quota: SendQuota | None = None) -> None:
         self.settings = get_settings()
+        self.quota = quota or SendQuota()
         if self.settings.resend_api_key and resend is not None:
             resend.api_key = self.settings.resend_api_key
+            resend.api_url = self.settings.resend_api_url.rstrip("/")
 
     async def send_campaign_messages(
         self,
@@ -34,38 +73,66 @@ class EmailService:
         subject: str,
         body: str,
         user_id: str,
+        variables: dict | None = None,
     ) -> int:
-        accepted = 0
-        interval = 60 / max(1, campaign.send_rate_limit)
+        report = await self.run_campaign_send(db, campaign, influencers, subject, body, user_id, variables=variables)
+        return report.accepted
+
+    async def run_campaign_send(
+        self,
+        db: AsyncSession,
+        campaign: EmailCampaign,
+        influencers: list[Influencer],
+        subject: str,
+        body: str,
+        user_id: str,
+        on_progress: Callable[[CampaignSendReport], Awaitable[None]] | None = None,
+        variables: dict | None = None,
+    ) -> CampaignSendReport:
+        """Send a campaign with up to ``send_concurrency`` sends in flight.
+
+        Sends are metered by a token bucket at ``campaign.send_rate_limit`` per
+        minute. Only the send tasks touch the network; messages, audit rows and
+        counters are all written from this coroutine, so the session is never
+        used concurrently. A recipient in retry backoff keeps its slot but the
+        remaining slots keep sending.
+
+        The daily limit is drawn from the shared ``send_quota_ledger`` in
+        ``send_quota_chunk_size`` reservations; whatever is left unused when
+        the send ends is handed back.
 
-        today_count_q: Select = select(func.count(EmailMessage.id)).where(
-            EmailMessage.sent_at >= datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+        Subject and body are compiled once per draft into a render plan and
+        personalized per recipient; ``variables`` maps draft placeholders to
+        recipient fields.
+
+        The campaign's sent/failed counters and its ``campaign_stats`` row are
+        updated as results arrive and ``on_progress`` is awaited every ``campaign_progress_every`` results so
+        the caller can persist them.
+        """
+        started = time.monotonic()
+        bucket = TokenBucket(campaign.send_rate_limit)
+        concurrency = self.settings.send_concurrency
+        report = CampaignSendReport()
+        plan = get_render_plan(campaign.draft_id, subject, body, variables)
+        progress_every = self.settings.campaign_progress_every
+
+        quota = QuotaReservation(
+            self.quota,
+            sender=self.settings.resend_from_email,
+            limit=self.settings.daily_send_limit,
+            chunk_size=self.settings.send_quota_chunk_size,
+            expected=len(influencers),
         )
-        today_sent = int((await db.execute(today_count_q)).scalar_one())
 
-        for influencer in influencers:
-            if influencer.unsubscribed_at is not None or not influencer.email:
-                continue
-            if today_sent >= self.settings.daily_send_limit:
-                break
-
-            payload_body = self._append_unsubscribe(body, influencer.id)
-            message = EmailMessage(
-                campaign_id=campaign.id,
-                influencer_id=influencer.id,
-                to_email=influencer.email,
-                subject=subject,
-                body=payload_body,
-                status="pending",
-            )
-            db.add(message)
-            await db.flush()
+        recipients = iter(influencers)
+        in_flight: dict[asyncio.Task, tuple[EmailMessage, Influencer]] = {}
+        waiting: Influencer | None = None
+        exhausted = False
 
-            ok, provider_id = await self._send_with_retry(influencer.email, subject, payload_body)
+        def record_result(message: EmailMessage, influencer: Influencer, ok: bool, provider_id: str | None) -> None:
             message.status = "sent" if ok else "failed"
             message.provider_message_id = provider_id
             message.sent_at = datetime.now(timezone.utc) if ok else None
-
             db.add(
                 AuditLog(
                     user_id=user_id,
@@ -75,20 +142,118 @@ class EmailService:
                     detail={"status": message.status, "to": influencer.email},
                 )
             )
-            accepted += 1 if ok else 0
-            today_sent += 1 if ok else 0
-            await asyncio.sleep(interval)
+            if ok:
+                report.accepted += 1
+                campaign.sent_count = (campaign.sent_count or 0) + 1
+            else:
+                report.failed += 1
+                campaign.failed_count = (campaign.failed_count or 0) + 1
+                quota.give_back()
+            campaign.accepted_count = report.accepted
+
+        try:
+            while True:
+                # In-flight sends hold quota; a failure hands its share back to the next recipient.
+                while not exhausted and len(in_flight) < concurrency:
+                    influencer = waiting or next(recipients, None)
+                    waiting = None
+                    if influencer is None:
+                        exhausted = True
+                        break
+                    if influencer.unsubscribed_at is not None or not influencer.email:
+                        report.skipped += 1
+                        continue
+                    if not await quota.take():
+                        # Out of quota unless an in-flight send fails and returns its share.
+                        waiting = influencer
+                        exhausted = not in_flight
+                        break
+
+                    rendered = plan.render(influencer)
+                    message = EmailMessage(
+                        id=uuid.uuid4(),
+                        campaign_id=campaign.id,
+                        influencer_id=influencer.id,
+                        to_email=influencer.email,
+                        subject=rendered.subject,
+                        body=rendered.text,
+                        status="pending",
+                    )
+                    db.add(message)
+                    task = asyncio.create_task(
+                        self._send_metered(bucket, influencer.email, rendered.subject, rendered.text, rendered.html)
+                    )
+                    in_flight[task] = (message, influencer)
+
+                if not in_flight:
+                    break
 
-        campaign.accepted_count = accepted
+                done, _ = await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+                outcomes: Counter = Counter()
+                for task in done:
+                    message, influencer = in_flight.pop(task)
+                    ok, provider_id = task.result()
+                    record_result(message, influencer, ok, provider_id)
+                    outcomes["sent_count" if ok else "failed_count"] += 1
+                await increment_campaign_stats(db, {campaign.id: outcomes})
+                campaign_messages.inc(outcomes["sent_count"], outcome="sent")
+                campaign_messages.inc(outcomes["failed_count"], outcome="failed")
+
+                completed = report.accepted + report.failed
+                if on_progress is not None and completed // progress_every > (completed - len(done)) // progress_every:
+                    report.elapsed_seconds = time.monotonic() - started
+                    await on_progress(report)
+        finally:
+            try:
+                if in_flight:
+                    # Leaving early on an error: stop sends that have not gone out yet and wait for the
+                    # rest, so nothing is sent after the caller gives up on this run. Sends that did
+                    # finish are recorded on their messages and in campaign_stats; cancelled ones
+                    # stay ``pending``.
+                    for task in in_flight:
+                        task.cancel()
+                    await asyncio.gather(*in_flight, return_exceptions=True)
+                    outcomes = Counter()
+                    for task, (message, influencer) in in_flight.items():
+                        if not task.cancelled() and task.exception() is None:
+                            ok, provider_id = task.result()
+                            record_result(message, influencer, ok, provider_id)
+                            outcomes["sent_count" if ok else "failed_count"] += 1
+                    await increment_campaign_stats(db, {campaign.id: outcomes})
+                    campaign_messages.inc(outcomes["sent_count"], outcome="sent")
+                    campaign_messages.inc(outcomes["failed_count"], outcome="failed")
+            finally:
+                await quota.close()
+
+        report.elapsed_seconds = time.monotonic() - started
+        campaign.accepted_count = report.accepted
         campaign.status = "done"
-        return accepted
+        return report
 
-    async def _send_with_retry(self, to_email: str, subject: str, body: str) -> tuple[bool, str | None]:
+    async def _send_metered(
+        self, bucket: TokenBucket, to_email: str, subject: str, body: str, html: str
+    ) -> tuple[bool, str | None]:
+        await bucket.acquire()
+        return await self._send_with_retry(to_email, subject, body, retry_limiter=bucket, html=html)
+
+    async def _send_with_retry(
+        self,
+        to_email: str,
+        subject: str,
+        body: str,
+        retry_limiter: TokenBucket | None = None,
+        html: str | None = None,
+    ) -> tuple[bool, str | None]:
         if not self.settings.resend_api_key or resend is None:
             return True, "mock-message-id"
 
         backoff = 1
-        for _ in range(3):
+        for attempt in range(3):
+            if attempt:
+                resend_retries.inc()
+                if retry_limiter is not None:
+                    await retry_limiter.acquire()
+            started = time.perf_counter()
             try:
                 resp = await asyncio.to_thread(
                     resend.Emails.send,
@@ -96,14 +261,19 @@ class EmailService:
                         "from": self.settings.resend_from_email,
                         "to": [to_email],
                         "subject": subject,
-                        "html": body.replace("\n", "<br/>")
+                        "html": html if html is not None else body.replace("\n", "<br/>"),
                     },
                 )
-                return True, str(resp.get("id"))
             except Exception:
+                resend_attempt_duration.observe(time.perf_counter() - started, outcome="error")
                 await asyncio.sleep(backoff)
                 backoff *= 2
+            else:
+                resend_attempt_duration.observe(time.perf_counter() - started, outcome="ok")
+                resend_sends.inc(outcome="sent")
+                return True, str(resp.get("id"))
 
+        resend_sends.inc(outcome="failed")
         return False, None
 
     def verify_webhook_signature(self, payload: bytes, signature: str | None, secret: str | None) -> bool:
@@ -115,30 +285,80 @@ class EmailService:
         return hmac.compare_digest(digest, signature)
 
     async def process_webhook_event(self, db: AsyncSession, payload: dict) -> bool:
-        provider_event_id = str(payload.get("id")) if payload.get("id") else None
-        if provider_event_id:
-            existing = await db.execute(select(EmailEvent).where(EmailEvent.provider_event_id == provider_event_id))
-            if existing.scalar_one_or_none() is not None:
-                return False
-
-        data = payload.get("data", {})
-        message_id = data.get("email_id") or data.get("message_id")
-        if not message_id:
-            return False
+        return (await self.process_webhook_events(db, [payload]))[0]
 
-        msg = await db.execute(select(EmailMessage).where(EmailMessage.provider_message_id == message_id))
-        message = msg.scalar_one_or_none()
-        if not message:
-            return False
+    async def process_webhook_events(self, db: AsyncSession, payloads: list[dict]) -> list[bool]:
+        """Store a batch of provider events; returns, per payload, whether a new event was saved.
 
-        event = EmailEvent(
-            message_id=message.id,
-            provider_event_id=provider_event_id,
-            event_type=payload.get("type", "unknown"),
-            raw_payload=payload,
-        )
-        db.add(event)
-        return True
+        Message ids for the whole batch are resolved with one indexed lookup
+        and events are inserted with ``ON CONFLICT (provider_event_id) DO
+        NOTHING``, so replays and duplicates inside the batch are dropped.
+        Newly stored events are added to ``campaign_stats`` in the same
+        transaction. Malformed payloads are skipped and event types outside
+        ``email_event_type`` are stored as ``unknown``, so one odd event does
+        not fail the whole insert.
+        """
+        saved = [False] * len(payloads)
+        pending: list[tuple[int, str | None, str, dict]] = []
+        seen_event_ids: set[str] = set()
+        for index, payload in enumerate(payloads):
+            if not isinstance(payload, dict) or not isinstance(payload.get("data", {}), dict):
+                continue
+            provider_event_id = str(payload.get("id")) if payload.get("id") else None
+            data = payload.get("data", {})
+            provider_message_id = data.get("email_id") or data.get("message_id")
+            if not provider_message_id or provider_event_id in seen_event_ids:
+                continue
+            if provider_event_id:
+                seen_event_ids.add(provider_event_id)
+            pending.append((index, provider_event_id, str(provider_message_id), payload))
+        if not pending:
+            return saved
+
+        provider_message_ids = sorted({provider_message_id for _, _, provider_message_id, _ in pending})
+        messages = {
+            row.provider_message_id: row
+            for row in await db.execute(
+                select(EmailMessage.provider_message_id, EmailMessage.id, EmailMessage.campaign_id).where(
+                    match_any(db, EmailMessage.provider_message_id, provider_message_ids)
+                )
+            )
+        }
 
-    def _append_unsubscribe(self, body: str, influencer_id) -> str:
-        return f"{body}\n\n---\nUnsubscribe: https://example.com/unsubscribe/{influencer_id}"
+        rows: dict[uuid.UUID, tuple[int, uuid.UUID, str]] = {}
+        values = []
+        for index, provider_event_id, provider_message_id, payload in pending:
+            message = messages.get(provider_message_id)
+            if message is None:
+                continue
+            event_id = uuid.uuid4()
+            event_type = payload.get("type")
+            if event_type not in WEBHOOK_EVENT_TYPES:
+                event_type = "unknown"
+            rows[event_id] = (index, message.campaign_id, event_type)
+            values.append(
+                {
+                    "id": event_id,
+                    "message_id": message.id,
+                    "provider_event_id": provider_event_id,
+                    "event_type": event_type,
+                    "raw_payload": payload,
+                }
+            )
+        if not values:
+            return saved
+
+        stmt = (
+            dialect_insert(db)(EmailEvent)
+            .values(values)
+            .on_conflict_do_nothing(index_elements=[EmailEvent.provider_event_id])
+            .returning(EmailEvent.id)
+        )
+        stats: dict[uuid.UUID, Counter] = defaultdict(Counter)
+        for event_id in (await db.execute(stmt)).scalars():
+            index, campaign_id, event_type = rows[event_id]
+            saved[index] = True
+            if event_type in EVENT_COUNTERS:
+                stats[campaign_id][EVENT_COUNTERS[event_type]] += 1
+        await increment_campaign_stats(db, stats)
+        return saved
@@ -0,0 +1,92 @@
+import json
+import uuid
+from datetime import datetime, timezone
+
+from sqlalchemy import Table, insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import get_settings
+from app.models.search_result import SearchResultDeduped, SearchResultRaw
+
+# asyncpg (and Postgres) accept at most this many bind parameters per statement.
+MAX_BIND_PARAMS = 32767
+
+RAW_RESULT_COLUMNS = (
+    "id",
+    "task_id",
+    "platform",
+    "platform_user_id",
+    "display_name",
+    "profile_url",
+    "follower_count",
+    "email",
+    "extra",
+    "fetched_at",
+)
+
+
+async def bulk_insert_raw_results(db: AsyncSession, task_id: uuid.UUID, rows: list[dict]) -> list[dict]:
+    """Insert raw search results in bulk and return them with their generated ids.
+
+    Ids and ``fetched_at`` are assigned client-side so the dedup stage can
+    work on the returned records without reading the rows back.
+    """
+    settings = get_settings()
+    fetched_at = datetime.now(timezone.utc)
+    records = [
+        {
+            "id": uuid.uuid4(),
+            "task_id": task_id,
+            "platform": row["platform"],
+            "platform_user_id": row["platform_user_id"],
+            "display_name": row.get("display_name", ""),
+            "profile_url": row.get("profile_url", ""),
+            "follower_count": row.get("follower_count"),
+            "email": row.get("email"),
+            "extra": row.get("extra") or {},
+            "fetched_at": fetched_at,
+        }
+        for row in rows
+    ]
+    if not records:
+        return records
+
+    if settings.raw_insert_use_copy and db.get_bind().dialect.driver == "asyncpg":
+        await _copy_records(db, SearchResultRaw.__table__, RAW_RESULT_COLUMNS, records)
+    else:
+        await bulk_insert(db, SearchResultRaw.__table__, records, settings.raw_insert_batch_size)
+    return records
+
+
+async def bulk_insert_deduped_results(db: AsyncSession, rows: list[dict]) -> None:
+    # The batch shares one created_at; ordinal keeps insertion order within it.
+    created_at = datetime.now(timezone.utc)
+    records = [
+        {"id": uuid.uuid4(), "created_at": created_at, "ordinal": index, **row} for index, row in enumerate(rows)
+    ]
+    await bulk_insert(db, SearchResultDeduped.__table__, records, get_settings().raw_insert_batch_size)
+
+
+def max_rows_per_statement(column_count: int, batch_size: int) -> int:
+    """Cap a multi-row INSERT batch so rows x columns stays within MAX_BIND_PARAMS."""
+    return max(1, min(batch_size, MAX_BIND_PARAMS // max(column_count, 1)))
+
+
+async def bulk_insert(db: AsyncSession, table: Table, records: list[dict], batch_size: int) -> None:
+    batch_size = max_rows_per_statement(len(table.columns), batch_size)
+    for start in range(0, len(records), batch_size):
+        await db.execute(insert(table), records[start : start + batch_size])
+
+
+async def _copy_records(db: AsyncSession, table: Table, columns: tuple[str, ...], records: list[dict]) -> None:
+    """COPY rows through the session's asyncpg connection, inside the current transaction."""
+    connection = await db.connection()
+    raw_connection = await connection.get_raw_connection()
+    await raw_connection.driver_connection.copy_records_to_table(
+        table.name,
+        columns=list(columns),
+        records=[
+            tuple(json.dumps(record[column]) if column == "extra" else record[column] for column in columns)
+            for record in records
+        ],
+    )
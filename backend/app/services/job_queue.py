@@ -0,0 +1,184 @@
+import os
+import socket
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import and_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.config import get_settings
+from app.database import AsyncSessionLocal
+from app.models.email_campaign import EmailCampaign
+from app.models.search_task import SearchTask
+
+
+def default_worker_id() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+
+class SearchJobQueue:
+    """Postgres-backed queue over ``search_tasks``.
+
+    Pending tasks are claimed with ``SELECT ... FOR UPDATE SKIP LOCKED`` so any
+    number of workers can poll concurrently. A claim holds a lease that the
+    worker renews while the pipeline runs; tasks whose lease expired are put
+    back to ``pending`` (or ``failed`` once attempts are used up).
+    """
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession] = AsyncSessionLocal,
+        worker_id: str | None = None,
+    ) -> None:
+        self.settings = get_settings()
+        self.session_factory = session_factory
+        self.worker_id = worker_id or default_worker_id()
+
+    async def claim(self, limit: int) -> list[uuid.UUID]:
+        now = datetime.now(timezone.utc)
+        async with self.session_factory() as session:
+            task_ids = (
+                await session.execute(
+                    select(SearchTask.id)
+                    .where(SearchTask.status == "pending", SearchTask.next_run_at <= now)
+                    .order_by(SearchTask.next_run_at.asc(), SearchTask.created_at.asc())
+                    .limit(limit)
+                    .with_for_update(skip_locked=True)
+                )
+            ).scalars().all()
+            if task_ids:
+                await session.execute(
+                    update(SearchTask)
+                    .where(SearchTask.id.in_(task_ids))
+                    .values(
+                        status="running",
+                        attempts=SearchTask.attempts + 1,
+                        locked_by=self.worker_id,
+                        lease_expires_at=now + timedelta(seconds=self.settings.search_job_lease_seconds),
+                    )
+                )
+            await session.commit()
+        return list(task_ids)
+
+    async def renew_lease(self, task_id: uuid.UUID) -> bool:
+        lease_expires_at = datetime.now(timezone.utc) + timedelta(seconds=self.settings.search_job_lease_seconds)
+        async with self.session_factory() as session:
+            result = await session.execute(
+                update(SearchTask)
+                .where(SearchTask.id == task_id, SearchTask.status == "running", SearchTask.locked_by == self.worker_id)
+                .values(lease_expires_at=lease_expires_at)
+            )
+            await session.commit()
+        return result.rowcount == 1
+
+    async def complete(self, session: AsyncSession, task_id: uuid.UUID, result_count: int) -> bool:
+        """Mark a claimed task done in ``session``'s transaction, only if this worker still holds it.
+
+        Returns False when the lease was lost to another worker; the caller
+        must then roll back instead of committing its results.
+        """
+        result = await session.execute(
+            update(SearchTask)
+            .where(SearchTask.id == task_id, SearchTask.locked_by == self.worker_id)
+            .values(status="done", result_count=result_count, lease_expires_at=None, locked_by=None)
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount == 1
+
+    async def fail(self, task_id: uuid.UUID, error: str) -> str:
+        """Release a failed claim; returns the new status (``pending`` for a retry, else ``failed``).
+
+        A task this worker no longer holds is left alone and its current status returned.
+        """
+        async with self.session_factory() as session:
+            task = (
+                await session.execute(select(SearchTask).where(SearchTask.id == task_id).with_for_update())
+            ).scalar_one_or_none()
+            if task is None:
+                return "failed"
+            if task.locked_by != self.worker_id:
+                return task.status
+            if task.attempts >= self.settings.search_job_max_attempts:
+                task.status = "failed"
+            else:
+                task.status = "pending"
+                task.next_run_at = datetime.now(timezone.utc) + self._retry_delay(task.attempts)
+            task.lease_expires_at = None
+            task.locked_by = None
+            task.last_error = error[:2000]
+            await session.commit()
+            return task.status
+
+    async def reclaim_expired(self) -> int:
+        """Return tasks whose worker stopped renewing its lease to the queue."""
+        now = datetime.now(timezone.utc)
+        expired = and_(SearchTask.status == "running", SearchTask.lease_expires_at < now)
+        released = {"lease_expires_at": None, "locked_by": None, "last_error": "lease expired"}
+        async with self.session_factory() as session:
+            retried = await session.execute(
+                update(SearchTask)
+                .where(expired, SearchTask.attempts < self.settings.search_job_max_attempts)
+                .values(status="pending", next_run_at=now, **released)
+            )
+            exhausted = await session.execute(update(SearchTask).where(expired).values(status="failed", **released))
+            await session.commit()
+        return retried.rowcount + exhausted.rowcount
+
+    def _retry_delay(self, attempts: int) -> timedelta:
+        return timedelta(seconds=self.settings.search_job_retry_backoff_seconds * 2 ** max(0, attempts - 1))
+
+
+class CampaignSendQueue:
+    """Leases on campaigns in ``sending``, so a send outlives the process that started it.
+
+    The process running a send holds the campaign's lease and renews it. A
+    campaign whose lease expired (its process crashed or restarted) is
+    claimed by another process with ``claim_stale`` and resumed.
+    """
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession] = AsyncSessionLocal,
+        worker_id: str | None = None,
+    ) -> None:
+        self.settings = get_settings()
+        self.session_factory = session_factory
+        self.worker_id = worker_id or default_worker_id()
+
+    def lease_expiry(self) -> datetime:
+        return datetime.now(timezone.utc) + timedelta(seconds=self.settings.campaign_lease_seconds)
+
+    async def claim_stale(self, limit: int) -> list[uuid.UUID]:
+        now = datetime.now(timezone.utc)
+        async with self.session_factory() as session:
+            campaign_ids = (
+                await session.execute(
+                    select(EmailCampaign.id)
+                    .where(EmailCampaign.status == "sending", EmailCampaign.lease_expires_at < now)
+                    .order_by(EmailCampaign.lease_expires_at.asc())
+                    .limit(limit)
+                    .with_for_update(skip_locked=True)
+                )
+            ).scalars().all()
+            if campaign_ids:
+                await session.execute(
+                    update(EmailCampaign)
+                    .where(EmailCampaign.id.in_(campaign_ids))
+                    .values(locked_by=self.worker_id, lease_expires_at=self.lease_expiry())
+                )
+            await session.commit()
+        return list(campaign_ids)
+
+    async def renew_lease(self, campaign_id: uuid.UUID) -> bool:
+        async with self.session_factory() as session:
+            result = await session.execute(
+                update(EmailCampaign)
+                .where(
+                    EmailCampaign.id == campaign_id,
+                    EmailCampaign.status == "sending",
+                    EmailCampaign.locked_by == self.worker_id,
+                )
+                .values(lease_expires_at=self.lease_expiry())
+            )
+            await session.commit()
+        return result.rowcount == 1
@@ -0,0 +1,92 @@
+class JsonFieldStream:
+    """Incrementally extract top-level string fields from a streamed JSON object.
+
+    ``feed`` takes the next chunk of raw JSON text and returns the decoded
+    characters of the watched fields that became available, as
+    ``(field, text)`` pairs in arrival order. Escapes (including ``\\uXXXX``
+    and surrogate pairs) may be split across chunks; nested values are
+    skipped.
+    """
+
+    _ESCAPES = {'"': '"', "\\": "\\", "/": "/", "b": "\b", "f": "\f", "n": "\n", "r": "\r", "t": "\t"}
+
+    def __init__(self, fields: tuple[str, ...]) -> None:
+        self.fields = set(fields)
+        self._depth = 0
+        self._expect_key = False
+        self._in_string = False
+        self._string_role: str | None = None  # "key", "capture" or None for skipped strings
+        self._escape = False
+        self._unicode: str | None = None
+        self._high_surrogate: int | None = None
+        self._key: list[str] = []
+        self._last_key = ""
+        self._capturing: str | None = None
+
+    def feed(self, chunk: str) -> list[tuple[str, str]]:
+        out: list[tuple[str, str]] = []
+        for char in chunk:
+            if self._in_string:
+                self._string_char(char, out)
+            elif char in "{[":
+                self._depth += 1
+                self._expect_key = self._depth == 1 and char == "{"
+            elif char in "}]":
+                self._depth -= 1
+            elif self._depth == 1 and char == ":":
+                self._expect_key = False
+            elif self._depth == 1 and char == ",":
+                self._expect_key = True
+            elif char == '"':
+                self._in_string = True
+                if self._depth == 1 and self._expect_key:
+                    self._string_role = "key"
+                    self._key = []
+                elif self._depth == 1 and self._last_key in self.fields:
+                    self._string_role = "capture"
+                    self._capturing = self._last_key
+                else:
+                    self._string_role = None
+        return out
+
+    def _string_char(self, char: str, out: list[tuple[str, str]]) -> None:
+        if self._unicode is not None:
+            self._unicode += char
+            if len(self._unicode) == 4:
+                code = int(self._unicode, 16)
+                self._unicode = None
+                if 0xD800 <= code < 0xDC00:
+                    self._high_surrogate = code
+                    return
+                if 0xDC00 <= code < 0xE000 and self._high_surrogate is not None:
+                    code = 0x10000 + ((self._high_surrogate - 0xD800) << 10) + (code - 0xDC00)
+                self._high_surrogate = None
+                self._emit(chr(code), out)
+            return
+        if self._escape:
+            self._escape = False
+            if char == "u":
+                self._unicode = ""
+            else:
+                self._emit(self._ESCAPES.get(char, char), out)
+            return
+        if char == "\\":
+            self._escape = True
+        elif char == '"':
+            self._in_string = False
+            if self._string_role == "key":
+                self._last_key = "".join(self._key)
+            elif self._string_role == "capture":
+                self._last_key = ""
+                self._capturing = None
+        else:
+            self._emit(char, out)
+
+    def _emit(self, text: str, out: list[tuple[str, str]]) -> None:
+        if self._string_role == "key":
+            self._key.append(text)
+        elif self._string_role == "capture" and self._capturing is not None:
+            if out and out[-1][0] == self._capturing:
+                out[-1] = (self._capturing, out[-1][1] + text)
+            else:
+                out.append((self._capturing, text))
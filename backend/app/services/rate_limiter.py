@@ -0,0 +1,30 @@
+import asyncio
+import time
+
+
+class TokenBucket:
+    """Token bucket metering ``rate_per_minute`` acquisitions, with bursts up to ``capacity``.
+
+    Implemented as GCRA: each caller reserves the next free slot up front and
+    sleeps until it, so concurrent callers are spaced exactly ``60 / rate``
+    seconds apart without polling. A weighted ``cost`` (e.g. an estimated LLM
+    token count) takes ``cost`` slots at once.
+    """
+
+    def __init__(self, rate_per_minute: float, capacity: int = 1) -> None:
+        self.interval = 60 / max(rate_per_minute, 1e-9)
+        self.burst_tolerance = max(0, capacity - 1) * self.interval
+        self._theoretical_arrival: float | None = None
+
+    def reserve(self, cost: float = 1) -> float:
+        """Reserve ``cost`` tokens and return how long the caller must wait for them."""
+        now = time.monotonic()
+        tat = now if self._theoretical_arrival is None else max(self._theoretical_arrival, now)
+        allowed_at = max(now, tat - self.burst_tolerance + (cost - 1) * self.interval)
+        self._theoretical_arrival = tat + cost * self.interval
+        return allowed_at - now
+
+    async def acquire(self, cost: float = 1) -> None:
+        wait = self.reserve(cost)
+        if wait > 0:
+            await asyncio.sleep(wait)
@@ -1,17 +1,24 @@
 import re
 
-from sqlalchemy import select
+from sqlalchemy import Text, bindparam, func, select, tuple_
+from sqlalchemy.dialects import postgresql
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.models.influencer import Influencer
-from app.models.search_result import SearchResultDeduped, SearchResultRaw
+from app.config import get_settings
+from app.models.influencer import Influencer, compact_display_name
 from app.models.search_task import SearchTask
-from app.services.dedup_service import compute_dedup_status
-from app.services.youtube_connector import YouTubeConnector
+from app.services.dedup_service import DedupIndex, collect_candidate_keys, compact_name
+from app.services.ingest_service import bulk_insert_deduped_results
+from app.services.youtube_connector import YouTubeConnector, search_stage_duration
+
+# DedupIndex scores names on pg_trgm's own padded trigrams, so the `%` prefetch uses
+# the same threshold; the margin only absorbs pg_trgm's float4 rounding.
+FUZZY_PREFETCH_MARGIN = 1e-6
 
 
 class SearchService:
     def __init__(self) -> None:
+        self.settings = get_settings()
         self.youtube = YouTubeConnector()
 
     def parse_query(self, payload: dict) -> dict:
@@ -46,52 +53,111 @@ class SearchService:
         follower_min = parsed.get("follower_min")
         follower_max = parsed.get("follower_max")
 
+        raw_records: list[dict] = []
         if "youtube" in platforms:
-            await self.youtube.fetch_and_store(
+            raw_records = await self.youtube.fetch_and_store(
                 db,
-                task_id=str(task.id),
+                task_id=task.id,
                 queries=search_queries,
                 follower_min=follower_min,
                 follower_max=follower_max,
             )
 
-        await db.flush()
-        raw_rows = (
-            await db.execute(select(SearchResultRaw).where(SearchResultRaw.task_id == task.id).order_by(SearchResultRaw.fetched_at.asc()))
-        ).scalars().all()
-
-        existing_influencers = (
-            await db.execute(
-                select(Influencer.id, Influencer.platform, Influencer.platform_user_id, Influencer.display_name, Influencer.profile_url, Influencer.follower_count, Influencer.email)
-            )
-        ).all()
-        existing_dict = [dict(row._mapping) for row in existing_influencers]
-
-        for raw in raw_rows:
-            status, matched_id = compute_dedup_status(
-                {
-                    "platform": raw.platform,
-                    "platform_user_id": raw.platform_user_id,
-                    "display_name": raw.display_name,
-                    "profile_url": raw.profile_url,
-                    "follower_count": raw.follower_count,
-                    "email": raw.email,
-                },
-                existing_dict,
-            )
-
-            db.add(
-                SearchResultDeduped(
-                    task_id=task.id,
-                    raw_result_id=raw.id,
-                    dedup_status=status,
-                    matched_influencer_id=matched_id,
+        with search_stage_duration.time(stage="dedup"):
+            if self.settings.dedup_candidate_prefetch and self._can_prefetch_fuzzy_candidates(db):
+                candidates = await self._load_dedup_candidates(db, raw_records)
+            else:
+                candidates = await self._load_all_influencers(db)
+            dedup_index = DedupIndex(candidates, fuzzy_threshold=self.settings.dedup_fuzzy_threshold)
+
+            deduped_rows = []
+            for raw in raw_records:
+                match = dedup_index.match(raw)
+                deduped_rows.append(
+                    {
+                        "task_id": task.id,
+                        "raw_result_id": raw["id"],
+                        "dedup_status": match.status,
+                        "matched_influencer_id": match.influencer_id,
+                        "match_score": match.score,
+                    }
                 )
-            )
+            await bulk_insert_deduped_results(db, deduped_rows)
 
-        task.result_count = len(raw_rows)
+        task.result_count = len(raw_records)
         task.status = "done"
-        return len(raw_rows)
+        return len(raw_records)
+
+    async def _load_all_influencers(self, db: AsyncSession) -> list[dict]:
+        stmt = select(*self._dedup_columns()).order_by(Influencer.saved_at, Influencer.id)
+        rows = (await db.execute(stmt)).all()
+        return [dict(row._mapping) for row in rows]
+
+    def _can_prefetch_fuzzy_candidates(self, db: AsyncSession) -> bool:
+        # Similar-name candidates need pg_trgm; elsewhere fuzzy matching falls back to a full load.
+        return self.settings.dedup_fuzzy_threshold is None or db.get_bind().dialect.name == "postgresql"
+
+    async def _load_dedup_candidates(self, db: AsyncSession, raws: list[dict]) -> list[dict]:
+        """Fetch only influencers that share a dedup key with the given raw results.
+
+        With ``dedup_fuzzy_threshold`` set, influencers whose display name is
+        trigram-similar to a raw result's are fetched too (through the pg_trgm
+        index) so fuzzy weak matches are not limited to exact-name candidates.
+        Other backends have no such index and load every influencer instead.
+        """
+        keys = collect_candidate_keys(raws)
+        filters = [
+            (tuple_(Influencer.platform, Influencer.platform_user_id), keys["platform_ids"]),
+            (Influencer.profile_url_normalized, keys["profile_urls"]),
+            (func.lower(func.trim(Influencer.email)), keys["emails"]),
+            (tuple_(Influencer.platform, func.lower(func.trim(Influencer.display_name))), keys["display_names"]),
+        ]
+
+        batch_size = self.settings.dedup_prefetch_batch_size
+        candidates: dict = {}
+        for column, values in filters:
+            values = sorted(values)
+            for start in range(0, len(values), batch_size):
+                batch = values[start : start + batch_size]
+                rows = (await db.execute(select(*self._dedup_columns()).where(column.in_(batch)))).all()
+                for row in rows:
+                    candidates.setdefault(row.id, dict(row._mapping))
+
+        if self.settings.dedup_fuzzy_threshold is not None and db.get_bind().dialect.name == "postgresql":
+            for row in await self._load_similar_name_candidates(db, raws):
+                candidates.setdefault(row.id, dict(row._mapping))
+
+        # Same order as _load_all_influencers, so DedupIndex breaks ties between matches the same way.
+        return sorted(candidates.values(), key=lambda item: (item["saved_at"], item["id"]))
+
+    async def _load_similar_name_candidates(self, db: AsyncSession, raws: list[dict]) -> list:
+        names = sorted({name for raw in raws if (name := compact_name(raw.get("display_name")))})
+        if not names:
+            return []
+        threshold = max(self.settings.dedup_fuzzy_threshold - FUZZY_PREFETCH_MARGIN, 0.0)
+        await db.execute(select(func.set_config("pg_trgm.similarity_threshold", str(threshold), True)))
+
+        rows = []
+        batch_size = self.settings.dedup_prefetch_batch_size
+        for start in range(0, len(names), batch_size):
+            wanted = func.unnest(
+                bindparam(None, names[start : start + batch_size], type_=postgresql.ARRAY(Text))
+            ).table_valued("name")
+            stmt = select(*self._dedup_columns()).join(wanted, compact_display_name.op("%")(wanted.c.name))
+            rows.extend((await db.execute(stmt)).all())
+        return rows
+
+    def _dedup_columns(self) -> tuple:
+        return (
+            Influencer.id,
+            Influencer.platform,
+            Influencer.platform_user_id,
+            Influencer.display_name,
+            Influencer.profile_url,
+            Influencer.follower_count,
+            Influencer.email,
+            Influencer.saved_at,
+        )
 
     def _extract_region(self, query: str) -> str | None:
         region_map = {
@@ -0,0 +1,106 @@
+from datetime import date, datetime, timezone
+
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.database import AsyncSessionLocal, dialect_insert
+from app.models.send_quota import SendQuotaLedger
+
+
+class SendQuota:
+    """Daily send quota shared by every process, kept in ``send_quota_ledger``.
+
+    The ledger holds one row per UTC day and sender. Reservations are a
+    single conditional ``UPDATE ... RETURNING`` committed in its own short
+    transaction, so concurrent campaigns can never reserve past the limit
+    and no row lock is held while mail is being sent.
+    """
+
+    def __init__(self, session_factory: async_sessionmaker[AsyncSession] = AsyncSessionLocal) -> None:
+        self.session_factory = session_factory
+
+    async def reserve(self, sender: str, wanted: int, limit: int) -> tuple[date, int]:
+        """Reserve up to ``wanted`` sends for today; returns the day and how many were granted."""
+        day = datetime.now(timezone.utc).date()
+        key = (SendQuotaLedger.day == day, SendQuotaLedger.sender == sender)
+        async with self.session_factory() as session:
+            await session.execute(
+                dialect_insert(session)(SendQuotaLedger)
+                .values(day=day, sender=sender, used=0)
+                .on_conflict_do_nothing(index_elements=[SendQuotaLedger.day, SendQuotaLedger.sender])
+            )
+            granted = 0
+            while wanted > 0:
+                reserved = (
+                    await session.execute(
+                        update(SendQuotaLedger)
+                        .where(*key, SendQuotaLedger.used + wanted <= limit)
+                        .values(used=SendQuotaLedger.used + wanted)
+                        .returning(SendQuotaLedger.used)
+                    )
+                ).scalar_one_or_none()
+                if reserved is not None:
+                    granted = wanted
+                    break
+                # Not enough left for the whole chunk: retry with whatever remains.
+                used = (await session.execute(select(SendQuotaLedger.used).where(*key))).scalar_one()
+                wanted = min(wanted, limit - used)
+            await session.commit()
+        return day, granted
+
+    async def release(self, sender: str, day: date, count: int) -> None:
+        """Hand unused reservations back to the day they were taken from."""
+        if count <= 0:
+            return
+        async with self.session_factory() as session:
+            await session.execute(
+                update(SendQuotaLedger)
+                .where(SendQuotaLedger.day == day, SendQuotaLedger.sender == sender, SendQuotaLedger.used >= count)
+                .values(used=SendQuotaLedger.used - count)
+            )
+            await session.commit()
+
+
+class QuotaReservation:
+    """One campaign's view of the shared quota: a local pool refilled in chunks.
+
+    ``take`` hands out one send from the pool, reserving another chunk from
+    the ledger when it runs dry; ``give_back`` returns a send that did not go
+    out (e.g. a failed delivery) to the pool, and ``close`` returns whatever
+    is left in the pool to the ledger.
+    """
+
+    def __init__(self, quota: SendQuota, sender: str, limit: int, chunk_size: int, expected: int) -> None:
+        self.quota = quota
+        self.sender = sender
+        self.limit = limit
+        self.chunk_size = chunk_size
+        self.remaining_expected = expected
+        self.available = 0
+        self.day: date | None = None
+        self.exhausted = False
+
+    async def take(self) -> bool:
+        if self.available == 0 and not self.exhausted:
+            await self._refill()
+        if self.available == 0:
+            return False
+        self.available -= 1
+        self.remaining_expected = max(0, self.remaining_expected - 1)
+        return True
+
+    def give_back(self) -> None:
+        self.available += 1
+        self.remaining_expected += 1
+
+    async def close(self) -> None:
+        if self.day is not None:
+            await self.quota.release(self.sender, self.day, self.available)
+        self.available = 0
+
+    async def _refill(self) -> None:
+        wanted = max(1, min(self.chunk_size, self.remaining_expected))
+        # Only called with an empty pool, so moving to a new UTC day strands nothing.
+        self.day, granted = await self.quota.reserve(self.sender, wanted, self.limit)
+        self.available = granted
+        self.exhausted = granted == 0
@@ -0,0 +1,121 @@
+import html
+import re
+import uuid
+from collections import OrderedDict
+from typing import NamedTuple
+
+from app.models.influencer import Influencer
+
+VARIABLE_RE = re.compile(r"\{\{\s*([A-Za-z_][A-Za-z0-9_]*)\s*\}\}")
+UNSUBSCRIBE_FOOTER = "\n\n---\nUnsubscribe: https://example.com/unsubscribe/{{unsubscribe_id}}"
+PLAN_CACHE_SIZE = 256
+
+# Per-recipient values a template slot can resolve to, directly or via EmailDraft.variables.
+RECIPIENT_FIELDS = {
+    "name": lambda i: i.display_name,
+    "display_name": lambda i: i.display_name,
+    "influencer_name": lambda i: i.display_name,
+    "email": lambda i: i.email or "",
+    "platform": lambda i: i.platform,
+    "followers": lambda i: "" if i.follower_count is None else str(i.follower_count),
+    "profile_url": lambda i: i.profile_url,
+    "unsubscribe_id": lambda i: str(i.id),
+}
+
+
+class CompiledTemplate:
+    """A template split once into literal segments and variable slots.
+
+    ``parts`` alternates literals and slot placeholders; rendering copies the
+    list, fills the slot positions and joins, with no regex work per recipient.
+    Unknown variables render as their original ``{{...}}`` text. In HTML mode
+    literals are escaped once here and slot values at render time.
+    """
+
+    __slots__ = ("parts", "slots", "html")
+
+    def __init__(self, source: str, variables: dict, html_mode: bool = False) -> None:
+        self.html = html_mode
+        self.parts: list[str] = []
+        self.slots: list[tuple[int, str]] = []
+        position = 0
+        for match in VARIABLE_RE.finditer(source):
+            self.parts.append(self._literal(source[position : match.start()]))
+            field = _resolve_field(match.group(1), variables)
+            if field is None:
+                self.parts.append(self._literal(match.group(0)))
+            else:
+                self.slots.append((len(self.parts), field))
+                self.parts.append("")
+            position = match.end()
+        self.parts.append(self._literal(source[position:]))
+
+    def render(self, values: dict[str, str]) -> str:
+        parts = self.parts.copy()
+        if self.html:
+            for index, field in self.slots:
+                parts[index] = html.escape(values[field]).replace("\n", "<br/>")
+        else:
+            for index, field in self.slots:
+                parts[index] = values[field]
+        return "".join(parts)
+
+    @property
+    def fields(self) -> set[str]:
+        return {field for _, field in self.slots}
+
+    def _literal(self, text: str) -> str:
+        return html.escape(text).replace("\n", "<br/>") if self.html else text
+
+
+class RenderedEmail(NamedTuple):
+    subject: str
+    text: str
+    html: str
+
+
+class RenderPlan:
+    """Compiled subject, text body and HTML body (footer included) for one draft."""
+
+    def __init__(self, subject: str, body: str, variables: dict) -> None:
+        body_with_footer = f"{body}{UNSUBSCRIBE_FOOTER}"
+        self.subject = CompiledTemplate(subject, variables)
+        self.text = CompiledTemplate(body_with_footer, variables)
+        self.html = CompiledTemplate(body_with_footer, variables, html_mode=True)
+        self._getters = [
+            (field, RECIPIENT_FIELDS[field]) for field in sorted(self.subject.fields | self.text.fields)
+        ]
+
+    def render(self, influencer: Influencer) -> RenderedEmail:
+        values = {field: getter(influencer) for field, getter in self._getters}
+        return RenderedEmail(self.subject.render(values), self.text.render(values), self.html.render(values))
+
+
+_plan_cache: OrderedDict[uuid.UUID, RenderPlan] = OrderedDict()
+
+
+def get_render_plan(draft_id: uuid.UUID | None, subject: str, body: str, variables: dict | None = None) -> RenderPlan:
+    """Return the compiled plan for a draft, compiling it on first use.
+
+    Drafts are immutable once created, so the plan is cached by draft id.
+    """
+    if draft_id is None:
+        return RenderPlan(subject, body, variables or {})
+    plan = _plan_cache.get(draft_id)
+    if plan is None:
+        plan = RenderPlan(subject, body, variables or {})
+        _plan_cache[draft_id] = plan
+        while len(_plan_cache) > PLAN_CACHE_SIZE:
+            _plan_cache.popitem(last=False)
+    else:
+        _plan_cache.move_to_end(draft_id)
+    return plan
+
+
+def _resolve_field(name: str, variables: dict) -> str | None:
+    if name in RECIPIENT_FIELDS:
+        return name
+    mapped = variables.get(name)
+    if isinstance(mapped, str) and mapped in RECIPIENT_FIELDS:
+        return mapped
+    return None
@@ -0,0 +1,75 @@
+import asyncio
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.config import get_settings
+from app.database import AsyncSessionLocal
+from app.services.email_service import EmailService
+
+
+class WebhookBatcher:
+    """Buffer webhook events for a few milliseconds and store them in one transaction.
+
+    Each caller awaits its own result, so the endpoint still answers with
+    ``saved`` per event while storms after a large campaign are absorbed in
+    bulk. If a batch fails, its events are retried one by one so a bad
+    event only fails its own request.
+    """
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession] = AsyncSessionLocal,
+        service: EmailService | None = None,
+    ) -> None:
+        settings = get_settings()
+        self.session_factory = session_factory
+        self.service = service or EmailService()
+        self.window_seconds = settings.webhook_batch_window_ms / 1000
+        self.max_batch_size = settings.webhook_batch_max_size
+        self._buffer: list[tuple[dict, asyncio.Future]] = []
+        self._timer: asyncio.TimerHandle | None = None
+        self._tasks: set[asyncio.Task] = set()
+
+    async def submit(self, payload: dict) -> bool:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._buffer.append((payload, future))
+        if len(self._buffer) >= self.max_batch_size:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.window_seconds, self._flush)
+        return await future
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._buffer = self._buffer, []
+        if not batch:
+            return
+        task = asyncio.create_task(self._store(batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _store(self, batch: list[tuple[dict, asyncio.Future]]) -> None:
+        try:
+            saved = await self._process([payload for payload, _ in batch])
+        except Exception as exc:
+            if len(batch) == 1:
+                _, future = batch[0]
+                if not future.done():
+                    future.set_exception(exc)
+                return
+            # Store each event on its own so only the one that broke the batch fails.
+            for payload, future in batch:
+                await self._store([(payload, future)])
+            return
+        for (_, future), result in zip(batch, saved):
+            if not future.done():
+                future.set_result(result)
+
+    async def _process(self, payloads: list[dict]) -> list[bool]:
+        async with self.session_factory() as session:
+            saved = await self.service.process_webhook_events(session, payloads)
+            await session.commit()
+        return saved
@@ -0,0 +1,104 @@
+import time
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from typing import Any
+
+from sqlalchemy import delete, select
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.config import get_settings
+from app.database import AsyncSessionLocal, dialect_insert
+from app.models.youtube_cache import YouTubeCacheEntry
+from app.services.ttl_cache import TTLCache
+
+
+class YouTubeCache:
+    """Two-tier cache for YouTube API payloads.
+
+    The process-local LRU is always consulted first; the ``youtube_api_cache``
+    table is an optional shared tier so workers can reuse each other's
+    lookups. The table tier is best effort: database errors count as misses.
+    Writes also delete expired table rows, once every
+    ``purge_interval_seconds`` per process, so the table does not grow
+    without bound.
+    """
+
+    def __init__(
+        self,
+        memory: TTLCache,
+        session_factory: async_sessionmaker[AsyncSession] | None = None,
+        purge_interval_seconds: float = 300,
+    ) -> None:
+        self.memory = memory
+        self.session_factory = session_factory
+        self.purge_interval_seconds = purge_interval_seconds
+        self._next_purge_at = time.monotonic() + purge_interval_seconds
+
+    async def get_many(self, keys: list[str]) -> dict[str, Any]:
+        found: dict[str, Any] = {}
+        missing: list[str] = []
+        for key in keys:
+            value = self.memory.get(key)
+            if value is None:
+                missing.append(key)
+            else:
+                found[key] = value
+
+        if missing and self.session_factory is not None:
+            now = datetime.now(timezone.utc)
+            try:
+                async with self.session_factory() as session:
+                    rows = (
+                        await session.execute(
+                            select(YouTubeCacheEntry.cache_key, YouTubeCacheEntry.payload, YouTubeCacheEntry.expires_at).where(
+                                YouTubeCacheEntry.cache_key.in_(missing), YouTubeCacheEntry.expires_at > now
+                            )
+                        )
+                    ).all()
+            except SQLAlchemyError:
+                rows = []
+            for row in rows:
+                # SQLite hands back naive datetimes; values are always written in UTC.
+                expires_at = row.expires_at if row.expires_at.tzinfo else row.expires_at.replace(tzinfo=timezone.utc)
+                found[row.cache_key] = row.payload
+                self.memory.set(row.cache_key, row.payload, (expires_at - now).total_seconds())
+
+        return found
+
+    async def set_many(self, items: dict[str, Any], ttl_seconds: float) -> None:
+        if not items:
+            return
+        for key, value in items.items():
+            self.memory.set(key, value, ttl_seconds)
+
+        if self.session_factory is None:
+            return
+        now = datetime.now(timezone.utc)
+        expires_at = now + timedelta(seconds=ttl_seconds)
+        try:
+            async with self.session_factory() as session:
+                if time.monotonic() >= self._next_purge_at:
+                    self._next_purge_at = time.monotonic() + self.purge_interval_seconds
+                    await session.execute(delete(YouTubeCacheEntry).where(YouTubeCacheEntry.expires_at <= now))
+                stmt = dialect_insert(session)(YouTubeCacheEntry).values(
+                    [{"cache_key": key, "payload": value, "expires_at": expires_at} for key, value in items.items()]
+                )
+                stmt = stmt.on_conflict_do_update(
+                    index_elements=[YouTubeCacheEntry.cache_key],
+                    set_={"payload": stmt.excluded.payload, "expires_at": stmt.excluded.expires_at},
+                )
+                await session.execute(stmt)
+                await session.commit()
+        except SQLAlchemyError:
+            return
+
+
+@lru_cache
+def get_youtube_cache() -> YouTubeCache:
+    settings = get_settings()
+    return YouTubeCache(
+        TTLCache(settings.youtube_cache_max_entries),
+        session_factory=AsyncSessionLocal if settings.youtube_cache_db_enabled else None,
+        purge_interval_seconds=settings.youtube_cache_purge_interval_seconds,
+    )
@@ -1,127 +1,295 @@
+import asyncio
 import re
+import time
+import uuid
+from collections.abc import Awaitable, Callable
+from functools import partial
 from typing import Any
 
 import httpx
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.config import get_settings
-from app.models.search_result import SearchResultRaw
+from app.metrics import registry
+from app.services.ingest_service import bulk_insert_raw_results
+from app.services.youtube_cache import YouTubeCache, get_youtube_cache
 
 EMAIL_RE = re.compile(r"[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}")
+CHANNELS_BATCH_SIZE = 50
 
+youtube_requests = registry.counter(
+    "youtube_api_requests_total", "YouTube Data API calls by endpoint and HTTP status.", ("endpoint", "status")
+)
+youtube_request_duration = registry.histogram(
+    "youtube_api_request_duration_seconds", "YouTube Data API call latency.", ("endpoint",)
+)
+search_stage_duration = registry.histogram(
+    "search_pipeline_stage_duration_seconds", "Search pipeline stage durations.", ("stage",)
+)
 
-class YouTubeConnector:
-    base_url = "https://www.googleapis.com/youtube/v3"
 
-    def __init__(self) -> None:
+class _ChannelBatcher:
+    """Coalesce channel lookups from concurrent queries into /channels calls of up to 50 ids."""
+
+    def __init__(
+        self,
+        fetch: Callable[[list[str]], Awaitable[dict[str, dict]]],
+        window_seconds: float,
+        batch_size: int = CHANNELS_BATCH_SIZE,
+    ) -> None:
+        self._fetch = fetch
+        self._window_seconds = window_seconds
+        self._batch_size = batch_size
+        self._futures: dict[str, asyncio.Future] = {}
+        self._queued: list[str] = []
+        self._timer: asyncio.TimerHandle | None = None
+        self._tasks: set[asyncio.Task] = set()
+
+    async def load_many(self, channel_ids: list[str]) -> list[dict]:
+        loop = asyncio.get_running_loop()
+        futures = []
+        for channel_id in channel_ids:
+            future = self._futures.get(channel_id)
+            if future is None:
+                future = loop.create_future()
+                self._futures[channel_id] = future
+                self._queued.append(channel_id)
+            futures.append(future)
+
+        if len(self._queued) >= self._batch_size:
+            self._dispatch()
+        elif self._queued and self._timer is None:
+            self._timer = loop.call_later(self._window_seconds, self._dispatch)
+
+        channels = await asyncio.gather(*futures)
+        return [channel for channel in channels if channel is not None]
+
+    def close(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+        for task in self._tasks:
+            task.cancel()
+
+    def _dispatch(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        while self._queued:
+            batch, self._queued = self._queued[: self._batch_size], self._queued[self._batch_size :]
+            task = asyncio.create_task(self._run(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, batch: list[str]) -> None:
+        try:
+            found = await self._fetch(batch)
+        except Exception as exc:
+            for channel_id in batch:
+                if not self._futures[channel_id].done():
+                    self._futures[channel_id].set_exception(exc)
+            return
+        for channel_id in batch:
+            if not self._futures[channel_id].done():
+                self._futures[channel_id].set_result(found.get(channel_id))
+
+
+class YouTubeConnector:
+    def __init__(self, transport: httpx.AsyncBaseTransport | None = None, cache: YouTubeCache | None = None) -> None:
         self.settings = get_settings()
+        self.base_url = self.settings.youtube_api_base_url.rstrip("/")
+        self.transport = transport
+        self.cache = cache or get_youtube_cache()
 
     async def fetch_and_store(
         self,
         db: AsyncSession,
-        task_id: str,
+        task_id: uuid.UUID,
+        queries: list[str],
+        follower_min: int | None = None,
+        follower_max: int | None = None,
+        pages: int = 1,
+    ) -> list[dict[str, Any]]:
+        """Fetch channels for ``queries`` and bulk insert them as raw results of ``task_id``.
+
+        Returns the inserted records, ids included, in fetch order.
+        """
+        with search_stage_duration.time(stage="fetch"):
+            rows = await self.fetch(queries, follower_min=follower_min, follower_max=follower_max, pages=pages)
+        with search_stage_duration.time(stage="store"):
+            return await bulk_insert_raw_results(db, task_id, rows)
+
+    async def fetch(
+        self,
         queries: list[str],
         follower_min: int | None = None,
         follower_max: int | None = None,
         pages: int = 1,
-    ) -> int:
+    ) -> list[dict[str, Any]]:
         dedup_ids: set[str] = set()
         if not self.settings.youtube_api_key:
-            return await self._mock_results(
-                db,
-                task_id=task_id,
+            return self._mock_results(
                 query=queries[0] if queries else "youtube creator",
                 follower_min=follower_min,
                 follower_max=follower_max,
             )
 
-        total = 0
-
-        async with httpx.AsyncClient(timeout=30) as client:
-            for query in queries:
-                page_token: str | None = None
-                for _ in range(max(1, pages)):
-                    search_payload = {
-                        "part": "snippet",
-                        "q": query,
-                        "type": "channel",
-                        "maxResults": 25,
-                        "key": self.settings.youtube_api_key,
+        rows: list[dict[str, Any]] = []
+        semaphore = asyncio.Semaphore(self.settings.youtube_max_concurrency)
+
+        async with httpx.AsyncClient(timeout=30, transport=self.transport) as client:
+            batcher = _ChannelBatcher(
+                partial(self._fetch_channels, client, semaphore),
+                window_seconds=self.settings.youtube_channel_batch_window_ms / 1000,
+            )
+            try:
+                async with asyncio.TaskGroup() as tg:
+                    query_tasks = [
+                        tg.create_task(self._fetch_query(client, semaphore, batcher, query, pages)) for query in queries
+                    ]
+            finally:
+                batcher.close()
+
+        # Merge in query order so the dedup_ids winner does not depend on response timing.
+        for query, query_task in zip(queries, query_tasks):
+            for channel in query_task.result():
+                channel_id = channel.get("id")
+                if not channel_id or channel_id in dedup_ids:
+                    continue
+
+                snippet = channel.get("snippet", {})
+                stats = channel.get("statistics", {})
+                follower_count = int(stats.get("subscriberCount", 0) or 0)
+                if follower_min is not None and follower_count < follower_min:
+                    continue
+                if follower_max is not None and follower_count > follower_max:
+                    continue
+
+                description = snippet.get("description", "")
+                email_match = EMAIL_RE.search(description)
+                custom_url = snippet.get("customUrl")
+                profile_url = (
+                    f"https://www.youtube.com/{custom_url}"
+                    if custom_url
+                    else f"https://www.youtube.com/channel/{channel_id}"
+                )
+
+                rows.append(
+                    {
+                        "platform": "youtube",
+                        "platform_user_id": channel_id,
+                        "display_name": snippet.get("title", ""),
+                        "profile_url": profile_url,
+                        "follower_count": follower_count,
+                        "email": email_match.group(0) if email_match else None,
+                        "extra": {"description": description, "query_used": query},
                     }
-                    if page_token:
-                        search_payload["pageToken"] = page_token
-
-                    search_resp = await client.get(f"{self.base_url}/search", params=search_payload)
-                    search_resp.raise_for_status()
-                    search_data = search_resp.json()
-
-                    channel_ids = [it["snippet"]["channelId"] for it in search_data.get("items", [])]
-                    if not channel_ids:
-                        break
-
-                    channel_resp = await client.get(
-                        f"{self.base_url}/channels",
-                        params={
-                            "part": "snippet,statistics",
-                            "id": ",".join(channel_ids),
-                            "key": self.settings.youtube_api_key,
-                            "maxResults": 50,
-                        },
-                    )
-                    channel_resp.raise_for_status()
-                    channels = channel_resp.json().get("items", [])
-
-                    for channel in channels:
-                        channel_id = channel.get("id")
-                        if not channel_id or channel_id in dedup_ids:
-                            continue
-
-                        snippet = channel.get("snippet", {})
-                        stats = channel.get("statistics", {})
-                        follower_count = int(stats.get("subscriberCount", 0) or 0)
-                        if follower_min is not None and follower_count < follower_min:
-                            continue
-                        if follower_max is not None and follower_count > follower_max:
-                            continue
-
-                        description = snippet.get("description", "")
-                        email_match = EMAIL_RE.search(description)
-                        custom_url = snippet.get("customUrl")
-                        profile_url = (
-                            f"https://www.youtube.com/{custom_url}"
-                            if custom_url
-                            else f"https://www.youtube.com/channel/{channel_id}"
-                        )
-
-                        db.add(
-                            SearchResultRaw(
-                                task_id=task_id,
-                                platform="youtube",
-                                platform_user_id=channel_id,
-                                display_name=snippet.get("title", ""),
-                                profile_url=profile_url,
-                                follower_count=follower_count,
-                                email=email_match.group(0) if email_match else None,
-                                extra={"description": description, "query_used": query},
-                            )
-                        )
-                        dedup_ids.add(channel_id)
-                        total += 1
-
-                    page_token = search_data.get("nextPageToken")
-                    if not page_token:
-                        break
-
-        return total
-
-    async def _mock_results(
+                )
+                dedup_ids.add(channel_id)
+
+        return rows
+
+    async def _fetch_query(
+        self,
+        client: httpx.AsyncClient,
+        semaphore: asyncio.Semaphore,
+        batcher: _ChannelBatcher,
+        query: str,
+        pages: int,
+    ) -> list[dict[str, Any]]:
+        """Fetch channels for one query, overlapping /channels of page N with /search of page N+1."""
+        channel_tasks: list[asyncio.Task] = []
+        async with asyncio.TaskGroup() as tg:
+            page_token: str | None = None
+            for _ in range(max(1, pages)):
+                search_data = await self._search_page(client, semaphore, query, page_token)
+                channel_ids = [it["snippet"]["channelId"] for it in search_data.get("items", [])]
+                if not channel_ids:
+                    break
+
+                channel_tasks.append(tg.create_task(batcher.load_many(channel_ids)))
+
+                page_token = search_data.get("nextPageToken")
+                if not page_token:
+                    break
+
+        return [channel for task in channel_tasks for channel in task.result()]
+
+    async def _search_page(
+        self,
+        client: httpx.AsyncClient,
+        semaphore: asyncio.Semaphore,
+        query: str,
+        page_token: str | None,
+    ) -> dict:
+        cache_key = f"search:{query}:{page_token or ''}"
+        cached = await self.cache.get_many([cache_key])
+        if cache_key in cached:
+            return cached[cache_key]
+
+        search_payload = {
+            "part": "snippet",
+            "q": query,
+            "type": "channel",
+            "maxResults": 25,
+            "key": self.settings.youtube_api_key,
+        }
+        if page_token:
+            search_payload["pageToken"] = page_token
+
+        search_data = await self._get(client, semaphore, "/search", search_payload)
+        await self.cache.set_many({cache_key: search_data}, self.settings.youtube_search_cache_ttl_seconds)
+        return search_data
+
+    async def _fetch_channels(
+        self,
+        client: httpx.AsyncClient,
+        semaphore: asyncio.Semaphore,
+        channel_ids: list[str],
+    ) -> dict[str, dict]:
+        cached = await self.cache.get_many([f"channel:{channel_id}" for channel_id in channel_ids])
+        found = {key.removeprefix("channel:"): value for key, value in cached.items()}
+        missing = [channel_id for channel_id in channel_ids if channel_id not in found]
+        if not missing:
+            return found
+
+        channel_data = await self._get(
+            client,
+            semaphore,
+            "/channels",
+            {
+                "part": "snippet,statistics",
+                "id": ",".join(missing),
+                "key": self.settings.youtube_api_key,
+                "maxResults": CHANNELS_BATCH_SIZE,
+            },
+        )
+        fetched = {channel["id"]: channel for channel in channel_data.get("items", []) if channel.get("id")}
+        await self.cache.set_many(
+            {f"channel:{channel_id}": channel for channel_id, channel in fetched.items()},
+            self.settings.youtube_channel_cache_ttl_seconds,
+        )
+        return found | fetched
+
+    async def _get(self, client: httpx.AsyncClient, semaphore: asyncio.Semaphore, path: str, params: dict) -> dict:
+        async with semaphore:
+            started = time.perf_counter()
+            try:
+                resp = await client.get(f"{self.base_url}{path}", params=params)
+            except httpx.HTTPError:
+                youtube_requests.inc(endpoint=path, status="error")
+                raise
+            finally:
+                youtube_request_duration.observe(time.perf_counter() - started, endpoint=path)
+        youtube_requests.inc(endpoint=path, status=resp.status_code)
+        resp.raise_for_status()
+        return resp.json()
+
+    def _mock_results(
         self,
-        db: AsyncSession,
-        task_id: str,
         query: str,
         follower_min: int | None = None,
         follower_max: int | None = None,
-    ) -> int:
+    ) -> list[dict[str, Any]]:
         samples: list[dict[str, Any]] = [
             {
                 "platform_user_id": "mock-channel-1",
@@ -148,17 +316,15 @@ class YouTubeConnector:
                 continue
             filtered_samples.append(sample)
 
-        for sample in filtered_samples:
-            db.add(
-                SearchResultRaw(
-                    task_id=task_id,
-                    platform="youtube",
-                    platform_user_id=sample["platform_user_id"],
-                    display_name=sample["display_name"],
-                    profile_url=sample["profile_url"],
-                    follower_count=sample["follower_count"],
-                    email=sample["email"],
-                    extra={"mocked": True},
-                )
-            )
-        return len(filtered_samples)
+        return [
+            {
+                "platform": "youtube",
+                "platform_user_id": sample["platform_user_id"],
+                "display_name": sample["display_name"],
+                "profile_url": sample["profile_url"],
+                "follower_count": sample["follower_count"],
+                "email": sample["email"],
+                "extra": {"mocked": True},
+            }
+            for sample in filtered_samples
+        ]
@@ -0,0 +1,9 @@
+from urllib.parse import urlparse
+
+
+def normalize_profile_url(url: str) -> str:
+    parsed = urlparse(url.strip())
+    path = parsed.path.rstrip("/")
+    netloc = parsed.netloc.lower()
+    scheme = parsed.scheme.lower() or "https"
+    return f"{scheme}://{netloc}{path}"
@@ -0,0 +1,105 @@
+"""Standalone search-task worker.
+
+Run one or more processes per node, e.g.::
+
+    python -m app.workers.search_worker --concurrency 8 --processes 2
+
+Every process polls the ``search_tasks`` queue independently; ``SKIP LOCKED``
+claims keep workers on different processes and machines from picking the
+same task.
+"""
+
+import argparse
+import asyncio
+import logging
+import multiprocessing
+import signal
+
+from app.config import get_settings
+from app.services.job_queue import SearchJobQueue
+from app.workers.tasks import run_claimed_search_task
+
+logger = logging.getLogger(__name__)
+
+MAX_ERROR_BACKOFF_SECONDS = 60.0
+
+
+class SearchWorker:
+    def __init__(self, queue: SearchJobQueue, concurrency: int, poll_seconds: float) -> None:
+        self.queue = queue
+        self.concurrency = concurrency
+        self.poll_seconds = poll_seconds
+        self.running: set[asyncio.Task] = set()
+
+    async def run(self, stop: asyncio.Event) -> None:
+        reclaim_every = max(self.poll_seconds, self.queue.settings.search_job_lease_seconds / 3)
+        loop = asyncio.get_running_loop()
+        next_reclaim = loop.time()
+        stop_waiter = asyncio.create_task(stop.wait())
+        error_backoff = self.poll_seconds
+
+        while not stop.is_set():
+            try:
+                if loop.time() >= next_reclaim:
+                    await self.queue.reclaim_expired()
+                    next_reclaim = loop.time() + reclaim_every
+
+                free = self.concurrency - len(self.running)
+                claimed = await self.queue.claim(free) if free > 0 else []
+            except Exception:
+                # A transient database error must not take the worker down; back off and poll again.
+                logger.exception("polling the search job queue failed; retrying in %.1fs", error_backoff)
+                await asyncio.wait({stop_waiter}, timeout=error_backoff)
+                error_backoff = min(error_backoff * 2, MAX_ERROR_BACKOFF_SECONDS)
+                continue
+            error_backoff = self.poll_seconds
+
+            for task_id in claimed:
+                task = asyncio.create_task(run_claimed_search_task(self.queue, task_id))
+                self.running.add(task)
+                task.add_done_callback(self.running.discard)
+
+            # Poll again right away while there is backlog and spare capacity.
+            if claimed and len(self.running) < self.concurrency:
+                continue
+            await asyncio.wait({*self.running, stop_waiter}, timeout=self.poll_seconds, return_when=asyncio.FIRST_COMPLETED)
+
+        if self.running:
+            await asyncio.gather(*self.running, return_exceptions=True)
+
+
+async def _serve(concurrency: int, poll_seconds: float) -> None:
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+    await SearchWorker(SearchJobQueue(), concurrency, poll_seconds).run(stop)
+
+
+def _run_process(concurrency: int, poll_seconds: float) -> None:
+    asyncio.run(_serve(concurrency, poll_seconds))
+
+
+def main() -> None:
+    settings = get_settings()
+    parser = argparse.ArgumentParser(description="Run search-task pipelines from the job queue.")
+    parser.add_argument("--concurrency", type=int, default=settings.search_worker_concurrency, help="pipelines per process")
+    parser.add_argument("--processes", type=int, default=1, help="worker processes to start on this node")
+    parser.add_argument("--poll-seconds", type=float, default=settings.search_worker_poll_seconds)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+
+    if args.processes <= 1:
+        _run_process(args.concurrency, args.poll_seconds)
+        return
+
+    ctx = multiprocessing.get_context("spawn")
+    processes = [ctx.Process(target=_run_process, args=(args.concurrency, args.poll_seconds)) for _ in range(args.processes)]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,26 @@
+import asyncio
+import logging
 import uuid
+from collections import Counter
+from collections.abc import Awaitable, Callable
+from datetime import datetime, timezone
 
-from sqlalchemy import select
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database import AsyncSessionLocal
+from app.models.email_campaign import EmailCampaign
+from app.models.email_draft import EmailDraft
+from app.models.email_message import EmailMessage
+from app.models.influencer import Influencer
 from app.models.search_task import SearchTask
+from app.services.campaign_stats_service import increment_campaign_stats
+from app.services.email_service import EmailService
+from app.services.job_queue import CampaignSendQueue, SearchJobQueue
 from app.services.search_service import SearchService
 
+logger = logging.getLogger(__name__)
+
 
 async def run_search_task(task_id: uuid.UUID) -> None:
     search_service = SearchService()
@@ -21,3 +36,192 @@ async def run_search_task(task_id: uuid.UUID) -> None:
             task.status = "failed"
             await session.commit()
             raise
+
+
+async def run_claimed_search_task(queue: SearchJobQueue, task_id: uuid.UUID) -> None:
+    """Run a task claimed from the job queue, renewing its lease until the pipeline finishes.
+
+    If a renewal finds the lease taken over by another worker, the pipeline
+    is cancelled and its writes rolled back; results are only committed
+    together with a ``done`` update that still requires this worker's lock.
+    """
+    lease_lost = asyncio.Event()
+    heartbeat = asyncio.create_task(
+        _renew_lease_forever(
+            lambda: queue.renew_lease(task_id), queue.settings.search_job_lease_seconds, lease_lost, f"search task {task_id}"
+        )
+    )
+    try:
+        async with queue.session_factory() as session:
+            task = (await session.execute(select(SearchTask).where(SearchTask.id == task_id))).scalar_one_or_none()
+            if task is None:
+                return
+            pipeline = asyncio.create_task(SearchService().run_search_pipeline(session, task))
+            lost_waiter = asyncio.create_task(lease_lost.wait())
+            await asyncio.wait({pipeline, lost_waiter}, return_when=asyncio.FIRST_COMPLETED)
+            lost_waiter.cancel()
+            if not pipeline.done():
+                pipeline.cancel()
+                await asyncio.gather(pipeline, return_exceptions=True)
+                await session.rollback()
+                logger.warning("lease on search task %s lost; abandoned the run", task_id)
+                return
+            if not await queue.complete(session, task_id, pipeline.result()):
+                await session.rollback()
+                logger.warning("search task %s was reclaimed before it finished; discarded results", task_id)
+                return
+            await session.commit()
+    except Exception as exc:
+        await queue.fail(task_id, repr(exc))
+    finally:
+        heartbeat.cancel()
+
+
+async def _renew_lease_forever(
+    renew: Callable[[], Awaitable[bool]], lease_seconds: float, lease_lost: asyncio.Event, label: str
+) -> None:
+    interval = lease_seconds / 3
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            renewed = await renew()
+        except Exception:
+            # Keep trying: the lease is still valid until it expires, and once it is
+            # reclaimed the next successful renewal reports it as lost.
+            logger.exception("renewing the lease on %s failed", label)
+            continue
+        if not renewed:
+            lease_lost.set()
+            return
+
+
+class _CampaignLeaseLost(Exception):
+    pass
+
+
+async def run_campaign_send(campaign_id: uuid.UUID, queue: CampaignSendQueue) -> None:
+    """Send, or resume, a campaign whose lease ``queue`` holds, committing progress as batches of sends complete.
+
+    Recipients that already have a message for the campaign are skipped, so a
+    campaign resumed after its process died does not email them again. If
+    the lease is lost the send stops at the next progress point.
+    """
+    lease_lost = asyncio.Event()
+    heartbeat = asyncio.create_task(
+        _renew_lease_forever(
+            lambda: queue.renew_lease(campaign_id), queue.settings.campaign_lease_seconds, lease_lost, f"campaign {campaign_id}"
+        )
+    )
+    try:
+        async with queue.session_factory() as session:
+            await _send_leased_campaign(session, campaign_id, queue, lease_lost)
+    finally:
+        heartbeat.cancel()
+
+
+async def _send_leased_campaign(
+    session: AsyncSession, campaign_id: uuid.UUID, queue: CampaignSendQueue, lease_lost: asyncio.Event
+) -> None:
+    campaign = (await session.execute(select(EmailCampaign).where(EmailCampaign.id == campaign_id))).scalar_one_or_none()
+    if campaign is None or campaign.status != "sending" or campaign.locked_by != queue.worker_id:
+        return
+
+    async def persist_progress(_report) -> None:
+        if lease_lost.is_set():
+            raise _CampaignLeaseLost
+        await session.commit()
+
+    try:
+        draft = (
+            await session.execute(
+                select(EmailDraft.subject, EmailDraft.body, EmailDraft.variables).where(EmailDraft.id == campaign.draft_id)
+            )
+        ).one()
+        await _fail_interrupted_messages(session, campaign)
+        already_messaged = select(EmailMessage.influencer_id).where(EmailMessage.campaign_id == campaign_id)
+        influencers = (
+            await session.execute(
+                select(Influencer).where(
+                    Influencer.id.in_([uuid.UUID(str(recipient)) for recipient in campaign.recipient_ids]),
+                    Influencer.unsubscribed_at.is_(None),
+                    Influencer.id.not_in(already_messaged),
+                )
+            )
+        ).scalars().all()
+
+        campaign.started_at = campaign.started_at or datetime.now(timezone.utc)
+        await session.commit()
+
+        await EmailService().run_campaign_send(
+            session,
+            campaign,
+            influencers,
+            subject=draft.subject,
+            body=draft.body,
+            user_id=campaign.created_by or "system",
+            on_progress=persist_progress,
+            variables=draft.variables,
+        )
+        campaign.finished_at = datetime.now(timezone.utc)
+        campaign.lease_expires_at = None
+        campaign.locked_by = None
+        await session.commit()
+    except _CampaignLeaseLost:
+        # Another process has taken the campaign over; keep what this one sent and stop.
+        await _commit_finished_messages(session)
+        logger.warning("lease on campaign %s lost; stopped sending", campaign_id)
+    except Exception:
+        # Messages for sends Resend already accepted must survive the failure, with counters to match.
+        await _commit_finished_messages(session)
+        campaign.status = "failed"
+        campaign.finished_at = datetime.now(timezone.utc)
+        campaign.lease_expires_at = None
+        campaign.locked_by = None
+        await session.commit()
+        raise
+
+
+async def _fail_interrupted_messages(session: AsyncSession, campaign: EmailCampaign) -> None:
+    """Mark messages a dead sender left ``pending`` as failed, with counters to match.
+
+    Whether Resend accepted them is unknown; resending could deliver twice.
+    """
+    interrupted = (
+        await session.execute(
+            update(EmailMessage)
+            .where(EmailMessage.campaign_id == campaign.id, EmailMessage.status == "pending")
+            .values(status="failed")
+            .execution_options(synchronize_session=False)
+        )
+    ).rowcount
+    if interrupted:
+        campaign.failed_count = (campaign.failed_count or 0) + interrupted
+        await increment_campaign_stats(session, {campaign.id: Counter(failed_count=interrupted)})
+
+
+async def _commit_finished_messages(session: AsyncSession) -> None:
+    try:
+        await session.commit()
+    except Exception:
+        logger.exception("could not save the messages of a failed campaign send")
+        await session.rollback()
+
+
+async def recover_stale_campaigns(queue: CampaignSendQueue, limit: int = 10) -> list[asyncio.Task]:
+    """Claim campaigns left in ``sending`` by a process that died and resume them in the background."""
+    return [
+        asyncio.create_task(run_campaign_send(campaign_id, queue)) for campaign_id in await queue.claim_stale(limit)
+    ]
+
+
+async def recover_campaigns_forever(queue: CampaignSendQueue) -> None:
+    """Periodically resume stale campaigns; runs for the lifetime of the API process."""
+    running: set[asyncio.Task] = set()
+    while True:
+        try:
+            for task in await recover_stale_campaigns(queue):
+                running.add(task)
+                task.add_done_callback(running.discard)
+        except Exception:
+            logger.exception("recovering stale campaigns failed")
+        await asyncio.sleep(queue.settings.campaign_lease_seconds / 3)
@@ -0,0 +1,280 @@
+"""Micro-benchmarks for dedup, query parsing and the search pipeline.
+
+Run from ``backend/``::
+
+    python -m benchmarks --output bench.json
+    python -m benchmarks --sizes 1000 10000 --compare bench.json --threshold 0.2
+
+Synthetic influencer tables and raw results are generated at each size
+(default 1k/10k/100k) with a fixed seed. The pipeline benchmark runs
+``SearchService.run_search_pipeline`` against an in-memory SQLite database
+with a connector that returns pre-generated rows instead of calling
+YouTube. Results are written as JSON; ``--compare`` exits non-zero when a
+benchmark's median is slower than the baseline by more than the threshold.
+"""
+
+import argparse
+import asyncio
+import json
+import platform
+import random
+import statistics
+import sys
+import time
+import uuid
+from collections.abc import Callable
+from datetime import datetime, timezone
+from typing import Any
+
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.ext.compiler import compiles
+
+from app.database import Base
+from app.models.influencer import Influencer
+from app.models.search_task import SearchTask
+from app.services.dedup_service import DedupIndex
+from app.services.ingest_service import bulk_insert
+from app.services.search_service import SearchService
+from app.services.youtube_connector import YouTubeConnector
+
+DEFAULT_SIZES = (1_000, 10_000, 100_000)
+DEFAULT_THRESHOLD = 0.25
+# Fuzzy dedup is opt-in; benchmark it at the documented example threshold when unset.
+FUZZY_THRESHOLD = 0.5
+
+QUERY_TEMPLATES = (
+    "find {region} english youtuber less than {count} followers",
+    "{topic} channels between {low}k and {high}k subscribers",
+    "{topic} youtubers over {count} subscribers",
+    "{region} {topic} creators",
+    "{topic} reviewers with more than {low}k followers",
+)
+TOPICS = ("fitness", "cooking", "tech review", "travel vlog", "gaming", "beauty", "personal finance")
+REGIONS = ("taiwan", "japan", "singapore", "malaysia", "philippines", "usa", "uk")
+
+
+@compiles(JSONB, "sqlite")
+@compiles(ARRAY, "sqlite")
+def _compile_json_for_sqlite(_type, _compiler, **_kw) -> str:
+    return "JSON"
+
+
+def make_influencers(n: int, rng: random.Random) -> list[dict]:
+    return [
+        {
+            "id": uuid.UUID(int=rng.getrandbits(128)),
+            "platform": "youtube",
+            "platform_user_id": f"UC{i:08d}",
+            "display_name": f"Creator {i}",
+            "profile_url": f"https://www.youtube.com/@creator{i}",
+            "follower_count": rng.randint(100, 2_000_000),
+            "email": f"creator{i}@example.com" if rng.random() < 0.6 else None,
+            "saved_by": "bench",
+        }
+        for i in range(n)
+    ]
+
+
+def make_raw_results(n: int, rng: random.Random) -> list[dict]:
+    """Raw results overlapping the influencer table the way real searches do.
+
+    About a third reuse a saved channel id, a tenth only share the profile
+    URL (with a different case/trailing slash), a tenth only share the
+    email, and the rest are new channels.
+    """
+    rows = []
+    for i in range(n):
+        saved = rng.randrange(n)
+        roll = rng.random()
+        row = {
+            "platform": "youtube",
+            "platform_user_id": f"UCnew{i:08d}",
+            "display_name": f"New Creator {i}",
+            "profile_url": f"https://www.youtube.com/@newcreator{i}",
+            "follower_count": rng.randint(100, 2_000_000),
+            "email": None,
+            "extra": {"query": rng.choice(TOPICS)},
+        }
+        if roll < 0.33:
+            row["platform_user_id"] = f"UC{saved:08d}"
+        elif roll < 0.43:
+            row["profile_url"] = f"https://WWW.youtube.com/@creator{saved}/"
+        elif roll < 0.53:
+            row["email"] = f"Creator{saved}@Example.com"
+        rows.append(row)
+    return rows
+
+
+def make_queries(n: int, rng: random.Random) -> list[str]:
+    queries = []
+    for _ in range(n):
+        low = rng.randint(1, 200)
+        queries.append(
+            rng.choice(QUERY_TEMPLATES).format(
+                region=rng.choice(REGIONS),
+                topic=rng.choice(TOPICS),
+                count=rng.randint(1_000, 500_000),
+                low=low,
+                high=low + rng.randint(1, 300),
+            )
+        )
+    return queries
+
+
+class FakeYouTubeConnector(YouTubeConnector):
+    """Connector whose ``fetch`` returns fixed rows; ``fetch_and_store`` still stores them."""
+
+    def __init__(self, rows: list[dict]) -> None:
+        super().__init__()
+        self.rows = rows
+
+    async def fetch(self, queries, follower_min=None, follower_max=None, pages=1) -> list[dict[str, Any]]:
+        return self.rows
+
+
+def _time(fn: Callable[[], Any], repeat: int) -> list[float]:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - started)
+    return timings
+
+
+async def _time_pipeline(influencers: list[dict], raws: list[dict], repeat: int) -> list[float]:
+    timings = []
+    for _ in range(repeat):
+        engine = create_async_engine("sqlite+aiosqlite://")
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        session_factory = async_sessionmaker(engine, expire_on_commit=False, class_=AsyncSession)
+        async with session_factory() as session:
+            await bulk_insert(session, Influencer.__table__, influencers, 1000)
+            task = SearchTask(user_id="bench", query_raw="fitness", query_parsed={"search_queries": ["fitness"]})
+            session.add(task)
+            await session.commit()
+
+            service = SearchService()
+            service.youtube = FakeYouTubeConnector(raws)
+            started = time.perf_counter()
+            await service.run_search_pipeline(session, task)
+            await session.commit()
+            timings.append(time.perf_counter() - started)
+        await engine.dispose()
+    return timings
+
+
+def _result(timings: list[float], ops: int) -> dict:
+    median = statistics.median(timings)
+    return {
+        "median_s": median,
+        "min_s": min(timings),
+        "runs": len(timings),
+        "ops": ops,
+        "per_op_us": median / ops * 1e6 if ops else None,
+    }
+
+
+def run_suite(
+    sizes: tuple[int, ...] = DEFAULT_SIZES,
+    repeat: int = 3,
+    pipeline_repeat: int = 1,
+    seed: int = 1234,
+    log: Callable[[str], None] | None = None,
+) -> dict:
+    results: dict[str, dict] = {}
+
+    def record(name: str, timings: list[float], ops: int) -> None:
+        results[name] = _result(timings, ops)
+        if log is not None:
+            log(f"{name:<32} {results[name]['median_s'] * 1000:10.2f} ms  ({results[name]['per_op_us']:.2f} us/op)")
+
+    service = SearchService()
+    for n in sizes:
+        rng = random.Random(seed + n)
+        influencers = make_influencers(n, rng)
+        raws = make_raw_results(n, rng)
+        queries = make_queries(n, rng)
+
+        record(f"dedup_index_build[{n}]", _time(lambda: DedupIndex(influencers), repeat), n)
+        index = DedupIndex(influencers)
+        record(
+            f"dedup_index_lookup[{n}]",
+            _time(lambda: [index.lookup(raw) for raw in raws], repeat),
+            n,
+        )
+        threshold = service.settings.dedup_fuzzy_threshold or FUZZY_THRESHOLD
+        record(
+            f"fuzzy_dedup_index_build[{n}]",
+            _time(lambda: DedupIndex(influencers, fuzzy_threshold=threshold), repeat),
+            n,
+        )
+        fuzzy_index = DedupIndex(influencers, fuzzy_threshold=threshold)
+        record(f"fuzzy_dedup_match[{n}]", _time(lambda: [fuzzy_index.match(raw) for raw in raws], repeat), n)
+        record(f"parse_query[{n}]", _time(lambda: [service.parse_query({"query": q}) for q in queries], repeat), n)
+        record(
+            f"build_search_queries[{n}]",
+            _time(lambda: [service._build_search_queries(q, None) for q in queries], repeat),
+            n,
+        )
+        record(f"search_pipeline[{n}]", asyncio.run(_time_pipeline(influencers, raws, pipeline_repeat)), n)
+
+    return {
+        "meta": {
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "sizes": list(sizes),
+            "repeat": repeat,
+            "pipeline_repeat": pipeline_repeat,
+            "seed": seed,
+        },
+        "results": results,
+    }
+
+
+def compare(current: dict, baseline: dict, threshold: float = DEFAULT_THRESHOLD) -> list[dict]:
+    """Benchmarks whose median got slower than ``baseline`` by more than ``threshold`` (0.25 = 25%)."""
+    regressions = []
+    for name, result in current["results"].items():
+        before = baseline.get("results", {}).get(name)
+        if before is None or not before["median_s"]:
+            continue
+        change = result["median_s"] / before["median_s"] - 1
+        if change > threshold:
+            regressions.append(
+                {"name": name, "baseline_s": before["median_s"], "current_s": result["median_s"], "change": change}
+            )
+    return regressions
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES))
+    parser.add_argument("--repeat", type=int, default=3, help="runs per micro-benchmark (median is reported)")
+    parser.add_argument("--pipeline-repeat", type=int, default=1, help="runs per search pipeline benchmark")
+    parser.add_argument("--seed", type=int, default=1234)
+    parser.add_argument("--output", help="write results JSON to this path")
+    parser.add_argument("--compare", metavar="BASELINE", help="baseline JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="allowed slowdown, 0.25 = 25%%")
+    args = parser.parse_args(argv)
+
+    report = run_suite(tuple(args.sizes), args.repeat, args.pipeline_repeat, args.seed, log=print)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as fh:
+            json.dump(report, fh, indent=2)
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as fh:
+            baseline = json.load(fh)
+        regressions = compare(report, baseline, args.threshold)
+        for item in regressions:
+            print(
+                f"REGRESSION {item['name']}: {item['baseline_s'] * 1000:.2f} ms -> "
+                f"{item['current_s'] * 1000:.2f} ms (+{item['change']:.0%})",
+                file=sys.stderr,
+            )
+        if regressions:
+            return 1
+    return 0
@@ -0,0 +1,361 @@
+"""End-to-end load test against local stand-ins for YouTube, OpenAI and Resend.
+
+Run from ``backend/`` (the app needs a reachable ``DATABASE_URL``)::
+
+    python -m loadtest --duration 60 --concurrency 32 \\
+        --mix search=1,draft=3,campaign=1,webhook=2 \\
+        --openai latency_ms=800,jitter_ms=300,throttle_rate=0.02 \\
+        --resend latency_ms=120,error_rate=0.01
+
+The stand-in servers are started in-process. Without ``--target`` the API
+is started in-process as well, configured to call the stand-ins; with
+``--target`` an already running API is driven instead, and the settings it
+must be started with are printed. The report covers per-operation
+throughput and latency percentiles, stand-in call counts, and DB pool
+saturation sampled from ``/health/db``.
+"""
+
+import argparse
+import asyncio
+import hashlib
+import hmac
+import json
+import math
+import os
+import random
+import socket
+import sys
+import time
+import uuid
+from collections import defaultdict
+from dataclasses import dataclass, field
+
+import httpx
+import uvicorn
+from fastapi import FastAPI
+
+from loadtest.stubs import FaultConfig, openai_app, resend_app, youtube_app
+
+API_PREFIX = "/api/v1"
+WEBHOOK_SECRET = "loadtest-secret"
+SEARCH_QUERIES = (
+    "fitness youtubers",
+    "find taiwan english youtuber less than 30000 followers",
+    "cooking channels between 10k and 50k subscribers",
+    "tech review creators over 100k subscribers",
+    "japan travel vlog",
+    "personal finance youtubers",
+)
+DRAFT_GOALS = ("Invite to product launch", "Affiliate partnership", "Sponsored video", "Gifted product review")
+WEBHOOK_TYPES = ("delivered", "delivered", "opened", "opened", "replied", "bounced")
+
+
+@dataclass
+class OperationStats:
+    latencies: list[float] = field(default_factory=list)
+    errors: int = 0
+
+    def record(self, seconds: float, ok: bool) -> None:
+        self.latencies.append(seconds)
+        if not ok:
+            self.errors += 1
+
+    def summary(self, elapsed: float) -> dict:
+        ordered = sorted(self.latencies)
+        return {
+            "count": len(ordered),
+            "errors": self.errors,
+            "throughput_per_s": round(len(ordered) / elapsed, 2) if elapsed else 0.0,
+            "p50_ms": _percentile_ms(ordered, 0.50),
+            "p95_ms": _percentile_ms(ordered, 0.95),
+            "p99_ms": _percentile_ms(ordered, 0.99),
+            "max_ms": round(ordered[-1] * 1000, 1) if ordered else None,
+        }
+
+
+def _percentile_ms(ordered: list[float], q: float) -> float | None:
+    if not ordered:
+        return None
+    return round(ordered[min(len(ordered) - 1, math.ceil(q * len(ordered)) - 1)] * 1000, 1)
+
+
+def _parse_mix(spec: str) -> dict[str, float]:
+    mix = {}
+    for part in filter(None, (p.strip() for p in spec.split(","))):
+        name, _, weight = part.partition("=")
+        if name not in LoadTest.SCENARIOS:
+            raise ValueError(f"unknown scenario {name!r}; expected one of {sorted(LoadTest.SCENARIOS)}")
+        mix[name] = float(weight or 1)
+    return mix
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def _serve(app: FastAPI, port: int) -> tuple[uvicorn.Server, asyncio.Task]:
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning", lifespan="off"))
+    task = asyncio.create_task(server.serve())
+    while not server.started:
+        if task.done():
+            task.result()
+        await asyncio.sleep(0.01)
+    return server, task
+
+
+class LoadTest:
+    SCENARIOS = ("search", "draft", "campaign", "webhook")
+
+    def __init__(self, client: httpx.AsyncClient, resend_stub: FastAPI, args: argparse.Namespace) -> None:
+        self.client = client
+        self.resend_stub = resend_stub
+        self.args = args
+        self.rng = random.Random(args.seed)
+        self.stats: dict[str, OperationStats] = defaultdict(OperationStats)
+        self.influencer_ids: list[str] = []
+        self.draft_id: str | None = None
+        self.pool_samples: list[dict] = []
+
+    async def timed(self, name: str, method: str, url: str, **kwargs) -> httpx.Response | None:
+        started = time.perf_counter()
+        try:
+            resp = await self.client.request(method, url, **kwargs)
+        except httpx.HTTPError:
+            self.stats[name].record(time.perf_counter() - started, ok=False)
+            return None
+        self.stats[name].record(time.perf_counter() - started, ok=resp.is_success)
+        return resp
+
+    async def setup(self) -> None:
+        """Seed influencers and a draft through the API so every scenario has something to work on."""
+        task_id = await self.search(SEARCH_QUERIES[0])
+        if task_id is None:
+            raise RuntimeError("seed search task did not finish")
+        results = (await self.client.get(f"{API_PREFIX}/search-tasks/{task_id}/results")).json()
+        await self.client.post(
+            f"{API_PREFIX}/influencers/save",
+            json={"task_id": task_id, "selected_result_ids": [row["raw_result_id"] for row in results]},
+        )
+        self.influencer_ids = [row["id"] for row in (await self.client.get(f"{API_PREFIX}/influencers?limit=200")).json()]
+        if not self.influencer_ids:
+            raise RuntimeError("seeding saved no influencers")
+        resp = await self.client.post(
+            f"{API_PREFIX}/email-drafts/generate",
+            json={"goal": DRAFT_GOALS[0], "influencer_ids": self.influencer_ids[:1]},
+        )
+        resp.raise_for_status()
+        self.draft_id = resp.json()["id"]
+
+    async def search(self, query: str) -> str | None:
+        resp = await self.timed("search.create", "POST", f"{API_PREFIX}/search-tasks", json={"query": query})
+        if resp is None or not resp.is_success:
+            return None
+        task_id = resp.json()["task_id"]
+        started = time.perf_counter()
+        status = await self._poll(f"{API_PREFIX}/search-tasks/{task_id}", {"done", "failed"})
+        self.stats["search.complete"].record(time.perf_counter() - started, ok=status == "done")
+        return task_id if status == "done" else None
+
+    async def draft(self) -> None:
+        ids = self.rng.sample(self.influencer_ids, k=min(len(self.influencer_ids), self.rng.randint(1, 3)))
+        await self.timed(
+            "draft.generate",
+            "POST",
+            f"{API_PREFIX}/email-drafts/generate",
+            json={"goal": self.rng.choice(DRAFT_GOALS), "tone": "friendly", "influencer_ids": ids},
+        )
+
+    async def campaign(self) -> None:
+        ids = self.rng.sample(self.influencer_ids, k=min(len(self.influencer_ids), self.rng.randint(5, 20)))
+        resp = await self.timed(
+            "campaign.send",
+            "POST",
+            f"{API_PREFIX}/campaigns/send",
+            json={"draft_id": self.draft_id, "influencer_ids": ids, "send_rate_limit": 6000},
+        )
+        if resp is None or not resp.is_success:
+            return
+        started = time.perf_counter()
+        status = await self._poll(f"{API_PREFIX}/campaigns/{resp.json()['campaign_id']}", {"done", "failed"})
+        self.stats["campaign.complete"].record(time.perf_counter() - started, ok=status == "done")
+
+    async def webhook(self) -> None:
+        sent_ids = self.resend_stub.state.sent_ids
+        if not sent_ids:
+            # Nothing has been sent yet; let campaign workers get ahead instead of spinning.
+            await asyncio.sleep(0.1)
+            return
+        events = []
+        for _ in range(self.args.webhook_burst):
+            payload = {
+                "id": str(uuid.uuid4()),
+                "type": self.rng.choice(WEBHOOK_TYPES),
+                "data": {"email_id": self.rng.choice(sent_ids)},
+            }
+            body = json.dumps(payload).encode("utf-8")
+            signature = hmac.new(WEBHOOK_SECRET.encode(), body, hashlib.sha256).hexdigest()
+            events.append(
+                self.timed(
+                    "webhook.resend",
+                    "POST",
+                    f"{API_PREFIX}/webhooks/resend",
+                    content=body,
+                    headers={"content-type": "application/json", "x-resend-signature": signature},
+                )
+            )
+        await asyncio.gather(*events)
+
+    async def _poll(self, url: str, final: set[str], timeout: float = 60.0) -> str | None:
+        deadline = time.perf_counter() + timeout
+        while time.perf_counter() < deadline:
+            resp = await self.client.get(url)
+            if resp.is_success and (status := resp.json().get("status")) in final:
+                return status
+            await asyncio.sleep(0.2)
+        return None
+
+    async def sample_pool(self, stop: asyncio.Event) -> None:
+        while not stop.is_set():
+            try:
+                resp = await self.client.get("/health/db")
+                if resp.is_success:
+                    self.pool_samples.append(resp.json())
+            except httpx.HTTPError:
+                pass
+            try:
+                await asyncio.wait_for(stop.wait(), timeout=self.args.sample_interval)
+            except TimeoutError:
+                pass
+
+    async def run(self) -> float:
+        mix = _parse_mix(self.args.mix)
+        names, weights = list(mix), list(mix.values())
+        deadline = time.perf_counter() + self.args.duration
+
+        async def worker() -> None:
+            while time.perf_counter() < deadline:
+                scenario = self.rng.choices(names, weights)[0]
+                if scenario == "search":
+                    await self.search(self.rng.choice(SEARCH_QUERIES))
+                else:
+                    await getattr(self, scenario)()
+
+        stop = asyncio.Event()
+        sampler = asyncio.create_task(self.sample_pool(stop))
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(self.args.concurrency)))
+        elapsed = time.perf_counter() - started
+        stop.set()
+        await sampler
+        return elapsed
+
+    def pool_summary(self) -> dict:
+        samples = [s for s in self.pool_samples if "checked_out" in s]
+        if not samples:
+            return {"samples": len(self.pool_samples), "note": "pool occupancy is only reported for asyncpg pools"}
+        capacity = samples[-1]["pool_size"] + self.args.db_max_overflow
+        peak = max(s["checked_out"] for s in samples)
+        first_wait, last_wait = samples[0]["checkout_wait_seconds"], samples[-1]["checkout_wait_seconds"]
+        waits = last_wait["count"] - first_wait["count"]
+        slow_waits = waits - _bucket_delta(first_wait, last_wait, 0.01)
+        return {
+            "samples": len(samples),
+            "peak_checked_out": peak,
+            "mean_checked_out": round(sum(s["checked_out"] for s in samples) / len(samples), 2),
+            "peak_utilization": round(peak / capacity, 3) if capacity else None,
+            "saturated_samples": sum(1 for s in samples if s["checked_out"] >= capacity),
+            "peak_overflow": max(s["overflow"] for s in samples),
+            "checkouts": waits,
+            "mean_checkout_wait_ms": round((last_wait["sum"] - first_wait["sum"]) / waits * 1000, 3) if waits else 0.0,
+            "checkouts_waiting_over_10ms": slow_waits,
+        }
+
+
+def _bucket_delta(before: dict, after: dict, bound: float) -> int:
+    def at(snapshot: dict) -> int:
+        return next((count for le, count in snapshot["buckets"] if le != "+Inf" and le >= bound), snapshot["count"])
+
+    return at(after) - at(before)
+
+
+def _service_env(youtube_port: int, openai_port: int, resend_port: int) -> dict[str, str]:
+    return {
+        "YOUTUBE_API_KEY": "loadtest",
+        "YOUTUBE_API_BASE_URL": f"http://127.0.0.1:{youtube_port}/youtube/v3",
+        "OPENAI_API_KEY": "sk-loadtest",
+        "OPENAI_BASE_URL": f"http://127.0.0.1:{openai_port}/v1",
+        "RESEND_API_KEY": "re_loadtest",
+        "RESEND_API_URL": f"http://127.0.0.1:{resend_port}",
+        "RESEND_WEBHOOK_SECRET": WEBHOOK_SECRET,
+        "SEARCH_TASK_EXECUTOR": "background",
+    }
+
+
+async def run(args: argparse.Namespace) -> dict:
+    stubs = {
+        "youtube": youtube_app(FaultConfig.parse(args.youtube), seed=args.seed),
+        "openai": openai_app(FaultConfig.parse(args.openai), seed=args.seed),
+        "resend": resend_app(FaultConfig.parse(args.resend), seed=args.seed),
+    }
+    ports = {name: _free_port() for name in stubs}
+    servers = [await _serve(app, ports[name]) for name, app in stubs.items()]
+    env = _service_env(ports["youtube"], ports["openai"], ports["resend"])
+
+    target = args.target
+    if target is None:
+        # Settings are read once at import, so the environment must be in place before the app is loaded.
+        os.environ.update(env)
+        from app.main import app as api
+
+        api_port = _free_port()
+        servers.append(await _serve(api, api_port))
+        target = f"http://127.0.0.1:{api_port}"
+    else:
+        print("Start the API with:", " ".join(f"{k}={v}" for k, v in env.items()), file=sys.stderr)
+
+    try:
+        limits = httpx.Limits(max_connections=args.concurrency * args.webhook_burst)
+        async with httpx.AsyncClient(base_url=target, timeout=60, limits=limits) as client:
+            load = LoadTest(client, stubs["resend"], args)
+            await load.setup()
+            elapsed = await load.run()
+    finally:
+        for server, task in servers:
+            server.should_exit = True
+            await task
+
+    return {
+        "duration_s": round(elapsed, 2),
+        "concurrency": args.concurrency,
+        "mix": _parse_mix(args.mix),
+        "operations": {name: stats.summary(elapsed) for name, stats in sorted(load.stats.items())},
+        "stand_ins": {name: app.state.stub.stats() for name, app in stubs.items()},
+        "db_pool": load.pool_summary(),
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m loadtest", description=__doc__.splitlines()[0])
+    parser.add_argument("--target", help="base URL of a running API; default starts one in-process")
+    parser.add_argument("--duration", type=float, default=30.0, help="seconds of load after seeding")
+    parser.add_argument("--concurrency", type=int, default=16, help="concurrent virtual users")
+    parser.add_argument("--mix", default="search=1,draft=3,campaign=1,webhook=2", help="scenario weights")
+    parser.add_argument("--webhook-burst", type=int, default=20, help="concurrent webhook posts per burst")
+    parser.add_argument("--youtube", default="latency_ms=60,jitter_ms=30", help="YouTube stand-in faults")
+    parser.add_argument("--openai", default="latency_ms=600,jitter_ms=300", help="OpenAI stand-in faults")
+    parser.add_argument("--resend", default="latency_ms=100,jitter_ms=50", help="Resend stand-in faults")
+    parser.add_argument("--sample-interval", type=float, default=0.5, help="seconds between /health/db samples")
+    parser.add_argument("--db-max-overflow", type=int, default=int(os.environ.get("DB_MAX_OVERFLOW", 20)))
+    parser.add_argument("--seed", type=int, default=1234)
+    parser.add_argument("--output", help="write the report JSON to this path")
+    args = parser.parse_args(argv)
+
+    report = asyncio.run(run(args))
+    text = json.dumps(report, indent=2)
+    print(text)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as fh:
+            fh.write(text)
+    return 0
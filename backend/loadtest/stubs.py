@@ -0,0 +1,183 @@
+"""Local stand-ins for the YouTube Data API, OpenAI chat completions and Resend.
+
+Each stand-in is a small FastAPI app with injectable faults (latency,
+jitter, 5xx error rate and 429 rate) so the service can be load-tested
+without spending real quota. Responses follow the shapes the connectors
+read, nothing more.
+"""
+
+import asyncio
+import hashlib
+import json
+import random
+import time
+import uuid
+from dataclasses import dataclass, fields
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+
+TOPIC_WORDS = ("fitness", "cooking", "tech", "travel", "gaming", "beauty", "finance", "music", "diy", "pets")
+
+
+@dataclass
+class FaultConfig:
+    latency_ms: float = 0.0
+    jitter_ms: float = 0.0
+    error_rate: float = 0.0
+    throttle_rate: float = 0.0
+
+    @classmethod
+    def parse(cls, spec: str) -> "FaultConfig":
+        """Parse ``latency_ms=80,jitter_ms=20,error_rate=0.01,throttle_rate=0.02``."""
+        names = {f.name for f in fields(cls)}
+        values: dict[str, float] = {}
+        for part in filter(None, (p.strip() for p in spec.split(","))):
+            name, _, raw = part.partition("=")
+            if name not in names:
+                raise ValueError(f"unknown fault setting {name!r}; expected one of {sorted(names)}")
+            values[name] = float(raw)
+        return cls(**values)
+
+
+class StubState:
+    def __init__(self, faults: FaultConfig, seed: int = 0) -> None:
+        self.faults = faults
+        self.rng = random.Random(seed)
+        self.requests = 0
+        self.errors = 0
+        self.throttled = 0
+
+    async def inject(self) -> Response | None:
+        """Sleep for the configured latency, then maybe fail with a 429 or 500."""
+        self.requests += 1
+        delay = self.faults.latency_ms + self.rng.uniform(-1, 1) * self.faults.jitter_ms
+        if delay > 0:
+            await asyncio.sleep(delay / 1000)
+        roll = self.rng.random()
+        if roll < self.faults.throttle_rate:
+            self.throttled += 1
+            return JSONResponse({"error": {"message": "rate limited"}}, status_code=429, headers={"Retry-After": "1"})
+        if roll < self.faults.throttle_rate + self.faults.error_rate:
+            self.errors += 1
+            return JSONResponse({"error": {"message": "injected failure"}}, status_code=500)
+        return None
+
+    def stats(self) -> dict:
+        return {"requests": self.requests, "errors": self.errors, "throttled": self.throttled}
+
+
+def _channel_ids(query: str, page: int, per_page: int) -> list[str]:
+    # Deterministic per query so repeated searches overlap and exercise dedup.
+    digest = hashlib.sha1(query.lower().encode("utf-8")).hexdigest()[:8]
+    return [f"UC{digest}{page:02d}{i:02d}" for i in range(per_page)]
+
+
+def youtube_app(faults: FaultConfig, pages_per_query: int = 2, seed: int = 0) -> FastAPI:
+    app = FastAPI()
+    state = app.state.stub = StubState(faults, seed)
+
+    @app.get("/youtube/v3/search")
+    async def search(q: str, maxResults: int = 25, pageToken: str | None = None) -> Response:
+        if (failure := await state.inject()) is not None:
+            return failure
+        page = int(pageToken or 0)
+        body: dict = {"items": [{"snippet": {"channelId": cid}} for cid in _channel_ids(q, page, maxResults)]}
+        if page + 1 < pages_per_query:
+            body["nextPageToken"] = str(page + 1)
+        return JSONResponse(body)
+
+    @app.get("/youtube/v3/channels")
+    async def channels(id: str) -> Response:
+        if (failure := await state.inject()) is not None:
+            return failure
+        items = []
+        for channel_id in filter(None, id.split(",")):
+            rng = random.Random(channel_id)
+            topic = rng.choice(TOPIC_WORDS)
+            description = f"{topic.title()} videos every week."
+            if rng.random() < 0.7:
+                description += f" Business: {channel_id.lower()}@creators.example.com"
+            items.append(
+                {
+                    "id": channel_id,
+                    "snippet": {
+                        "title": f"{topic.title()} Creator {channel_id[-6:]}",
+                        "description": description,
+                        "customUrl": f"@{channel_id.lower()}",
+                    },
+                    "statistics": {"subscriberCount": str(rng.randint(500, 2_000_000))},
+                }
+            )
+        return JSONResponse({"items": items})
+
+    return app
+
+
+def openai_app(faults: FaultConfig, stream_chunk_chars: int = 12, seed: int = 0) -> FastAPI:
+    app = FastAPI()
+    state = app.state.stub = StubState(faults, seed)
+
+    @app.post("/v1/chat/completions")
+    async def chat_completions(request: Request) -> Response:
+        if (failure := await state.inject()) is not None:
+            return failure
+        body = await request.json()
+        model = body.get("model", "gpt-4o-mini")
+        content = json.dumps(
+            {
+                "subject": "Collaboration opportunity",
+                "body": "Hello {{name}},\n\nWe love your channel and would like to work together.\n\nBest,\nTeam",
+                "variables": {"name": "influencer_name"},
+            }
+        )
+        completion_id = f"chatcmpl-{uuid.uuid4().hex[:12]}"
+        created = int(time.time())
+        if not body.get("stream"):
+            return JSONResponse(
+                {
+                    "id": completion_id,
+                    "object": "chat.completion",
+                    "created": created,
+                    "model": model,
+                    "choices": [
+                        {"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}
+                    ],
+                    "usage": {"prompt_tokens": 200, "completion_tokens": 80, "total_tokens": 280},
+                }
+            )
+
+        async def chunks():
+            for start in range(0, len(content), stream_chunk_chars):
+                delta = {"content": content[start : start + stream_chunk_chars]}
+                chunk = {
+                    "id": completion_id,
+                    "object": "chat.completion.chunk",
+                    "created": created,
+                    "model": model,
+                    "choices": [{"index": 0, "delta": delta, "finish_reason": None}],
+                }
+                yield f"data: {json.dumps(chunk)}\n\n"
+                await asyncio.sleep(0)
+            yield "data: [DONE]\n\n"
+
+        return StreamingResponse(chunks(), media_type="text/event-stream")
+
+    return app
+
+
+def resend_app(faults: FaultConfig, seed: int = 0) -> FastAPI:
+    """Resend ``POST /emails``; accepted message ids are kept for webhook bursts."""
+    app = FastAPI()
+    state = app.state.stub = StubState(faults, seed)
+    app.state.sent_ids = []
+
+    @app.post("/emails")
+    async def send_email() -> Response:
+        if (failure := await state.inject()) is not None:
+            return failure
+        message_id = str(uuid.uuid4())
+        app.state.sent_ids.append(message_id)
+        return JSONResponse({"id": message_id})
+
+    return app
@@ -1,10 +1,38 @@
 import os
+from collections.abc import AsyncGenerator
 
 import pytest
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.ext.compiler import compiles
 
 os.environ["DATABASE_URL"] = "sqlite+aiosqlite:///./test.db"
 
 
+@compiles(JSONB, "sqlite")
+@compiles(ARRAY, "sqlite")
+def _compile_json_for_sqlite(_type, _compiler, **_kw) -> str:
+    return "JSON"
+
+
+@pytest.fixture
+async def sqlite_session_factory() -> AsyncGenerator[async_sessionmaker[AsyncSession], None]:
+    from app.database import Base
+    import app.models  # noqa: F401
+
+    engine = create_async_engine("sqlite+aiosqlite://")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    yield async_sessionmaker(engine, expire_on_commit=False, class_=AsyncSession)
+    await engine.dispose()
+
+
+@pytest.fixture
+async def sqlite_session(sqlite_session_factory) -> AsyncGenerator[AsyncSession, None]:
+    async with sqlite_session_factory() as session:
+        yield session
+
+
 @pytest.fixture
 def sample_existing_influencers() -> list[dict]:
     return [
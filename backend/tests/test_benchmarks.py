@@ -0,0 +1,22 @@
+from benchmarks.suite import compare, run_suite
+
+
+def test_benchmark_suite_smoke_run_and_regression_compare() -> None:
+    report = run_suite(sizes=(50,), repeat=1)
+
+    assert set(report["results"]) == {
+        "dedup_index_build[50]",
+        "dedup_index_lookup[50]",
+        "fuzzy_dedup_index_build[50]",
+        "fuzzy_dedup_match[50]",
+        "parse_query[50]",
+        "build_search_queries[50]",
+        "search_pipeline[50]",
+    }
+    assert compare(report, report, threshold=0.0) == []
+
+    faster_baseline = {
+        "results": {name: {**result, "median_s": result["median_s"] / 2} for name, result in report["results"].items()}
+    }
+    regressed = compare(report, faster_baseline, threshold=0.5)
+    assert {item["name"] for item in regressed} == set(report["results"])
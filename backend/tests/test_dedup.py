@@ -1,4 +1,15 @@
-from app.services.dedup_service import compute_dedup_status, normalize_profile_url
+import random
+import string
+
+from app.services.dedup_service import (
+    DedupIndex,
+    TrigramIndex,
+    collect_candidate_keys,
+    compute_dedup_status,
+    name_trigrams,
+    normalize_profile_url,
+    trigram_similarity,
+)
 
 
 def test_normalize_profile_url() -> None:
@@ -31,3 +42,135 @@ def test_dedup_by_email(sample_existing_influencers) -> None:
     }
     status, _ = compute_dedup_status(raw, sample_existing_influencers)
     assert status == "duplicate_email"
+
+
+def test_dedup_index_matches_linear_priority(sample_existing_influencers) -> None:
+    existing = sample_existing_influencers + [
+        {
+            "id": "22222222-2222-2222-2222-222222222222",
+            "platform": "youtube",
+            "platform_user_id": "def456",
+            "display_name": "Creator Two",
+            "profile_url": "https://WWW.YOUTUBE.COM/@creatortwo/",
+            "follower_count": 5000,
+            "email": None,
+        },
+        {
+            "id": "33333333-3333-3333-3333-333333333333",
+            "platform": "youtube",
+            "platform_user_id": "ghi789",
+            "display_name": "Creator Two",
+            "profile_url": "https://www.youtube.com/@creatortwo-alt",
+            "follower_count": 8000,
+            "email": None,
+        },
+    ]
+    index = DedupIndex(existing)
+
+    by_url = {"platform": "youtube", "platform_user_id": "x", "display_name": "n", "profile_url": "https://www.youtube.com/@creatortwo?si=1"}
+    weak = {"platform": "youtube", "platform_user_id": "y", "display_name": " creator two ", "profile_url": "https://www.youtube.com/@new", "follower_count": 9000}
+    unique = {"platform": "youtube", "platform_user_id": "z", "display_name": "Nobody", "profile_url": "https://www.youtube.com/@nobody", "follower_count": 9000}
+
+    assert index.lookup(by_url) == ("duplicate_url", "22222222-2222-2222-2222-222222222222")
+    assert index.lookup(weak) == ("weak_match", "22222222-2222-2222-2222-222222222222")
+    assert index.lookup(unique) == ("unique", None)
+    for raw in (by_url, weak, unique):
+        assert compute_dedup_status(raw, existing) == index.lookup(raw)
+
+
+def test_collect_candidate_keys() -> None:
+    keys = collect_candidate_keys(
+        [
+            {
+                "platform": "youtube",
+                "platform_user_id": "abc123",
+                "display_name": " Creator One ",
+                "profile_url": "https://WWW.youtube.com/@creatorone/?si=1",
+                "email": "Creator1@Example.com",
+            }
+        ]
+    )
+    assert keys["platform_ids"] == {("youtube", "abc123")}
+    assert keys["profile_urls"] == {"https://www.youtube.com/@creatorone"}
+    assert keys["emails"] == {"creator1@example.com"}
+    assert keys["display_names"] == {("youtube", "creator one")}
+
+
+def test_trigram_index_matches_full_scan_ranking() -> None:
+    rng = random.Random(7)
+    words = ["tech", "tips", "tw", "taiwan", "daily", "fit", "cook", "studio", "official", "vlog"]
+    names = [" ".join(rng.sample(words, rng.randint(1, 3))) + rng.choice(["", " 2", "HQ"]) for _ in range(300)]
+    index = TrigramIndex()
+    for position, name in enumerate(names):
+        index.add(name, {"position": position})
+
+    for query in ("TechTips Taiwan", "daily fit vlog", "Cook Studio HQ", "zz"):
+        for threshold in (0.3, 0.5, 0.8):
+            expected = sorted(
+                (
+                    (score, position)
+                    for position, name in enumerate(names)
+                    if (score := trigram_similarity(query, name)) >= threshold
+                ),
+                key=lambda entry: (-entry[0], entry[1]),
+            )
+            found = [(score, item["position"]) for score, item in index.search(query, threshold)]
+            assert found == expected
+
+
+def test_trigram_index_keeps_matches_on_float_rounded_size_bounds() -> None:
+    # 33 query trigrams against 60 candidate trigrams, all 33 shared: exactly 0.55,
+    # while 33 / 0.55 evaluates to 59.999...
+    query = (string.ascii_lowercase + string.digits)[:32]
+    candidate = query + "αβγδεζηθικλμνξοπρστυφχψωϊ" + query[-2:]
+    assert (len(name_trigrams(query)), len(name_trigrams(candidate))) == (33, 60)
+    assert trigram_similarity(query, candidate) >= 0.55
+    # ... and 0.55 * 60 evaluates just above 33, for the search in the other direction.
+    index = TrigramIndex()
+    index.add(candidate, {"id": "candidate"})
+    index.add(query, {"id": "query"})
+
+    assert [item["id"] for _, item in index.search(query, 0.55)] == ["query", "candidate"]
+    assert [item["id"] for _, item in index.search(candidate, 0.55)] == ["candidate", "query"]
+
+
+def test_trigram_similarity_matches_pg_trgm_similarity() -> None:
+    # Values of Postgres similarity() for the same compact names.
+    assert trigram_similarity("xabcd", "yabcd") == 3 / 9
+    assert trigram_similarity("TechTips", "KTechTips") == 7 / 12
+    assert trigram_similarity("Cook Studio", "Book Studio") == 8 / 14
+    assert trigram_similarity("ab", "AB!") == 1.0
+    assert trigram_similarity("a", "") == 0.0
+
+
+def test_dedup_index_fuzzy_weak_match_scores_similar_names() -> None:
+    existing = [
+        {
+            "id": "44444444-4444-4444-4444-444444444444",
+            "platform": "youtube",
+            "platform_user_id": "tt-1",
+            "display_name": "Tech Tips TW",
+            "profile_url": "https://www.youtube.com/@techtipstw",
+            "follower_count": 42000,
+            "email": None,
+        }
+    ]
+    raw = {
+        "platform": "youtube",
+        "platform_user_id": "tt-2",
+        "display_name": "TechTips Taiwan",
+        "profile_url": "https://www.youtube.com/@techtipstaiwan",
+        "follower_count": 61000,
+    }
+
+    assert trigram_similarity("Tech Tips TW", "TechTips Taiwan") == 9 / 17
+    assert DedupIndex(existing).match(raw) == ("unique", None, None)
+    assert DedupIndex(existing, fuzzy_threshold=0.5).match(raw) == ("weak_match", existing[0]["id"], round(9 / 17, 4))
+    assert DedupIndex(existing, fuzzy_threshold=0.6).match(raw).status == "unique"
+    # Fuzzy matches still require the same follower bucket.
+    assert DedupIndex(existing, fuzzy_threshold=0.5).match({**raw, "follower_count": 500_000}).status == "unique"
+    assert DedupIndex(existing, fuzzy_threshold=0.5).match({**raw, "platform_user_id": "tt-1"}) == (
+        "duplicate_platform",
+        existing[0]["id"],
+        1.0,
+    )
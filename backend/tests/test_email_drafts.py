@@ -1,7 +1,17 @@
+import asyncio
+import json
+import uuid
+from types import SimpleNamespace
+
 import pytest
 
+from app.api.v1 import email_drafts
 from app.config import get_settings
-from app.services.ai_service import AIService
+from app.models.influencer import Influencer
+from app.schemas.email_draft import GenerateEmailDraftBatchRequest
+from app.services.ai_service import AIService, BatchDraft
+from app.services.draft_cache import DraftCache
+from app.services.json_field_stream import JsonFieldStream
 
 
 @pytest.mark.asyncio
@@ -19,3 +29,234 @@ async def test_ai_service_fallback_when_no_key(monkeypatch) -> None:
     assert "subject" in result
     assert "body" in result
     assert isinstance(result.get("variables"), dict)
+
+
+class _FakeCompletions:
+    def __init__(self) -> None:
+        self.calls = 0
+        self.release = asyncio.Event()
+
+    async def create(self, **kwargs):
+        self.calls += 1
+        await self.release.wait()
+        content = json.dumps({"subject": f"Hi #{self.calls}", "body": "Hello {{name}}", "variables": {"name": "display_name"}})
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+
+
+@pytest.mark.asyncio
+async def test_ai_service_memoizes_and_coalesces_identical_prompts() -> None:
+    service = AIService(cache=DraftCache(max_entries=10, ttl_seconds=60))
+    completions = _FakeCompletions()
+    service.client = SimpleNamespace(chat=SimpleNamespace(completions=completions))
+
+    context = {"influencers": [{"id": "1", "name": "A", "platform": "youtube", "followers": 10}]}
+    reordered = {"influencers": [{"followers": 10, "platform": "youtube", "name": "A", "id": "1"}]}
+    concurrent = [
+        asyncio.create_task(service.generate_email_draft("Partner", "friendly", "en", context=ctx))
+        for ctx in (context, reordered, context)
+    ]
+    await asyncio.sleep(0)
+    completions.release.set()
+    first, second, third = await asyncio.gather(*concurrent)
+    cached = await service.generate_email_draft("Partner", "friendly", "en", context=reordered)
+    other = await service.generate_email_draft("Partner", "formal", "en", context=context)
+
+    assert completions.calls == 2
+    assert first == second == third == cached
+    assert other["subject"] == "Hi #2"
+    first["variables"]["name"] = "mutated"
+    assert service.cache.stats() == {"hits": 1, "misses": 2, "coalesced": 2, "hit_ratio": 0.6, "size": 2}
+    assert (await service.generate_email_draft("Partner", "friendly", "en", context=context))["variables"] == {
+        "name": "display_name"
+    }
+
+
+@pytest.mark.asyncio
+async def test_batch_drafts_stream_in_completion_order_under_concurrency_limit(monkeypatch) -> None:
+    service = AIService(cache=DraftCache(max_entries=100, ttl_seconds=60))
+    monkeypatch.setattr(service.settings, "ai_batch_concurrency", 3)
+    active = 0
+    peak = 0
+
+    async def create(**kwargs):
+        nonlocal active, peak
+        name = json.loads(kwargs["messages"][1]["content"])["context"]["influencers"][0]["name"]
+        active += 1
+        peak = max(peak, active)
+        await asyncio.sleep(0.01 * (5 - int(name)))
+        active -= 1
+        if name == "2":
+            raise RuntimeError("upstream timeout")
+        content = json.dumps({"subject": f"Hi {name}", "body": "b", "variables": {}})
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+
+    service.client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+    contexts = [{"influencers": [{"id": str(idx), "name": str(idx)}]} for idx in range(5)]
+
+    results = [result async for result in service.generate_email_drafts("Partner", "friendly", "en", contexts)]
+
+    assert peak == 3
+    assert sorted(result.index for result in results) == [0, 1, 2, 3, 4]
+    assert [result.index for result in results[:2]] == [2, 1]
+    assert results[0].error == "upstream timeout"
+    assert results[1].draft["subject"] == "Hi 1"
+
+
+def test_json_field_stream_decodes_fields_split_across_chunks() -> None:
+    raw = json.dumps(
+        {"variables": {"subject": "nested"}, "subject": 'Hi "A" 😀', "note": "x", "body": "Line 1\nLine 2 é"},
+        ensure_ascii=True,
+    )
+    stream = JsonFieldStream(("subject", "body"))
+    pieces = [piece for index in range(0, len(raw), 3) for piece in stream.feed(raw[index : index + 3])]
+
+    assert "".join(text for field, text in pieces if field == "subject") == 'Hi "A" 😀'
+    assert "".join(text for field, text in pieces if field == "body") == "Line 1\nLine 2 é"
+
+
+@pytest.mark.asyncio
+async def test_stream_email_draft_mock_and_streamed_completion() -> None:
+    service = AIService(cache=DraftCache(max_entries=10, ttl_seconds=60))
+    service.client = None
+    mock = [delta async for delta in service.stream_email_draft("Partner", "friendly", "en", context={})]
+    assert "".join(delta.text for delta in mock if delta.field == "body") == mock[-1].draft["body"]
+    assert mock[-1].field == "done" and len(mock) > 3
+
+    payload = json.dumps({"subject": "Hello there", "body": "Hi {{name}},\nLet's talk.", "variables": {"name": "display_name"}})
+
+    async def chunks():
+        for index in range(0, len(payload), 5):
+            yield SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=payload[index : index + 5]))])
+
+    calls = 0
+
+    async def create(**kwargs):
+        nonlocal calls
+        calls += 1
+        assert kwargs["stream"] is True
+        return chunks()
+
+    service.client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+    streamed = [delta async for delta in service.stream_email_draft("Partner", "friendly", "en", context={})]
+    replayed = [delta async for delta in service.stream_email_draft("Partner", "friendly", "en", context={})]
+
+    assert "".join(delta.text for delta in streamed if delta.field == "subject") == "Hello there"
+    assert "".join(delta.text for delta in streamed if delta.field == "body") == "Hi {{name}},\nLet's talk."
+    assert streamed[-1].draft == {"subject": "Hello there", "body": "Hi {{name}},\nLet's talk.", "variables": {"name": "display_name"}}
+    assert replayed[-1].draft == streamed[-1].draft
+    assert calls == 1
+
+
+@pytest.mark.asyncio
+async def test_draft_cache_follower_survives_leader_cancellation() -> None:
+    cache = DraftCache(max_entries=10, ttl_seconds=60)
+    release = asyncio.Event()
+    upstream_cancelled = False
+
+    async def factory() -> dict:
+        nonlocal upstream_cancelled
+        try:
+            await release.wait()
+        except asyncio.CancelledError:
+            upstream_cancelled = True
+            raise
+        return {"subject": "Hi"}
+
+    leader = asyncio.create_task(cache.get_or_create("key", factory))
+    await asyncio.sleep(0)
+    follower = asyncio.create_task(cache.get_or_create("key", factory))
+    await asyncio.sleep(0)
+    leader.cancel()
+    await asyncio.sleep(0)
+    release.set()
+
+    assert await follower == {"subject": "Hi"}
+    assert leader.cancelled() and not upstream_cancelled
+    assert cache.get("key") == {"subject": "Hi"}
+
+    release.clear()
+    lone = asyncio.create_task(cache.get_or_create("other", factory))
+    await asyncio.sleep(0)
+    lone.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await lone
+    await asyncio.sleep(0)
+    assert upstream_cancelled and cache.stats()["size"] == 1
+
+
+def _fake_draft_store(monkeypatch) -> tuple[type, set]:
+    """Session factory and bulk_insert stand-ins that record which draft ids were committed."""
+    pending: list = []
+    committed: set = set()
+
+    async def fake_bulk_insert(session, table, rows, batch_size) -> None:
+        pending.extend(row["id"] for row in rows)
+
+    class FakeSession:
+        async def __aenter__(self):
+            return self
+
+        async def __aexit__(self, *exc_info) -> None:
+            pending.clear()
+
+        async def commit(self) -> None:
+            committed.update(pending)
+            pending.clear()
+
+    monkeypatch.setattr(email_drafts, "bulk_insert", fake_bulk_insert)
+    return FakeSession, committed
+
+
+def _batch_request(count: int) -> tuple[GenerateEmailDraftBatchRequest, list[Influencer]]:
+    influencers = [
+        Influencer(id=uuid.uuid4(), platform="youtube", platform_user_id=str(idx), display_name=f"Creator {idx}")
+        for idx in range(count)
+    ]
+    body = GenerateEmailDraftBatchRequest(
+        goal="Partner", tone="friendly", language="en", influencer_ids=[influencer.id for influencer in influencers]
+    )
+    return body, influencers
+
+
+@pytest.mark.asyncio
+async def test_batch_draft_ids_are_committed_before_they_are_streamed(monkeypatch) -> None:
+    service = AIService(cache=DraftCache(max_entries=10, ttl_seconds=60))
+    service.client = None
+    monkeypatch.setattr(service.settings, "ai_draft_insert_batch_size", 2)
+    session_factory, committed = _fake_draft_store(monkeypatch)
+    body, influencers = _batch_request(3)
+
+    stream = email_drafts._generate_and_store_drafts(service, session_factory, body, influencers)
+    first = json.loads(await anext(stream))
+    assert uuid.UUID(first["draft_id"]) in committed
+    await stream.aclose()
+
+    streamed = [json.loads(line) async for line in email_drafts._generate_and_store_drafts(service, session_factory, body, influencers)]
+    assert len(streamed) == 3
+    assert all(uuid.UUID(item["draft_id"]) in committed for item in streamed)
+
+
+@pytest.mark.asyncio
+async def test_batch_drafts_stream_as_they_finish_without_waiting_for_a_full_batch(monkeypatch) -> None:
+    service = AIService(cache=DraftCache(max_entries=10, ttl_seconds=60))
+    monkeypatch.setattr(service.settings, "ai_draft_insert_batch_size", 50)
+    session_factory, committed = _fake_draft_store(monkeypatch)
+    body, influencers = _batch_request(3)
+    last_draft = asyncio.Event()
+
+    async def generate_email_drafts(*_args):
+        yield BatchDraft(0, {"subject": "Hi 0", "body": "b", "variables": {}})
+        yield BatchDraft(1, None, "upstream timeout")
+        await last_draft.wait()
+        yield BatchDraft(2, {"subject": "Hi 2", "body": "b", "variables": {}})
+
+    monkeypatch.setattr(service, "generate_email_drafts", generate_email_drafts)
+    stream = email_drafts._generate_and_store_drafts(service, session_factory, body, influencers)
+
+    error = json.loads(await anext(stream))
+    first = json.loads(await anext(stream))
+    assert error == {"influencer_id": str(influencers[1].id), "error": "upstream timeout"}
+    assert first["subject"] == "Hi 0" and uuid.UUID(first["draft_id"]) in committed
+    last_draft.set()
+    rest = [json.loads(line) async for line in stream]
+    assert [item["subject"] for item in rest] == ["Hi 2"]
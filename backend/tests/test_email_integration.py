@@ -1,18 +1,30 @@
 import asyncio
+import json
 import uuid
 from collections.abc import AsyncGenerator
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
 
 import pytest
 from httpx import ASGITransport, AsyncClient
 
-from app.api.deps import get_db
+from sqlalchemy import select, text
+
+from app.api.deps import get_db, get_session_factory, get_webhook_batcher
 from app.config import get_settings
 from app.main import app
 from app.models.email_campaign import EmailCampaign
 from app.models.email_event import EmailEvent
 from app.models.email_message import EmailMessage
 from app.models.influencer import Influencer
+from app.models.send_quota import SendQuotaLedger
+from app.services import email_service as email_service_module
+from app.services.campaign_stats_service import get_campaign_stats
 from app.services.email_service import EmailService
+from app.services.job_queue import CampaignSendQueue
+from app.services.send_quota import QuotaReservation, SendQuota
+from app.services.webhook_batcher import WebhookBatcher
+from app.workers import tasks as worker_tasks
 
 
 class _ResultStub:
@@ -26,49 +38,19 @@ class _ResultStub:
         return self._one
 
 
-class FakeWebhookDB:
-    def __init__(self) -> None:
-        self.events_by_provider_id: dict[str, EmailEvent] = {}
-        self.messages_by_provider_message_id: dict[str, EmailMessage] = {}
-        msg = EmailMessage(
-            id=uuid.uuid4(),
-            campaign_id=uuid.uuid4(),
-            influencer_id=uuid.uuid4(),
-            to_email="creator@example.com",
-            subject="hello",
-            body="hello body",
-            status="sent",
-            provider_message_id="provider-msg-1",
-        )
-        self.messages_by_provider_message_id[msg.provider_message_id or ""] = msg
-
-    async def execute(self, statement):
-        params = statement.compile().params
-        param_values = list(params.values())
-        sql = str(statement)
-        if "FROM email_events" in sql:
-            provider_event_id = str(param_values[0]) if param_values else ""
-            return _ResultStub(self.events_by_provider_id.get(provider_event_id))
-        if "FROM email_messages" in sql:
-            provider_message_id = str(param_values[0]) if param_values else ""
-            return _ResultStub(self.messages_by_provider_message_id.get(provider_message_id))
-        return _ResultStub(None)
-
-    def add(self, obj):
-        if isinstance(obj, EmailEvent) and obj.provider_event_id:
-            self.events_by_provider_id[obj.provider_event_id] = obj
-
-    async def commit(self):
-        return None
+class _BindStub:
+    dialect = SimpleNamespace(name="postgresql")
 
 
 class FakeCampaignDB:
-    def __init__(self, today_sent: int = 0) -> None:
-        self.today_sent = today_sent
+    def __init__(self) -> None:
         self.added = []
 
+    def get_bind(self):
+        return _BindStub()
+
     async def execute(self, _statement):
-        return _ResultStub(self.today_sent)
+        return _ResultStub()
 
     def add(self, obj):
         self.added.append(obj)
@@ -77,14 +59,26 @@ class FakeCampaignDB:
         return None
 
 
-@pytest.mark.asyncio
-async def test_webhook_idempotency() -> None:
-    fake_db = FakeWebhookDB()
+async def _seed_sent_message(session_factory, provider_message_id: str = "provider-msg-1") -> EmailMessage:
+    async with session_factory() as session:
+        msg = EmailMessage(
+            campaign_id=uuid.uuid4(),
+            influencer_id=uuid.uuid4(),
+            to_email="creator@example.com",
+            subject="hello",
+            body="hello body",
+            status="sent",
+            provider_message_id=provider_message_id,
+        )
+        session.add(msg)
+        await session.commit()
+        return msg
 
-    async def override_db() -> AsyncGenerator[FakeWebhookDB, None]:
-        yield fake_db
 
-    app.dependency_overrides[get_db] = override_db
+@pytest.mark.asyncio
+async def test_webhook_idempotency(sqlite_session_factory) -> None:
+    await _seed_sent_message(sqlite_session_factory)
+    app.dependency_overrides[get_webhook_batcher] = lambda: WebhookBatcher(sqlite_session_factory)
 
     payload = {
         "id": "evt-1",
@@ -106,16 +100,72 @@ async def test_webhook_idempotency() -> None:
 
 
 @pytest.mark.asyncio
-async def test_send_campaign_respects_daily_limit_and_rate(monkeypatch) -> None:
-    service = EmailService()
-    service.settings.daily_send_limit = 1
+async def test_webhook_batcher_stores_concurrent_events_in_one_batch(sqlite_session_factory) -> None:
+    message = await _seed_sent_message(sqlite_session_factory)
+    batcher = WebhookBatcher(sqlite_session_factory)
+    calls: list[int] = []
+    process = batcher.service.process_webhook_events
+
+    async def counting_process(db, payloads):
+        calls.append(len(payloads))
+        return await process(db, payloads)
+
+    batcher.service.process_webhook_events = counting_process
+    payloads = [
+        {"id": "evt-1", "type": "delivered", "data": {"email_id": "provider-msg-1"}},
+        {"id": "evt-1", "type": "delivered", "data": {"email_id": "provider-msg-1"}},
+        {"id": "evt-2", "type": "opened", "data": {"email_id": "provider-msg-1"}},
+        {"id": "evt-3", "type": "opened", "data": {"email_id": "unknown-msg"}},
+    ]
+
+    saved = await asyncio.gather(*(batcher.submit(payload) for payload in payloads))
+
+    assert saved == [True, False, True, False]
+    assert calls == [4]
+    async with sqlite_session_factory() as session:
+        stored = (await session.execute(select(EmailEvent.event_type).where(EmailEvent.message_id == message.id))).scalars()
+        assert sorted(stored) == ["delivered", "opened"]
+
+
+@pytest.mark.asyncio
+async def test_webhook_batcher_isolates_events_that_break_the_batch(sqlite_session_factory) -> None:
+    message = await _seed_sent_message(sqlite_session_factory)
+    batcher = WebhookBatcher(sqlite_session_factory)
+    process = batcher.service.process_webhook_events
+
+    async def failing_process(db, payloads):
+        if any(payload.get("id") == "evt-poison" for payload in payloads):
+            raise RuntimeError("insert failed")
+        return await process(db, payloads)
+
+    batcher.service.process_webhook_events = failing_process
+    payloads = [
+        {"id": "evt-1", "type": "email.delivered", "data": {"email_id": "provider-msg-1"}},
+        {"id": "evt-2", "type": "opened", "data": "not-a-dict"},
+        {"id": "evt-poison", "type": "opened", "data": {"email_id": "provider-msg-1"}},
+        {"id": "evt-3", "type": "opened", "data": {"email_id": "provider-msg-1"}},
+    ]
+
+    results = await asyncio.gather(*(batcher.submit(payload) for payload in payloads), return_exceptions=True)
+
+    assert results[:2] == [True, False] and results[3] is True
+    assert isinstance(results[2], RuntimeError)
+    async with sqlite_session_factory() as session:
+        stored = (await session.execute(select(EmailEvent.event_type).where(EmailEvent.message_id == message.id))).scalars()
+        assert sorted(stored) == ["opened", "unknown"]
+
+
+@pytest.mark.asyncio
+async def test_send_campaign_respects_daily_limit_and_rate(monkeypatch, sqlite_session_factory) -> None:
+    service = EmailService(quota=SendQuota(sqlite_session_factory))
+    monkeypatch.setattr(service.settings, "daily_send_limit", 2)
 
     delays: list[float] = []
 
     async def fake_sleep(seconds: float):
         delays.append(seconds)
 
-    async def fake_send_with_retry(_to: str, _subject: str, _body: str):
+    async def fake_send_with_retry(_to: str, _subject: str, _body: str, **_kwargs):
         return True, "msg-1"
 
     monkeypatch.setattr(asyncio, "sleep", fake_sleep)
@@ -143,9 +193,19 @@ async def test_send_campaign_respects_daily_limit_and_rate(monkeypatch) -> None:
             email="two@example.com",
             saved_by="tester",
         ),
+        Influencer(
+            id=uuid.uuid4(),
+            platform="youtube",
+            platform_user_id="u3",
+            display_name="three",
+            profile_url="https://youtube.com/@three",
+            follower_count=3000,
+            email="three@example.com",
+            saved_by="tester",
+        ),
     ]
 
-    fake_db = FakeCampaignDB(today_sent=0)
+    fake_db = FakeCampaignDB()
     accepted = await service.send_campaign_messages(
         db=fake_db,
         campaign=campaign,
@@ -155,9 +215,11 @@ async def test_send_campaign_respects_daily_limit_and_rate(monkeypatch) -> None:
         user_id="u",
     )
 
-    assert accepted == 1
-    assert campaign.accepted_count == 1
-    assert delays == [2.0]
+    assert accepted == 2
+    assert campaign.accepted_count == 2
+    # 30/min: the first send goes out immediately, the second waits one 2s slot.
+    assert delays == [pytest.approx(2.0, abs=0.05)]
+    assert sum(isinstance(obj, EmailMessage) for obj in fake_db.added) == 2
 
 
 @pytest.mark.asyncio
@@ -199,3 +261,409 @@ async def test_send_with_retry_exponential_backoff(monkeypatch) -> None:
     assert message_id == "provider-123"
     assert call_count["n"] == 3
     assert sleep_delays == [1, 2]
+
+
+@pytest.mark.asyncio
+async def test_campaign_sender_refunds_quota_on_failure_and_reports_throughput(monkeypatch, sqlite_session_factory) -> None:
+    service = EmailService(quota=SendQuota(sqlite_session_factory))
+    monkeypatch.setattr(service.settings, "daily_send_limit", 2)
+    monkeypatch.setattr(service.settings, "send_concurrency", 4)
+
+    async def no_sleep(_seconds: float):
+        return None
+
+    async def flaky_send(to: str, _subject: str, _body: str, **_kwargs):
+        return (False, None) if to.startswith("bad") else (True, f"id-{to}")
+
+    monkeypatch.setattr(asyncio, "sleep", no_sleep)
+    monkeypatch.setattr(service, "_send_with_retry", flaky_send)
+
+    campaign = EmailCampaign(id=uuid.uuid4(), draft_id=uuid.uuid4(), status="sending", send_rate_limit=6000)
+    influencers = [
+        Influencer(id=uuid.uuid4(), platform="youtube", platform_user_id=name, display_name=name,
+                   profile_url=f"https://youtube.com/@{name}", email=f"{name}@example.com", saved_by="tester")
+        for name in ("bad1", "good1", "good2", "good3")
+    ]
+
+    report = await service.run_campaign_send(FakeCampaignDB(), campaign, influencers, "s", "b", "u")
+
+    assert (report.accepted, report.failed) == (2, 1)
+    assert report.throughput_per_minute > 0
+    async with sqlite_session_factory() as session:
+        assert (await session.execute(select(SendQuotaLedger.used))).scalar_one() == 2
+
+
+@pytest.mark.asyncio
+async def test_campaign_sender_cancels_in_flight_sends_when_the_loop_fails(monkeypatch, sqlite_session_factory) -> None:
+    service = EmailService(quota=SendQuota(sqlite_session_factory))
+    monkeypatch.setattr(service.settings, "send_concurrency", 3)
+    monkeypatch.setattr(service.settings, "campaign_progress_every", 1)
+    started: list[str] = []
+    cancelled: list[str] = []
+
+    async def send(to: str, _subject: str, _body: str, **_kwargs):
+        started.append(to)
+        if to.startswith("fast"):
+            return True, f"id-{to}"
+        try:
+            await asyncio.Event().wait()
+        except asyncio.CancelledError:
+            cancelled.append(to)
+            raise
+
+    async def failing_progress(_report) -> None:
+        raise RuntimeError("database went away")
+
+    monkeypatch.setattr(service, "_send_with_retry", send)
+    campaign = EmailCampaign(id=uuid.uuid4(), draft_id=uuid.uuid4(), status="sending", send_rate_limit=6000)
+    influencers = [
+        Influencer(id=uuid.uuid4(), platform="youtube", platform_user_id=name, display_name=name,
+                   profile_url=f"https://youtube.com/@{name}", email=f"{name}@example.com", saved_by="tester")
+        for name in ("slow1", "fast1", "slow2", "fast2")
+    ]
+    db = FakeCampaignDB()
+
+    with pytest.raises(RuntimeError):
+        await service.run_campaign_send(db, campaign, influencers, "s", "b", "u", on_progress=failing_progress)
+
+    # Every send still running when the loop failed was cancelled, and nothing starts afterwards.
+    sends_at_failure = list(started)
+    await asyncio.sleep(0.01)
+    assert started == sends_at_failure and "fast2@example.com" not in started
+    assert sorted(cancelled) == sorted(to for to in started if to.startswith("slow"))
+    statuses = {msg.to_email: msg.status for msg in db.added if isinstance(msg, EmailMessage)}
+    assert statuses == {"slow1@example.com": "pending", "fast1@example.com": "sent", "slow2@example.com": "pending"}
+
+
+@pytest.mark.asyncio
+async def test_sends_finishing_after_a_failure_reach_campaign_stats(monkeypatch, sqlite_session_factory) -> None:
+    service = EmailService(quota=SendQuota(sqlite_session_factory))
+    monkeypatch.setattr(service.settings, "send_concurrency", 2)
+    monkeypatch.setattr(service.settings, "campaign_progress_every", 1)
+
+    async def send(to: str, _subject: str, _body: str, **_kwargs):
+        if to.startswith("late"):
+            await asyncio.sleep(0.005)
+        return True, f"id-{to}"
+
+    async def failing_progress(_report) -> None:
+        # The late send finishes while progress is being saved, then saving fails.
+        await asyncio.sleep(0.02)
+        raise RuntimeError("database went away")
+
+    monkeypatch.setattr(service, "_send_with_retry", send)
+    campaign = EmailCampaign(id=uuid.uuid4(), draft_id=uuid.uuid4(), status="sending", send_rate_limit=6000)
+    influencers = [
+        Influencer(id=uuid.uuid4(), platform="youtube", platform_user_id=name, display_name=name,
+                   profile_url=f"https://youtube.com/@{name}", email=f"{name}@example.com", saved_by="tester")
+        for name in ("early", "late")
+    ]
+    async with sqlite_session_factory() as session:
+        session.add(campaign)
+        session.add_all(influencers)
+        await session.commit()
+
+        with pytest.raises(RuntimeError):
+            await service.run_campaign_send(session, campaign, influencers, "s", "b", "u", on_progress=failing_progress)
+
+        stats = await get_campaign_stats(session, campaign.id)
+        assert campaign.sent_count == stats.sent_count == 2
+
+
+@pytest.mark.asyncio
+async def test_campaign_progress_reads_persisted_counters(sqlite_session) -> None:
+    campaign = EmailCampaign(
+        draft_id=uuid.uuid4(),
+        status="sending",
+        send_rate_limit=60,
+        queued_count=100,
+        sent_count=28,
+        failed_count=2,
+        started_at=datetime.now(timezone.utc) - timedelta(seconds=60),
+    )
+    sqlite_session.add(campaign)
+    await sqlite_session.commit()
+
+    async def override_db() -> AsyncGenerator:
+        yield sqlite_session
+
+    app.dependency_overrides[get_db] = override_db
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        resp = await client.get(f"/api/v1/campaigns/{campaign.id}")
+    app.dependency_overrides.clear()
+
+    assert resp.status_code == 200
+    data = resp.json()
+    assert (data["status"], data["sent_count"], data["failed_count"]) == ("sending", 28, 2)
+    assert data["rate_per_minute"] == pytest.approx(30, rel=0.05)
+    assert data["eta_seconds"] == pytest.approx(140, rel=0.05)
+
+
+@pytest.mark.asyncio
+async def test_campaign_events_keyset_pages_and_ndjson_stream(sqlite_session_factory) -> None:
+    message = await _seed_sent_message(sqlite_session_factory)
+    base = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    offsets = [0, 1, 1, 2, 3]
+    event_types = ["delivered", "opened", "opened", "replied", "opened"]
+    async with sqlite_session_factory() as session:
+        session.add_all(
+            EmailEvent(
+                message_id=message.id,
+                provider_event_id=f"evt-{idx}",
+                event_type=event_type,
+                occurred_at=base + timedelta(minutes=offset),
+                raw_payload={"idx": idx},
+            )
+            for idx, (offset, event_type) in enumerate(zip(offsets, event_types))
+        )
+        await session.commit()
+
+    async def override_db() -> AsyncGenerator:
+        async with sqlite_session_factory() as session:
+            yield session
+
+    app.dependency_overrides[get_db] = override_db
+    app.dependency_overrides[get_session_factory] = lambda: sqlite_session_factory
+    url = f"/api/v1/campaigns/{message.campaign_id}/events"
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        pages = []
+        params: dict = {"limit": 2}
+        while True:
+            resp = await client.get(url, params=params)
+            assert resp.status_code == 200
+            pages.append(resp.json())
+            cursor = resp.headers.get("X-Next-Cursor")
+            if cursor is None:
+                break
+            params = {"limit": 2, "after": cursor}
+        unpaged = await client.get(url)
+        opened = await client.get(url, params={"event_type": "opened"})
+        stream = await client.get(f"{url}/stream", params={"include_payload": "false", "event_type": ["delivered", "replied"]})
+        bad_cursor = await client.get(url, params={"after": "not-a-cursor"})
+    app.dependency_overrides.clear()
+
+    assert [len(page) for page in pages] == [2, 2, 1]
+    events = [event for page in pages for event in page]
+    assert unpaged.json() == events and "X-Next-Cursor" not in unpaged.headers
+    assert sorted(event["raw_payload"]["idx"] for event in events) == [0, 1, 2, 3, 4]
+    assert [event["occurred_at"] for event in events] == sorted(event["occurred_at"] for event in events)
+    assert [event["event_type"] for event in opened.json()] == ["opened", "opened", "opened"]
+    assert stream.headers["content-type"].startswith("application/x-ndjson")
+    lines = [json.loads(line) for line in stream.text.splitlines()]
+    assert [line["event_type"] for line in lines] == ["delivered", "replied"]
+    assert all("raw_payload" not in line for line in lines)
+    assert bad_cursor.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_campaign_stats_rollup_tracks_sends_and_webhook_events(monkeypatch, sqlite_session_factory) -> None:
+    service = EmailService(quota=SendQuota(sqlite_session_factory))
+    monkeypatch.setattr(service.settings, "send_concurrency", 4)
+
+    async def flaky_send(to: str, _subject: str, _body: str, **_kwargs):
+        return (False, None) if to.startswith("bad") else (True, f"id-{to}")
+
+    monkeypatch.setattr(service, "_send_with_retry", flaky_send)
+
+    async with sqlite_session_factory() as session:
+        campaign = EmailCampaign(draft_id=uuid.uuid4(), status="sending", send_rate_limit=60000)
+        influencers = [
+            Influencer(platform="youtube", platform_user_id=name, display_name=name,
+                       profile_url=f"https://youtube.com/@{name}", email=f"{name}@example.com", saved_by="tester")
+            for name in ("bad1", "good1", "good2")
+        ]
+        session.add_all([campaign, *influencers])
+        await session.flush()
+        await service.run_campaign_send(session, campaign, influencers, "s", "b", "u")
+        await session.commit()
+
+    batcher = WebhookBatcher(sqlite_session_factory)
+    events = [
+        ("evt-1", "delivered", "id-good1@example.com"),
+        ("evt-2", "delivered", "id-good2@example.com"),
+        ("evt-3", "opened", "id-good1@example.com"),
+        ("evt-3", "opened", "id-good1@example.com"),
+        ("evt-4", "unknown", "id-good2@example.com"),
+    ]
+    await asyncio.gather(
+        *(batcher.submit({"id": event_id, "type": event_type, "data": {"email_id": email_id}})
+          for event_id, event_type, email_id in events)
+    )
+    await batcher.submit({"id": "evt-5", "type": "replied", "data": {"email_id": "id-good2@example.com"}})
+
+    async def override_db() -> AsyncGenerator:
+        async with sqlite_session_factory() as session:
+            yield session
+
+    app.dependency_overrides[get_db] = override_db
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        resp = await client.get(f"/api/v1/campaigns/{campaign.id}/stats")
+        missing = await client.get(f"/api/v1/campaigns/{uuid.uuid4()}/stats")
+    app.dependency_overrides.clear()
+
+    assert resp.status_code == 200
+    stats = resp.json()
+    assert (stats["sent_count"], stats["failed_count"]) == (2, 1)
+    assert (stats["delivered_count"], stats["opened_count"], stats["replied_count"], stats["bounced_count"]) == (2, 1, 1, 0)
+    assert missing.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_send_quota_ledger_is_shared_and_returns_unused_reservations(sqlite_session_factory) -> None:
+    quota = SendQuota(sqlite_session_factory)
+    first = QuotaReservation(quota, sender="team@example.com", limit=5, chunk_size=3, expected=10)
+    second = QuotaReservation(quota, sender="team@example.com", limit=5, chunk_size=3, expected=10)
+
+    assert await first.take()
+    assert await second.take()
+    taken = 2
+    while await first.take():
+        taken += 1
+    while await second.take():
+        taken += 1
+    assert taken == 5
+
+    first.give_back()
+    await first.close()
+    await second.close()
+    other_sender = QuotaReservation(quota, sender="other@example.com", limit=5, chunk_size=3, expected=1)
+    assert await other_sender.take()
+    await other_sender.close()
+
+    async with sqlite_session_factory() as session:
+        used = dict((await session.execute(select(SendQuotaLedger.sender, SendQuotaLedger.used))).all())
+    assert used == {"team@example.com": 4, "other@example.com": 1}
+
+
+async def _seed_stale_campaign(session_factory) -> tuple[EmailCampaign, list[Influencer]]:
+    """A campaign left in ``sending`` by a dead process after it had messaged the first recipient."""
+    async with session_factory() as session:
+        influencers = [
+            Influencer(platform="youtube", platform_user_id=name, display_name=name,
+                       profile_url=f"https://youtube.com/@{name}", email=f"{name}@example.com", saved_by="tester")
+            for name in ("first", "second", "third")
+        ]
+        # The uuid[] column has no SQLite binding, so the draft row is written directly.
+        draft_id = uuid.uuid4()
+        await session.execute(
+            text(
+                "INSERT INTO email_drafts (id, goal, tone, language, subject, body, variables, influencer_ids) "
+                "VALUES (:id, 'g', 't', 'en', 'Hi', 'Hello', '{}', '[]')"
+            ),
+            {"id": draft_id.hex},
+        )
+        session.add_all(influencers)
+        await session.flush()
+        campaign = EmailCampaign(
+            draft_id=draft_id,
+            status="sending",
+            send_rate_limit=60000,
+            queued_count=3,
+            sent_count=1,
+            recipient_ids=[str(influencer.id) for influencer in influencers],
+            created_by="tester",
+            locked_by="dead-process",
+            lease_expires_at=datetime.now(timezone.utc) - timedelta(seconds=1),
+        )
+        session.add(campaign)
+        await session.flush()
+        session.add(
+            EmailMessage(campaign_id=campaign.id, influencer_id=influencers[0].id, to_email="first@example.com",
+                         subject="Hi", body="Hello", status="sent", provider_message_id="id-first")
+        )
+        await session.commit()
+    return campaign, influencers
+
+
+async def _run_recovery(monkeypatch, session_factory, send, prepare=None) -> EmailCampaign:
+    monkeypatch.setattr(worker_tasks, "EmailService", lambda: EmailService(quota=SendQuota(session_factory)))
+    monkeypatch.setattr(EmailService, "_send_with_retry", send)
+    monkeypatch.setattr(email_service_module.get_settings(), "send_concurrency", 1)
+    queue = CampaignSendQueue(session_factory, worker_id="api-2")
+    campaign, influencers = await _seed_stale_campaign(session_factory)
+    if prepare is not None:
+        async with session_factory() as session:
+            await prepare(session, campaign, influencers)
+            await session.commit()
+
+    resumed = await worker_tasks.recover_stale_campaigns(queue)
+    assert len(resumed) == 1
+    await asyncio.gather(*resumed, return_exceptions=True)
+    assert await queue.claim_stale(10) == []
+    async with session_factory() as session:
+        return (await session.execute(select(EmailCampaign).where(EmailCampaign.id == campaign.id))).scalar_one()
+
+
+@pytest.mark.asyncio
+async def test_stale_sending_campaign_is_resumed_without_resending(monkeypatch, sqlite_session_factory) -> None:
+    sent_to: list[str] = []
+
+    async def send(_self, to: str, _subject: str, _body: str, **_kwargs):
+        sent_to.append(to)
+        return True, f"id-{to}"
+
+    campaign = await _run_recovery(monkeypatch, sqlite_session_factory, send)
+
+    assert sorted(sent_to) == ["second@example.com", "third@example.com"]
+    assert (campaign.status, campaign.sent_count, campaign.locked_by) == ("done", 3, None)
+
+
+@pytest.mark.asyncio
+async def test_failed_campaign_send_keeps_messages_already_sent(monkeypatch, sqlite_session_factory) -> None:
+    sent_to: list[str] = []
+
+    async def send(_self, to: str, _subject: str, _body: str, **_kwargs):
+        if sent_to:
+            raise RuntimeError("provider client crashed")
+        sent_to.append(to)
+        return True, f"id-{to}"
+
+    campaign = await _run_recovery(monkeypatch, sqlite_session_factory, send)
+
+    async with sqlite_session_factory() as session:
+        statuses = dict((await session.execute(select(EmailMessage.to_email, EmailMessage.status))).all())
+    assert (campaign.status, campaign.sent_count) == ("failed", 2)
+    assert statuses["first@example.com"] == statuses[sent_to[0]] == "sent"
+
+
+@pytest.mark.asyncio
+async def test_resumed_campaign_fails_messages_left_pending_by_the_dead_sender(
+    monkeypatch, sqlite_session_factory
+) -> None:
+    sent_to: list[str] = []
+
+    async def send(_self, to: str, _subject: str, _body: str, **_kwargs):
+        sent_to.append(to)
+        return True, f"id-{to}"
+
+    async def interrupted_send(session, campaign, influencers) -> None:
+        session.add(
+            EmailMessage(campaign_id=campaign.id, influencer_id=influencers[1].id, to_email="second@example.com",
+                         subject="Hi", body="Hello", status="pending")
+        )
+
+    campaign = await _run_recovery(monkeypatch, sqlite_session_factory, send, prepare=interrupted_send)
+
+    async with sqlite_session_factory() as session:
+        statuses = dict((await session.execute(select(EmailMessage.to_email, EmailMessage.status))).all())
+        stats = await get_campaign_stats(session, campaign.id)
+    assert sent_to == ["third@example.com"]
+    assert statuses == {"first@example.com": "sent", "second@example.com": "failed", "third@example.com": "sent"}
+    assert (campaign.status, campaign.sent_count, campaign.failed_count) == ("done", 2, 1)
+    assert stats.failed_count == 1
+
+
+@pytest.mark.asyncio
+async def test_resumed_campaign_with_deleted_draft_is_marked_failed(monkeypatch, sqlite_session_factory) -> None:
+    async def send(_self, to: str, _subject: str, _body: str, **_kwargs):
+        raise AssertionError("nothing should be sent without a draft")
+
+    async def delete_draft(session, campaign, _influencers) -> None:
+        await session.execute(text("DELETE FROM email_drafts WHERE id = :id"), {"id": campaign.draft_id.hex})
+
+    campaign = await _run_recovery(monkeypatch, sqlite_session_factory, send, prepare=delete_draft)
+
+    assert (campaign.status, campaign.locked_by, campaign.lease_expires_at) == ("failed", None, None)
@@ -0,0 +1,135 @@
+from collections.abc import AsyncGenerator
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import func, select
+
+from app.api.deps import get_db
+from app.config import get_settings
+from app.main import app
+from app.models.audit_log import AuditLog
+from app.models.influencer import Influencer
+from app.models.search_result import SearchResultRaw
+from app.models.search_task import SearchTask
+from app.services.ingest_service import MAX_BIND_PARAMS, max_rows_per_statement
+
+
+def _raw(task_id, platform_user_id: str) -> SearchResultRaw:
+    return SearchResultRaw(
+        task_id=task_id,
+        platform="youtube",
+        platform_user_id=platform_user_id,
+        display_name=platform_user_id.title(),
+        profile_url=f"https://www.youtube.com/@{platform_user_id}",
+        follower_count=1000,
+        email=None,
+        extra={},
+    )
+
+
+def test_max_rows_per_statement_respects_bind_param_limit() -> None:
+    assert max_rows_per_statement(9, 1000) == 1000
+    assert max_rows_per_statement(40, 1000) == MAX_BIND_PARAMS // 40
+    assert max_rows_per_statement(MAX_BIND_PARAMS + 1, 1000) == 1
+
+
+@pytest.mark.parametrize("batch_size", [1000, 1])
+async def test_save_influencers_bulk_upsert_counts(monkeypatch, sqlite_session, batch_size) -> None:
+    monkeypatch.setattr(get_settings(), "raw_insert_batch_size", batch_size)
+    task = SearchTask(user_id="tester", query_raw="fitness", query_parsed={})
+    sqlite_session.add(task)
+    await sqlite_session.flush()
+    raws = [_raw(task.id, "existing"), _raw(task.id, "new-1"), _raw(task.id, "new-1"), _raw(task.id, "new-2")]
+    sqlite_session.add_all(raws)
+    sqlite_session.add(
+        Influencer(
+            platform="youtube",
+            platform_user_id="existing",
+            display_name="Existing",
+            profile_url="https://www.youtube.com/@existing",
+            saved_by="someone",
+        )
+    )
+    await sqlite_session.commit()
+
+    async def override_db() -> AsyncGenerator:
+        yield sqlite_session
+
+    app.dependency_overrides[get_db] = override_db
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        resp = await client.post(
+            "/api/v1/influencers/save",
+            json={"task_id": str(task.id), "selected_result_ids": [str(raw.id) for raw in raws]},
+            headers={"X-User-Id": "tester"},
+        )
+    app.dependency_overrides.clear()
+
+    assert resp.status_code == 200
+    assert resp.json() == {"saved_count": 2, "skipped_count": 2}
+    saved_by_tester = (await sqlite_session.execute(select(func.count()).where(Influencer.saved_by == "tester"))).scalar_one()
+    audit_rows = (await sqlite_session.execute(select(func.count(AuditLog.id)))).scalar_one()
+    assert saved_by_tester == 2
+    assert audit_rows == 2
+
+
+async def test_list_influencers_cursor_pages_match_offset_order(sqlite_session) -> None:
+    base = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    sqlite_session.add_all(
+        Influencer(
+            platform="youtube",
+            platform_user_id=f"creator-{idx}",
+            display_name=f"Creator {idx}",
+            profile_url=f"https://www.youtube.com/@creator-{idx}",
+            saved_by="tester",
+            saved_at=base + timedelta(minutes=idx // 2),
+        )
+        for idx in range(7)
+    )
+    await sqlite_session.commit()
+
+    async def override_db() -> AsyncGenerator:
+        yield sqlite_session
+
+    app.dependency_overrides[get_db] = override_db
+    transport = ASGITransport(app=app)
+    headers = {"X-User-Id": "tester"}
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        by_offset = (await client.get("/api/v1/influencers", params={"limit": 200}, headers=headers)).json()
+        by_cursor = []
+        params: dict = {"limit": 3}
+        while True:
+            resp = await client.get("/api/v1/influencers", params=params, headers=headers)
+            by_cursor.extend(resp.json())
+            cursor = resp.headers.get("X-Next-Cursor")
+            if cursor is None:
+                break
+            params = {"limit": 3, "cursor": cursor}
+        second_page = (await client.get("/api/v1/influencers", params={"limit": 3, "offset": 3}, headers=headers)).json()
+    app.dependency_overrides.clear()
+
+    assert len(by_offset) == 7
+    assert [item["id"] for item in by_cursor] == [item["id"] for item in by_offset]
+    assert [item["id"] for item in second_page] == [item["id"] for item in by_offset[3:6]]
+    assert by_offset[0]["platform_user_id"] == "creator-6"
+
+
+async def test_profile_url_normalized_follows_profile_url_changes(sqlite_session) -> None:
+    influencer = Influencer(
+        platform="youtube",
+        platform_user_id="renamed",
+        display_name="Renamed",
+        profile_url="https://WWW.YouTube.com/@old/",
+        saved_by="tester",
+    )
+    sqlite_session.add(influencer)
+    await sqlite_session.flush()
+    assert influencer.profile_url_normalized == "https://www.youtube.com/@old"
+
+    influencer.profile_url = "https://www.youtube.com/@new?si=abc"
+    await sqlite_session.flush()
+    stored = await sqlite_session.scalar(
+        select(Influencer.profile_url_normalized).where(Influencer.id == influencer.id)
+    )
+    assert stored == "https://www.youtube.com/@new"
@@ -0,0 +1,116 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import select, update
+
+from app.models.search_result import SearchResultRaw
+from app.models.search_task import SearchTask
+from app.services.job_queue import SearchJobQueue
+from app.workers.search_worker import SearchWorker
+from app.workers.tasks import run_claimed_search_task
+
+
+async def _create_task(session_factory, query: str = "fitness") -> SearchTask:
+    async with session_factory() as session:
+        task = SearchTask(user_id="tester", query_raw=query, query_parsed={"search_queries": [query]}, status="pending")
+        session.add(task)
+        await session.commit()
+        return task
+
+
+async def _reload(session_factory, task_id) -> SearchTask:
+    async with session_factory() as session:
+        return (await session.execute(select(SearchTask).where(SearchTask.id == task_id))).scalar_one()
+
+
+async def test_claim_run_and_complete(sqlite_session_factory) -> None:
+    task = await _create_task(sqlite_session_factory)
+    queue = SearchJobQueue(sqlite_session_factory, worker_id="worker-a")
+
+    assert await queue.claim(5) == [task.id]
+    assert await SearchJobQueue(sqlite_session_factory, worker_id="worker-b").claim(5) == []
+
+    await run_claimed_search_task(queue, task.id)
+
+    done = await _reload(sqlite_session_factory, task.id)
+    assert done.status == "done"
+    assert done.result_count == 2
+    assert done.attempts == 1
+    assert done.locked_by is None and done.lease_expires_at is None
+
+
+async def test_failed_claims_retry_with_backoff_then_fail(sqlite_session_factory, monkeypatch) -> None:
+    task = await _create_task(sqlite_session_factory)
+    queue = SearchJobQueue(sqlite_session_factory, worker_id="worker-a")
+    monkeypatch.setattr(queue.settings, "search_job_max_attempts", 2)
+    monkeypatch.setattr(queue.settings, "search_job_retry_backoff_seconds", 60)
+
+    await queue.claim(1)
+    assert await queue.fail(task.id, "boom") == "pending"
+    retried = await _reload(sqlite_session_factory, task.id)
+    assert retried.last_error == "boom"
+    assert await queue.claim(1) == []
+
+    async with sqlite_session_factory() as session:
+        await session.execute(update(SearchTask).values(next_run_at=datetime.now(timezone.utc) - timedelta(seconds=1)))
+        await session.commit()
+    assert await queue.claim(1) == [task.id]
+    assert await queue.fail(task.id, "boom again") == "failed"
+
+
+async def test_reclaim_expired_leases(sqlite_session_factory) -> None:
+    task = await _create_task(sqlite_session_factory)
+    queue = SearchJobQueue(sqlite_session_factory, worker_id="crashed-worker")
+    await queue.claim(1)
+
+    assert await queue.reclaim_expired() == 0
+    async with sqlite_session_factory() as session:
+        await session.execute(update(SearchTask).values(lease_expires_at=datetime.now(timezone.utc) - timedelta(seconds=1)))
+        await session.commit()
+
+    assert await queue.reclaim_expired() == 1
+    reclaimed = await _reload(sqlite_session_factory, task.id)
+    assert reclaimed.status == "pending"
+    assert reclaimed.locked_by is None
+    assert await SearchJobQueue(sqlite_session_factory).claim(1) == [task.id]
+
+
+async def test_run_discards_results_when_lease_was_taken_over(sqlite_session_factory) -> None:
+    task = await _create_task(sqlite_session_factory)
+    stale = SearchJobQueue(sqlite_session_factory, worker_id="worker-a")
+    await stale.claim(1)
+    # worker-a stalls past its lease; the task is reclaimed and claimed by worker-b.
+    async with sqlite_session_factory() as session:
+        await session.execute(update(SearchTask).values(locked_by="worker-b"))
+        await session.commit()
+
+    await run_claimed_search_task(stale, task.id)
+
+    current = await _reload(sqlite_session_factory, task.id)
+    assert current.status == "running"
+    assert current.locked_by == "worker-b"
+    async with sqlite_session_factory() as session:
+        assert (await session.execute(select(SearchResultRaw.id))).first() is None
+
+
+async def test_worker_survives_queue_errors(sqlite_session_factory) -> None:
+    task = await _create_task(sqlite_session_factory)
+    queue = SearchJobQueue(sqlite_session_factory, worker_id="worker-a")
+    stop = asyncio.Event()
+    real_claim = queue.claim
+    calls = 0
+
+    async def flaky_claim(limit: int):
+        nonlocal calls
+        calls += 1
+        if calls == 1:
+            raise ConnectionError("database went away")
+        claimed = await real_claim(limit)
+        if not claimed:
+            stop.set()
+        return claimed
+
+    queue.claim = flaky_claim
+    await asyncio.wait_for(SearchWorker(queue, concurrency=1, poll_seconds=0.01).run(stop), timeout=5)
+
+    assert (await _reload(sqlite_session_factory, task.id)).status == "done"
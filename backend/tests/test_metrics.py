@@ -0,0 +1,51 @@
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+from app.main import app
+from app.metrics import MetricsRegistry
+
+
+def test_registry_renders_prometheus_text_format() -> None:
+    registry = MetricsRegistry()
+    sends = registry.counter("sends_total", "Sends by outcome.", ("outcome",))
+    latency = registry.histogram("call_seconds", "Call latency.", ("endpoint",), buckets=(0.1, 1.0))
+    sends.inc(outcome="ok")
+    sends.inc(2, outcome='bad "quote"')
+    latency.observe(0.05, endpoint="/search")
+    latency.observe(0.5, endpoint="/search")
+
+    assert registry.counter("sends_total", "Sends by outcome.", ("outcome",)) is sends
+    with pytest.raises(ValueError):
+        registry.gauge("sends_total", "Sends by outcome.", ("outcome",))
+    with pytest.raises(ValueError):
+        sends.inc(route="x")
+
+    assert registry.render().splitlines() == [
+        "# HELP sends_total Sends by outcome.",
+        "# TYPE sends_total counter",
+        'sends_total{outcome="ok"} 1',
+        'sends_total{outcome="bad \\"quote\\""} 2',
+        "# HELP call_seconds Call latency.",
+        "# TYPE call_seconds histogram",
+        'call_seconds_bucket{endpoint="/search",le="0.1"} 1',
+        'call_seconds_bucket{endpoint="/search",le="1"} 2',
+        'call_seconds_bucket{endpoint="/search",le="+Inf"} 2',
+        'call_seconds_sum{endpoint="/search"} 0.55',
+        'call_seconds_count{endpoint="/search"} 2',
+    ]
+
+
+async def test_metrics_endpoint_reports_requests_by_route_template() -> None:
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        assert (await client.get("/health")).status_code == 200
+        assert (await client.get("/no-such-route")).status_code == 404
+        resp = await client.get("/metrics")
+
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("text/plain; version=0.0.4")
+    body = resp.text
+    assert 'http_requests_total{method="GET",route="/health",status="200"}' in body
+    assert 'http_requests_total{method="GET",route="unmatched",status="404"}' in body
+    assert 'http_request_duration_seconds_count{method="GET",route="/health"}' in body
+    assert "# TYPE db_pool_checkout_wait_seconds histogram" in body
@@ -1,3 +1,15 @@
+import json
+from collections.abc import AsyncGenerator
+
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import select
+
+from app.api.deps import get_db, get_session_factory
+from app.main import app
+from app.models.influencer import Influencer
+from app.models.search_result import SearchResultDeduped, SearchResultRaw
+from app.models.search_task import SearchTask
+from app.services.ingest_service import bulk_insert_deduped_results
 from app.services.search_service import SearchService
 
 
@@ -23,3 +35,206 @@ def test_search_query_parse_between_range() -> None:
     parsed = service.parse_query({"query": "english channels between 10k and 50k subscribers"})
     assert parsed["follower_min"] == 10000
     assert parsed["follower_max"] == 50000
+
+
+async def test_search_pipeline_prefetches_dedup_candidates(sqlite_session) -> None:
+    existing = Influencer(
+        platform="youtube",
+        platform_user_id="someone-else",
+        display_name="Saved Creator",
+        profile_url="https://www.youtube.com/@mockcreator/",
+        follower_count=1000,
+        email=None,
+        saved_by="tester",
+    )
+    task = SearchTask(user_id="tester", query_raw="fitness", query_parsed={"search_queries": ["fitness"]})
+    sqlite_session.add_all([existing, task])
+    await sqlite_session.flush()
+
+    service = SearchService()
+    count = await service.run_search_pipeline(sqlite_session, task)
+    await sqlite_session.flush()
+
+    deduped = (await sqlite_session.execute(select(SearchResultDeduped))).scalars().all()
+    statuses = {row.dedup_status: row.matched_influencer_id for row in deduped}
+    raw_ids = set((await sqlite_session.execute(select(SearchResultRaw.id))).scalars())
+    deduped_raw_ids = set((await sqlite_session.execute(select(SearchResultDeduped.raw_result_id))).scalars())
+    assert count == 2
+    assert raw_ids == deduped_raw_ids and len(raw_ids) == 2
+    assert statuses == {"duplicate_url": existing.id, "unique": None}
+    assert {row.dedup_status: row.match_score for row in deduped} == {"duplicate_url": 1.0, "unique": None}
+
+
+async def test_search_pipeline_prefetch_matches_full_load(monkeypatch, sqlite_session_factory) -> None:
+    results = {}
+    for prefetch in (True, False):
+        async with sqlite_session_factory() as session:
+            stored = Influencer(
+                platform="youtube",
+                platform_user_id=f"someone-else-{prefetch}",
+                display_name="Saved Creator",
+                profile_url="https://WWW.YouTube.com/@mockcreator?si=abc",
+                follower_count=1000,
+                email=None,
+                saved_by="tester",
+            )
+            task = SearchTask(user_id="tester", query_raw="fitness", query_parsed={"search_queries": ["fitness"]})
+            session.add_all([stored, task])
+            await session.flush()
+
+            service = SearchService()
+            monkeypatch.setattr(service.settings, "dedup_candidate_prefetch", prefetch)
+            await service.run_search_pipeline(session, task)
+            await session.flush()
+            rows = (
+                await session.execute(select(SearchResultDeduped).where(SearchResultDeduped.task_id == task.id))
+            ).scalars()
+            results[prefetch] = sorted((row.dedup_status, row.matched_influencer_id == stored.id) for row in rows)
+            await session.rollback()
+
+    assert results[True] == results[False] == [("duplicate_url", True), ("unique", False)]
+
+
+async def test_search_pipeline_fuzzy_weak_match_is_opt_in_and_loads_all_off_postgres(
+    monkeypatch, sqlite_session_factory
+) -> None:
+    statuses = {}
+    for threshold in (None, 0.5):
+        async with sqlite_session_factory() as session:
+            stored = Influencer(
+                platform="youtube",
+                platform_user_id=f"studio-{threshold}",
+                display_name="Fitness Studios",
+                profile_url=f"https://www.youtube.com/@studio-{threshold}",
+                follower_count=150000,
+                email=None,
+                saved_by="tester",
+            )
+            task = SearchTask(user_id="tester", query_raw="fitness", query_parsed={"search_queries": ["fitness"]})
+            session.add_all([stored, task])
+            await session.flush()
+
+            service = SearchService()
+            monkeypatch.setattr(service.settings, "dedup_candidate_prefetch", True)
+            monkeypatch.setattr(service.settings, "dedup_fuzzy_threshold", threshold)
+            await service.run_search_pipeline(session, task)
+            await session.flush()
+            rows = (
+                await session.execute(select(SearchResultDeduped).where(SearchResultDeduped.task_id == task.id))
+            ).scalars()
+            statuses[threshold] = sorted(
+                (row.dedup_status, row.matched_influencer_id == stored.id, row.match_score) for row in rows
+            )
+            await session.rollback()
+
+    assert statuses[None] == [("unique", False, None), ("unique", False, None)]
+    assert statuses[0.5] == [("unique", False, None), ("weak_match", True, 0.8125)]
+
+
+async def test_search_results_filter_sort_page_and_stream(sqlite_session_factory) -> None:
+    followers = [5000, None, 12000, 800, 12000, 3000]
+    statuses = ["unique", "unique", "weak_match", "duplicate_url", "unique", "unique"]
+    async with sqlite_session_factory() as session:
+        task = SearchTask(user_id="tester", query_raw="fitness", query_parsed={})
+        session.add(task)
+        await session.flush()
+        for idx, (follower_count, status) in enumerate(zip(followers, statuses)):
+            raw = SearchResultRaw(
+                task_id=task.id,
+                platform="youtube",
+                platform_user_id=f"creator-{idx}",
+                display_name=f"Creator {idx}",
+                profile_url=f"https://www.youtube.com/@creator-{idx}",
+                follower_count=follower_count,
+                email=f"creator{idx}@example.com" if idx % 2 == 0 else None,
+                extra={},
+            )
+            session.add(raw)
+            await session.flush()
+            session.add(SearchResultDeduped(task_id=task.id, raw_result_id=raw.id, dedup_status=status))
+        await session.commit()
+
+    async def override_db() -> AsyncGenerator:
+        async with sqlite_session_factory() as session:
+            yield session
+
+    app.dependency_overrides[get_db] = override_db
+    app.dependency_overrides[get_session_factory] = lambda: sqlite_session_factory
+    url = f"/api/v1/search-tasks/{task.id}/results"
+    wanted = {"dedup_status": ["unique", "weak_match"], "sort": "followers_desc", "limit": 2}
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        unpaged = (await client.get(url)).json()
+        pages = []
+        params: dict = dict(wanted)
+        while True:
+            resp = await client.get(url, params=params)
+            assert resp.status_code == 200
+            pages.append([item["platform_user_id"] for item in resp.json()])
+            cursor = resp.headers.get("X-Next-Cursor")
+            if cursor is None:
+                break
+            params = {**wanted, "cursor": cursor}
+        with_email = (await client.get(url, params={"has_email": "true", "follower_min": 4000})).json()
+        stream = await client.get(f"{url}/stream", params={"sort": "followers_asc", "follower_max": 5000})
+    app.dependency_overrides.clear()
+
+    assert len(unpaged) == 6
+    assert [len(page) for page in pages] == [2, 2, 1]
+    flat = [user_id for page in pages for user_id in page]
+    assert set(flat[:2]) == {"creator-2", "creator-4"}
+    assert flat[2:] == ["creator-0", "creator-5", "creator-1"]
+    assert sorted(item["platform_user_id"] for item in with_email) == ["creator-0", "creator-2", "creator-4"]
+    streamed = [json.loads(line)["follower_count"] for line in stream.text.splitlines()]
+    assert streamed == [800, 3000, 5000]
+
+
+async def test_search_results_default_order_keeps_bulk_insert_order(sqlite_session_factory) -> None:
+    async with sqlite_session_factory() as session:
+        task = SearchTask(user_id="tester", query_raw="fitness", query_parsed={})
+        session.add(task)
+        await session.flush()
+        raws = [
+            SearchResultRaw(
+                task_id=task.id,
+                platform="youtube",
+                platform_user_id=f"creator-{idx}",
+                display_name=f"Creator {idx}",
+                profile_url=f"https://www.youtube.com/@creator-{idx}",
+                follower_count=idx,
+                email=None,
+                extra={},
+            )
+            for idx in range(20)
+        ]
+        session.add_all(raws)
+        await session.flush()
+        await bulk_insert_deduped_results(
+            session,
+            [{"task_id": task.id, "raw_result_id": raw.id, "dedup_status": "unique"} for raw in raws],
+        )
+        await session.commit()
+        created = (await session.execute(select(SearchResultDeduped.created_at))).scalars().all()
+    # The batch keeps its real, shared timestamp; ordinal carries the insertion order.
+    assert len(set(created)) == 1
+
+    async def override_db() -> AsyncGenerator:
+        async with sqlite_session_factory() as session:
+            yield session
+
+    app.dependency_overrides[get_db] = override_db
+    url = f"/api/v1/search-tasks/{task.id}/results"
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        pages = []
+        params: dict = {"limit": 7}
+        while True:
+            resp = await client.get(url, params=params)
+            pages.extend(item["platform_user_id"] for item in resp.json())
+            cursor = resp.headers.get("X-Next-Cursor")
+            if cursor is None:
+                break
+            params = {"limit": 7, "cursor": cursor}
+    app.dependency_overrides.clear()
+
+    assert pages == [f"creator-{idx}" for idx in range(20)]
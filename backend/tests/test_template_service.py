@@ -0,0 +1,35 @@
+import uuid
+
+from app.models.influencer import Influencer
+from app.services.template_service import get_render_plan
+
+
+def test_render_plan_personalizes_escapes_and_appends_footer() -> None:
+    influencer = Influencer(
+        id=uuid.uuid4(),
+        platform="youtube",
+        platform_user_id="u1",
+        display_name="Tom & <Jerry>",
+        profile_url="https://youtube.com/@tj",
+        email="tj@example.com",
+    )
+    plan = get_render_plan(
+        uuid.uuid4(),
+        subject="Hi {{ name }}",
+        body="Hello {{creator}},\nLove {{brand}} & \"5 < 6\"",
+        variables={"creator": "influencer_name", "brand": "brand_name"},
+    )
+
+    rendered = plan.render(influencer)
+
+    assert rendered.subject == "Hi Tom & <Jerry>"
+    assert rendered.text.startswith('Hello Tom & <Jerry>,\nLove {{brand}} & "5 < 6"\n\n---\nUnsubscribe:')
+    assert rendered.text.endswith(f"/unsubscribe/{influencer.id}")
+    assert rendered.html.startswith(
+        "Hello Tom &amp; &lt;Jerry&gt;,<br/>Love {{brand}} &amp; &quot;5 &lt; 6&quot;<br/><br/>---"
+    )
+
+
+def test_render_plan_is_cached_per_draft() -> None:
+    draft_id = uuid.uuid4()
+    assert get_render_plan(draft_id, "s", "b") is get_render_plan(draft_id, "s", "b")
@@ -0,0 +1,104 @@
+import asyncio
+
+import httpx
+from sqlalchemy import select
+
+from app.config import get_settings
+from app.models.youtube_cache import YouTubeCacheEntry
+from app.services.youtube_cache import TTLCache, YouTubeCache
+from app.services.youtube_connector import YouTubeConnector
+from loadtest.stubs import FaultConfig, youtube_app
+
+
+def _channel(channel_id: str, subscribers: int) -> dict:
+    return {
+        "id": channel_id,
+        "snippet": {"title": channel_id.title(), "description": f"contact {channel_id}@example.com"},
+        "statistics": {"subscriberCount": str(subscribers)},
+    }
+
+
+async def test_fetch_and_store_runs_queries_concurrently_and_merges_in_order(monkeypatch) -> None:
+    search_pages = {
+        ("alpha", None): (["shared", "a1"], "alpha-2"),
+        ("alpha", "alpha-2"): (["a2"], None),
+        ("beta", None): (["b1", "shared"], None),
+    }
+    in_flight = {"now": 0, "max": 0}
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        in_flight["now"] += 1
+        in_flight["max"] = max(in_flight["max"], in_flight["now"])
+        await asyncio.sleep(0.01)
+        in_flight["now"] -= 1
+        params = request.url.params
+        if request.url.path.endswith("/search"):
+            ids, next_token = search_pages[(params["q"], params.get("pageToken"))]
+            body = {"items": [{"snippet": {"channelId": cid}} for cid in ids]}
+            if next_token:
+                body["nextPageToken"] = next_token
+            return httpx.Response(200, json=body)
+        return httpx.Response(200, json={"items": [_channel(cid, 5000) for cid in params["id"].split(",")]})
+
+    connector = YouTubeConnector(transport=httpx.MockTransport(handler), cache=YouTubeCache(TTLCache(100)))
+    monkeypatch.setattr(connector.settings, "youtube_api_key", "test-key")
+
+    rows = await connector.fetch(queries=["alpha", "beta"], pages=2)
+
+    assert [row["platform_user_id"] for row in rows] == ["shared", "a1", "a2", "b1"]
+    assert rows[0]["extra"]["query_used"] == "alpha"
+    assert rows[0]["email"] == "shared@example.com"
+    assert in_flight["max"] > 1
+
+
+async def test_fetch_and_store_batches_channels_and_serves_repeats_from_cache(monkeypatch, sqlite_session_factory) -> None:
+    calls: list[tuple[str, str]] = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        params = request.url.params
+        if request.url.path.endswith("/search"):
+            calls.append(("search", params["q"]))
+            ids = [f"{params['q']}-{n}" for n in range(30)]
+            return httpx.Response(200, json={"items": [{"snippet": {"channelId": cid}} for cid in ids]})
+        calls.append(("channels", params["id"]))
+        return httpx.Response(200, json={"items": [_channel(cid, 5000) for cid in params["id"].split(",")]})
+
+    transport = httpx.MockTransport(handler)
+    first = YouTubeConnector(transport=transport, cache=YouTubeCache(TTLCache(1000), sqlite_session_factory))
+    monkeypatch.setattr(first.settings, "youtube_api_key", "test-key")
+    assert len(await first.fetch(queries=["alpha", "beta"])) == 60
+
+    channel_calls = [ids.split(",") for kind, ids in calls if kind == "channels"]
+    assert [len(ids) for ids in channel_calls] == [50, 10]
+
+    # A second worker with a cold in-process tier is served by the shared table.
+    calls.clear()
+    second = YouTubeConnector(transport=transport, cache=YouTubeCache(TTLCache(1000), sqlite_session_factory))
+    rows = await second.fetch(queries=["alpha", "beta"])
+    assert calls == []
+    assert [row["platform_user_id"] for row in rows[:2]] == ["alpha-0", "alpha-1"]
+
+
+async def test_youtube_cache_purges_expired_table_rows_on_write(sqlite_session_factory) -> None:
+    cache = YouTubeCache(TTLCache(100), sqlite_session_factory, purge_interval_seconds=0)
+    await cache.set_many({"stale": {"n": 1}}, ttl_seconds=-1)
+    await cache.set_many({"fresh": {"n": 2}}, ttl_seconds=60)
+
+    async with sqlite_session_factory() as session:
+        keys = (await session.execute(select(YouTubeCacheEntry.cache_key))).scalars().all()
+    assert keys == ["fresh"]
+
+
+async def test_connector_uses_configured_base_url_against_load_test_stand_in(monkeypatch) -> None:
+    settings = get_settings()
+    monkeypatch.setattr(settings, "youtube_api_key", "test-key")
+    monkeypatch.setattr(settings, "youtube_api_base_url", "http://youtube.stub/youtube/v3/")
+    stub = youtube_app(FaultConfig.parse("throttle_rate=0"), pages_per_query=2)
+
+    connector = YouTubeConnector(transport=httpx.ASGITransport(app=stub), cache=YouTubeCache(TTLCache(100)))
+    rows = await connector.fetch(queries=["fitness"], pages=2)
+
+    assert connector.base_url == "http://youtube.stub/youtube/v3"
+    assert len(rows) == 50
+    # Two /search pages, then both pages' channels coalesced into one /channels call.
+    assert stub.state.stub.stats() == {"requests": 3, "errors": 0, "throttled": 0}
@@ -5,6 +5,11 @@ import { useQuery } from "@tanstack/react-query";
 import { api } from "@/lib/api";
 
 export function CampaignDashboard({ campaignId }: { campaignId: string }) {
+  const progressQuery = useQuery({
+    queryKey: ["campaign-progress", campaignId],
+    queryFn: () => api.getCampaign(campaignId),
+    refetchInterval: (query) => (query.state.data?.status === "sending" ? 2000 : false),
+  });
   const eventsQuery = useQuery({
     queryKey: ["campaign-events", campaignId],
     queryFn: () => api.getCampaignEvents(campaignId),
@@ -14,6 +19,13 @@ export function CampaignDashboard({ campaignId }: { campaignId: string }) {
   return (
     <div className="card">
       <h3>Campaign {campaignId}</h3>
+      {progressQuery.data ? (
+        <p>
+          {progressQuery.data.status}: {progressQuery.data.sent_count} sent, {progressQuery.data.failed_count} failed of{" "}
+          {progressQuery.data.queued_count} queued ({progressQuery.data.rate_per_minute}/min
+          {progressQuery.data.eta_seconds ? `, ~${Math.ceil(progressQuery.data.eta_seconds)}s left` : ""})
+        </p>
+      ) : null}
       {eventsQuery.isLoading ? <p>Loading events...</p> : null}
       {eventsQuery.isError ? <p>Failed to load events.</p> : null}
       <ul>
@@ -48,7 +48,12 @@ export function InfluencerTable({
                     Open
                   </a>
                 </td>
-                <td>{item.dedup_status}</td>
+                <td>
+                  {item.dedup_status}
+                  {item.dedup_status === "weak_match" && item.match_score != null
+                    ? ` (${Math.round(item.match_score * 100)}%)`
+                    : ""}
+                </td>
               </tr>
             );
           })}
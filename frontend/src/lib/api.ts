@@ -20,6 +20,7 @@ export type SearchResultItem = {
   raw_result_id: string;
   dedup_status: string;
   matched_influencer_id: string | null;
+  match_score?: number | null;
   platform: string;
   platform_user_id: string;
   display_name: string;
@@ -36,6 +37,18 @@ export type CampaignEvent = {
   raw_payload: Record<string, unknown>;
 };
 
+export type CampaignProgress = {
+  campaign_id: string;
+  status: "draft" | "sending" | "done" | "failed";
+  queued_count: number;
+  sent_count: number;
+  failed_count: number;
+  rate_per_minute: number;
+  eta_seconds: number | null;
+  started_at: string | null;
+  finished_at: string | null;
+};
+
 export type InfluencerListItem = {
   id: string;
   platform: string;
@@ -79,7 +92,17 @@ export const api = {
     return request<SearchTaskListItem[]>(`/search-tasks?limit=${limit}&offset=${offset}`);
   },
   getSearchTask: (taskId: string) => request<SearchTaskStatus>(`/search-tasks/${taskId}`),
-  getSearchResults: (taskId: string) => request<SearchResultItem[]>(`/search-tasks/${taskId}/results`),
+  getSearchResults: (
+    taskId: string,
+    params?: { dedup_status?: string[]; has_email?: boolean; sort?: "created_at" | "followers_desc" | "followers_asc" },
+  ) => {
+    const query = new URLSearchParams();
+    for (const status of params?.dedup_status ?? []) query.append("dedup_status", status);
+    if (params?.has_email !== undefined) query.set("has_email", String(params.has_email));
+    if (params?.sort) query.set("sort", params.sort);
+    const suffix = query.toString() ? `?${query.toString()}` : "";
+    return request<SearchResultItem[]>(`/search-tasks/${taskId}/results${suffix}`);
+  },
   listInfluencers: (params?: { limit?: number; offset?: number }) => {
     const limit = params?.limit ?? 100;
     const offset = params?.offset ?? 0;
@@ -99,9 +122,10 @@ export const api = {
       },
     ),
   sendCampaign: (body: Record<string, unknown>) =>
-    request<{ campaign_id: string; accepted_count: number }>("/campaigns/send", {
+    request<{ campaign_id: string; status: string; queued_count: number; accepted_count: number }>("/campaigns/send", {
       method: "POST",
       body: JSON.stringify(body),
     }),
+  getCampaign: (campaignId: string) => request<CampaignProgress>(`/campaigns/${campaignId}`),
   getCampaignEvents: (campaignId: string) => request<CampaignEvent[]>(`/campaigns/${campaignId}/events`),
 };
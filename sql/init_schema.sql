@@ -4,6 +4,7 @@ BEGIN;
 
 -- Optional in Supabase (usually enabled by default), required for gen_random_uuid().
 CREATE EXTENSION IF NOT EXISTS pgcrypto;
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
 
 DO $$
 BEGIN
@@ -40,6 +41,12 @@ CREATE TABLE IF NOT EXISTS search_tasks (
   updated_at timestamptz NOT NULL DEFAULT now()
 );
 
+ALTER TABLE search_tasks ADD COLUMN IF NOT EXISTS attempts integer NOT NULL DEFAULT 0;
+ALTER TABLE search_tasks ADD COLUMN IF NOT EXISTS next_run_at timestamptz NOT NULL DEFAULT now();
+ALTER TABLE search_tasks ADD COLUMN IF NOT EXISTS lease_expires_at timestamptz;
+ALTER TABLE search_tasks ADD COLUMN IF NOT EXISTS locked_by text;
+ALTER TABLE search_tasks ADD COLUMN IF NOT EXISTS last_error text;
+
 CREATE TABLE IF NOT EXISTS search_results_raw (
   id uuid PRIMARY KEY DEFAULT gen_random_uuid(),
   task_id uuid NOT NULL REFERENCES search_tasks(id) ON DELETE CASCADE,
@@ -64,19 +71,35 @@ CREATE TABLE IF NOT EXISTS influencers (
   saved_by text NOT NULL,
   saved_at timestamptz NOT NULL DEFAULT now(),
   unsubscribed_at timestamptz,
+  profile_url_normalized text,
   CONSTRAINT uq_influencers_platform_user UNIQUE (platform, platform_user_id)
 );
 
+-- Same form as dedup_service.normalize_profile_url(): lower-cased scheme and host,
+-- path without trailing slashes, no query or fragment. New rows are filled in by the app.
+ALTER TABLE influencers ADD COLUMN IF NOT EXISTS profile_url_normalized text;
+UPDATE influencers
+SET profile_url_normalized =
+  lower(coalesce(substring(trim(profile_url) from '^([A-Za-z][A-Za-z0-9+.-]*):'), 'https'))
+  || '://'
+  || lower(coalesce(substring(trim(profile_url) from '^[A-Za-z][A-Za-z0-9+.-]*://([^/?#]*)'), ''))
+  || rtrim(coalesce(substring(trim(profile_url) from '^(?:[A-Za-z][A-Za-z0-9+.-]*://[^/?#]*)?([^?#;]*)'), ''), '/')
+WHERE profile_url_normalized IS NULL;
+
 CREATE TABLE IF NOT EXISTS search_results_deduped (
   id uuid PRIMARY KEY DEFAULT gen_random_uuid(),
   task_id uuid NOT NULL REFERENCES search_tasks(id) ON DELETE CASCADE,
   raw_result_id uuid NOT NULL REFERENCES search_results_raw(id) ON DELETE CASCADE,
   dedup_status dedup_status NOT NULL,
   matched_influencer_id uuid REFERENCES influencers(id) ON DELETE SET NULL,
+  match_score real,
   created_at timestamptz NOT NULL DEFAULT now(),
   CONSTRAINT uq_dedup_task_raw UNIQUE (task_id, raw_result_id)
 );
 
+ALTER TABLE search_results_deduped ADD COLUMN IF NOT EXISTS match_score real;
+ALTER TABLE search_results_deduped ADD COLUMN IF NOT EXISTS ordinal integer NOT NULL DEFAULT 0;
+
 CREATE TABLE IF NOT EXISTS email_drafts (
   id uuid PRIMARY KEY DEFAULT gen_random_uuid(),
   goal text NOT NULL,
@@ -98,6 +121,28 @@ CREATE TABLE IF NOT EXISTS email_campaigns (
   created_at timestamptz NOT NULL DEFAULT now()
 );
 
+ALTER TABLE email_campaigns ADD COLUMN IF NOT EXISTS queued_count integer NOT NULL DEFAULT 0;
+ALTER TABLE email_campaigns ADD COLUMN IF NOT EXISTS sent_count integer NOT NULL DEFAULT 0;
+ALTER TABLE email_campaigns ADD COLUMN IF NOT EXISTS failed_count integer NOT NULL DEFAULT 0;
+ALTER TABLE email_campaigns ADD COLUMN IF NOT EXISTS started_at timestamptz;
+ALTER TABLE email_campaigns ADD COLUMN IF NOT EXISTS finished_at timestamptz;
+ALTER TABLE email_campaigns ADD COLUMN IF NOT EXISTS recipient_ids jsonb NOT NULL DEFAULT '[]'::jsonb;
+ALTER TABLE email_campaigns ADD COLUMN IF NOT EXISTS created_by text;
+ALTER TABLE email_campaigns ADD COLUMN IF NOT EXISTS lease_expires_at timestamptz;
+ALTER TABLE email_campaigns ADD COLUMN IF NOT EXISTS locked_by text;
+
+CREATE TABLE IF NOT EXISTS campaign_stats (
+  campaign_id uuid PRIMARY KEY REFERENCES email_campaigns(id) ON DELETE CASCADE,
+  sent_count integer NOT NULL DEFAULT 0,
+  failed_count integer NOT NULL DEFAULT 0,
+  delivered_count integer NOT NULL DEFAULT 0,
+  opened_count integer NOT NULL DEFAULT 0,
+  bounced_count integer NOT NULL DEFAULT 0,
+  replied_count integer NOT NULL DEFAULT 0,
+  unsubscribed_count integer NOT NULL DEFAULT 0,
+  updated_at timestamptz NOT NULL DEFAULT now()
+);
+
 CREATE TABLE IF NOT EXISTS email_messages (
   id uuid PRIMARY KEY DEFAULT gen_random_uuid(),
   campaign_id uuid NOT NULL REFERENCES email_campaigns(id) ON DELETE CASCADE,
@@ -110,6 +155,14 @@ CREATE TABLE IF NOT EXISTS email_messages (
   sent_at timestamptz
 );
 
+CREATE TABLE IF NOT EXISTS send_quota_ledger (
+  day date NOT NULL,
+  sender text NOT NULL,
+  used integer NOT NULL DEFAULT 0,
+  updated_at timestamptz NOT NULL DEFAULT now(),
+  PRIMARY KEY (day, sender)
+);
+
 CREATE TABLE IF NOT EXISTS email_events (
   id uuid PRIMARY KEY DEFAULT gen_random_uuid(),
   message_id uuid NOT NULL REFERENCES email_messages(id) ON DELETE CASCADE,
@@ -129,27 +182,51 @@ CREATE TABLE IF NOT EXISTS audit_logs (
   created_at timestamptz NOT NULL DEFAULT now()
 );
 
+CREATE TABLE IF NOT EXISTS youtube_api_cache (
+  cache_key text PRIMARY KEY,
+  payload jsonb NOT NULL DEFAULT '{}'::jsonb,
+  expires_at timestamptz NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS ix_search_tasks_status_next_run_at ON search_tasks(status, next_run_at);
+CREATE INDEX IF NOT EXISTS ix_email_campaigns_status_lease_expires_at ON email_campaigns(status, lease_expires_at);
+CREATE INDEX IF NOT EXISTS ix_search_tasks_user_id_created_at_id ON search_tasks(user_id, created_at DESC, id DESC);
+
 CREATE INDEX IF NOT EXISTS ix_search_results_raw_task_id ON search_results_raw(task_id);
 CREATE INDEX IF NOT EXISTS ix_search_results_raw_email ON search_results_raw(email);
+CREATE INDEX IF NOT EXISTS ix_search_results_raw_task_followers ON search_results_raw(task_id, (coalesce(follower_count, -1)), id);
 
 CREATE INDEX IF NOT EXISTS ix_search_results_deduped_task_id ON search_results_deduped(task_id);
 CREATE INDEX IF NOT EXISTS ix_search_results_deduped_raw_result_id ON search_results_deduped(raw_result_id);
 CREATE INDEX IF NOT EXISTS ix_search_results_deduped_matched_influencer_id ON search_results_deduped(matched_influencer_id);
+CREATE INDEX IF NOT EXISTS ix_search_results_deduped_task_created_at_ordinal_id
+  ON search_results_deduped(task_id, created_at, ordinal, id);
 
 CREATE INDEX IF NOT EXISTS ix_influencers_email ON influencers(email);
+CREATE INDEX IF NOT EXISTS ix_influencers_profile_url ON influencers(profile_url);
+CREATE INDEX IF NOT EXISTS ix_influencers_profile_url_normalized ON influencers(profile_url_normalized);
+CREATE INDEX IF NOT EXISTS ix_influencers_email_lower ON influencers(lower(trim(email)));
+CREATE INDEX IF NOT EXISTS ix_influencers_platform_display_name_lower ON influencers(platform, lower(trim(display_name)));
+CREATE INDEX IF NOT EXISTS ix_influencers_display_name_compact_trgm
+  ON influencers USING gin (lower(regexp_replace(display_name, '[^[:alnum:]]+', '', 'g')) gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS ix_influencers_saved_by_saved_at_id ON influencers(saved_by, saved_at DESC, id DESC);
 
 CREATE INDEX IF NOT EXISTS ix_email_campaigns_draft_id ON email_campaigns(draft_id);
 
 CREATE INDEX IF NOT EXISTS ix_email_messages_campaign_id ON email_messages(campaign_id);
 CREATE INDEX IF NOT EXISTS ix_email_messages_influencer_id ON email_messages(influencer_id);
+CREATE INDEX IF NOT EXISTS ix_email_messages_provider_message_id ON email_messages(provider_message_id);
 
 CREATE INDEX IF NOT EXISTS ix_email_events_message_id ON email_events(message_id);
 CREATE INDEX IF NOT EXISTS ix_email_events_occurred_at ON email_events(occurred_at);
+CREATE INDEX IF NOT EXISTS ix_email_events_occurred_at_id ON email_events(occurred_at, id);
 
 CREATE INDEX IF NOT EXISTS ix_audit_logs_user_id ON audit_logs(user_id);
 CREATE INDEX IF NOT EXISTS ix_audit_logs_entity_id ON audit_logs(entity_id);
 CREATE INDEX IF NOT EXISTS ix_audit_logs_created_at ON audit_logs(created_at);
 
+CREATE INDEX IF NOT EXISTS ix_youtube_api_cache_expires_at ON youtube_api_cache(expires_at);
+
 CREATE OR REPLACE FUNCTION set_updated_at_timestamp()
 RETURNS trigger AS $$
 BEGIN